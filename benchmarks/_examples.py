@@ -0,0 +1,18 @@
+# -*- coding:utf-8 -*-
+import contextlib
+import glob
+import io
+import os.path
+import runpy
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_queries():
+    """collect `query` objects defined in examples/*.py"""
+    queries = []
+    for path in sorted(glob.glob(os.path.join(here, "../examples/*.py"))):
+        with contextlib.redirect_stdout(io.StringIO()):
+            env = runpy.run_path(path)
+        queries.append((os.path.basename(path), env["query"]))
+    return queries
@@ -0,0 +1,36 @@
+# -*- coding:utf-8 -*-
+"""
+cost of long builder chains (e.g. a request handler composing 20-40 optional filters)
+
+$ python benchmarks/builder_chain.py
+"""
+import sys
+import os.path
+import timeit
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from nendo import make_record, Query, render  # NOQA
+from nendo.value import Prepared  # NOQA
+
+T = make_record("T", "id name value created_at")
+
+
+def build(n):
+    query = Query().from_(T).select(T.id)
+    for i in range(n):
+        query = query.where(T.value != Prepared("v{}".format(i))).select(T.name).order_by(T.id)
+    return query
+
+
+def main():
+    print("{:>6} {:>14} {:>14} {:>14}".format("calls", "build", "per call", "build+render"))
+    for n in (10, 40, 100, 400, 1000):
+        number = max(1, 2000 // n)
+        context = {"v{}".format(i): i for i in range(n)}
+        t_build = min(timeit.repeat(lambda: build(n), number=number, repeat=5)) / number
+        t_render = min(timeit.repeat(lambda: render(build(n), **context), number=number, repeat=5)) / number
+        print("{:>6} {:>11.1f} us {:>11.2f} us {:>11.1f} us".format(n * 3, t_build * 1e6, t_build * 1e6 / (n * 3), t_render * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# -*- coding:utf-8 -*-
+"""
+columnar results vs row tuples (1M rows from sqlite3)
+
+$ python benchmarks/columnar.py
+"""
+import sys
+import os.path
+import sqlite3
+import time
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from nendo import make_record, Query, Executor  # NOQA
+from nendo.columnar import numpy  # NOQA
+
+T = make_record("T", "id score value")
+
+
+def setup(n):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE T (id INTEGER, score REAL, value INTEGER)")
+    conn.executemany("INSERT INTO T VALUES (?, ?, ?)", ((i, i * 0.5, i % 7) for i in range(n)))
+    return conn
+
+
+def rows_to_columns(executor, query):
+    # the row-tuple path: all rows, then per-column lists
+    rows = [row for row in executor.iter_rows(query)]
+    return {"id": [r[0] for r in rows], "score": [r[1] for r in rows], "value": [r[2] for r in rows]}
+
+
+def measure(fn):
+    st = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - st
+    tracemalloc.start()  # measured separately, tracing slows down allocations
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak
+
+
+def main(n=1000000):
+    executor = Executor(setup(n), batch_size=10000)
+    query = Query().from_(T).select(T.id, T.score, T.value)
+    candidates = [("row tuples", lambda: rows_to_columns(executor, query))]
+    if numpy is not None:
+        candidates.append(("columns (numpy)", lambda: executor.fetch_columns(query, use_numpy=True)))
+    candidates.append(("columns (array)", lambda: executor.fetch_columns(query, use_numpy=False)))
+
+    print("{} rows x 3 columns".format(n))
+    print("{:>16} {:>10} {:>12}".format("", "time", "peak memory"))
+    for name, fn in candidates:
+        elapsed, peak = measure(fn)
+        print("{:>16} {:>7.0f} ms {:>9.1f} MB".format(name, elapsed * 1e3, peak / 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# -*- coding:utf-8 -*-
+"""
+per-node dispatch cost of compiler, functools.singledispatch (before) vs nendo.langhelpers.typedispatch (after).
+
+$ python benchmarks/dispatch.py
+"""
+import functools
+import importlib
+import sys
+import os.path
+import timeit
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from _examples import load_queries  # NOQA
+c = importlib.import_module("nendo.compiler")  # nendo.compiler is shadowed by the function of same name
+OPTIONS = c.DEFAULT_OPTIONS._replace(use_validation=False)
+
+
+def new_context():
+    return {c.ARGS: None, c.ARG_KEYS: []}  # prepared values are not needed
+
+
+def as_singledispatch(dispatcher):
+    before = functools.singledispatch(dispatcher.registry[object])
+    for cls, fn in dispatcher.registry.items():
+        if cls is not object:
+            before.register(cls, fn)
+    return before
+
+
+class _Tracing(object):
+    def __init__(self, dispatcher):
+        self.dispatcher = dispatcher
+        self.types = []
+
+    def dispatch(self, cls):
+        self.types.append(cls)
+        return self.dispatcher.dispatch(cls)
+
+    def __call__(self, v, *args, **kwargs):
+        return self.dispatch(v.__class__)(v, *args, **kwargs)
+
+
+def visited_types(query):
+    original = c.compiler
+    c.compiler = tracing = _Tracing(original)
+    try:
+        tracing(query, new_context(), options=OPTIONS)
+    finally:
+        c.compiler = original
+    return tracing.types
+
+
+def bench_dispatch(types, dispatch, number):
+    def run():
+        for cls in types:
+            dispatch(cls)
+    return min(timeit.repeat(run, number=number, repeat=5)) / number / len(types)
+
+
+def bench_compile(query, compiler, number):
+    original = c.compiler
+    c.compiler = compiler  # handlers look up module global `compiler`
+    try:
+        return min(timeit.repeat(lambda: compiler(query, new_context(), options=OPTIONS), number=number, repeat=5)) / number
+    finally:
+        c.compiler = original
+
+
+def main(number=2000):
+    after = c.compiler
+    before = as_singledispatch(after)
+    print("{:<8} {:>6} {:>16} {:>16} {:>16} {:>16}".format(
+        "example", "nodes", "dispatch(before)", "dispatch(after)", "compile(before)", "compile(after)"))
+    for name, query in load_queries():
+        types = visited_types(query)
+        print("{:<8} {:>6} {:>13.1f} ns {:>13.1f} ns {:>13.1f} us {:>13.1f} us".format(
+            name,
+            len(types),
+            bench_dispatch(types, before.dispatch, number) * 1e9,
+            bench_dispatch(types, after.dispatch, number) * 1e9,
+            bench_compile(query, before, number) * 1e6,
+            bench_compile(query, after, number) * 1e6,
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# -*- coding:utf-8 -*-
+"""
+cost of building expressions with many prepared parameters (the env of each operator application)
+
+$ python benchmarks/env_chain.py
+"""
+import sys
+import os.path
+import timeit
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from nendo import make_record  # NOQA
+from nendo.value import Prepared  # NOQA
+
+T = make_record("T", "id name value created_at")
+
+
+def build_arithmetic(n):
+    expr = T.value
+    for i in range(n):
+        expr = expr + Prepared("v{}".format(i))
+    return expr
+
+
+def build_conditions(n):
+    expr = T.id == Prepared("id")
+    for i in range(n):
+        expr = expr & (T.value != Prepared("v{}".format(i)))
+    return expr
+
+
+def main():
+    print("{:>6} {:>14} {:>14} {:>14}".format("params", "arithmetic", "conditions", "per param"))
+    for n in (10, 100, 250, 500, 1000):
+        number = max(1, 2000 // n)
+        t_arith = min(timeit.repeat(lambda: build_arithmetic(n), number=number, repeat=5)) / number
+        t_cond = min(timeit.repeat(lambda: build_conditions(n), number=number, repeat=5)) / number
+        print("{:>6} {:>11.1f} us {:>11.1f} us {:>11.2f} us".format(n, t_arith * 1e6, t_cond * 1e6, t_cond * 1e6 / n))
+    assert len(build_conditions(1000).env.env) == 1001
+
+
+if __name__ == "__main__":
+    main()
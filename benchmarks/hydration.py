@@ -0,0 +1,56 @@
+# -*- coding:utf-8 -*-
+"""
+memory and time of hydrating rows into record instances
+
+$ python benchmarks/hydration.py
+"""
+import sys
+import os.path
+import timeit
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from nendo import make_record, Query  # NOQA
+from nendo.hydration import make_hydrator  # NOQA
+
+COLUMNS = ["id", "name", "value", "created_at", "updated_at", "status"]
+T = make_record("T", " ".join(COLUMNS))
+
+
+class DictRow(object):  # the layout before records were slotted
+    def __init__(self, id, name, value, created_at, updated_at, status):
+        self._id = id
+        self._name = name
+        self._value = value
+        self._created_at = created_at
+        self._updated_at = updated_at
+        self._status = status
+
+
+def measure(fn, rows):
+    tracemalloc.start()
+    result = fn(rows)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    t = min(timeit.repeat(lambda: fn(rows), number=1, repeat=3))
+    del result
+    return size, t
+
+
+def main(n=200000):
+    rows = [(i, "name", i * 2, "2000-01-01", "2000-01-02", 1) for i in range(n)]
+    hydrate = make_hydrator(Query().from_(T))
+    candidates = [
+        ("dict (before)", lambda rows: [DictRow(*row) for row in rows]),
+        ("slots, T(*row)", lambda rows: [T(*row) for row in rows]),
+        ("slots, hydrator", lambda rows: list(map(hydrate, rows))),
+    ]
+    print("{} rows x {} columns".format(n, len(COLUMNS)))
+    print("{:>16} {:>12} {:>10}".format("", "bytes/row", "time"))
+    for name, fn in candidates:
+        size, t = measure(fn, rows)
+        print("{:>16} {:>12.1f} {:>7.1f} ms".format(name, size / n, t * 1e3))
+
+
+if __name__ == "__main__":
+    main()
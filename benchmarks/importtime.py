@@ -0,0 +1,53 @@
+# -*- coding:utf-8 -*-
+"""
+startup cost of importing nendo (measured by `python -X importtime` in a fresh process)
+
+$ python benchmarks/importtime.py
+"""
+import sys
+import os.path
+import subprocess
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+STATEMENTS = [
+    "import nendo",
+    "from nendo import Query, make_record",
+    "from nendo import render",
+    "from nendo import make_record; make_record('T', 'id')",
+]
+
+
+def importtime(statement):
+    """returns (cumulative time of top-level imports [us], imported modules), excluding interpreter's startup"""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    p = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], env=env, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    total = 0
+    modules = []
+    for line in p.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.strip() in STARTUP_MODULES:
+            continue
+        modules.append(name.strip())
+        if not name[1:].startswith(" "):  # top-level import
+            total += int(cumulative)
+    return total, modules
+
+
+STARTUP_MODULES = set()
+STARTUP_MODULES.update(importtime("pass")[1])
+
+
+def main(repeat=5):
+    print("{:>10} {:>8} {:>10}  {}".format("time", "modules", "prestring", "statement"))
+    for statement in STATEMENTS:
+        results = [importtime(statement) for _ in range(repeat)]
+        total = min(t for t, _ in results)
+        modules = results[0][1]
+        loaded = any(m.startswith("prestring") for m in modules)
+        print("{:>7.1f} ms {:>8} {:>10}  {}".format(total / 1000, len(modules), "loaded" if loaded else "-", statement))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# -*- coding:utf-8 -*-
+"""
+startup cost of generating records for a large schema (make_record per table vs make_records)
+
+$ python benchmarks/make_records.py
+"""
+import sys
+import os.path
+import shutil
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from nendo import make_record, make_records  # NOQA
+
+
+def schema(n, ncolumns=12):
+    template = " ".join("c{}".format(i) for i in range(ncolumns))
+    return {"T{}".format(i): template for i in range(n)}
+
+
+def measure(fn):
+    st = time.perf_counter()
+    fn()
+    return time.perf_counter() - st
+
+
+def main():
+    print("{:>7} {:>14} {:>14} {:>14}".format("tables", "make_record", "cold", "warm"))
+    for n in (10, 100, 600):
+        s = schema(n)
+        cache_dir = tempfile.mkdtemp()
+        try:
+            t_each = measure(lambda: [make_record(k, v) for k, v in s.items()])
+            t_cold = measure(lambda: make_records(s, cache_dir=cache_dir))
+            t_warm = min(measure(lambda: make_records(s, cache_dir=cache_dir)) for _ in range(5))
+        finally:
+            shutil.rmtree(cache_dir)
+        print("{:>7} {:>11.1f} ms {:>11.1f} ms {:>11.1f} ms".format(n, t_each * 1e3, t_cold * 1e3, t_warm * 1e3))
+
+
+if __name__ == "__main__":
+    main()
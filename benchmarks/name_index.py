@@ -0,0 +1,38 @@
+# -*- coding:utf-8 -*-
+"""
+attribute resolution on wide queries and subqueries (e.g. reporting queries with 200+ columns)
+
+$ python benchmarks/name_index.py
+"""
+import sys
+import os.path
+import timeit
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from nendo import make_record, Query, alias, render  # NOQA
+
+
+def setup(n):
+    columns = ["c{}".format(i) for i in range(n)]
+    T = make_record("T", " ".join(columns))
+    query = Query().from_(T).select(*[getattr(T, c) for c in columns])
+    return columns, T, query
+
+
+def resolve(columns, T, query):
+    sub = alias(query, "sub")
+    outer = Query().from_(sub).select(*[getattr(sub.T, c) for c in columns])
+    return render(outer)
+
+
+def main():
+    print("{:>8} {:>14} {:>14}".format("columns", "resolve", "per column"))
+    for n in (10, 50, 200, 500):
+        columns, T, query = setup(n)
+        number = max(1, 2000 // n)
+        t = min(timeit.repeat(lambda: resolve(columns, T, query), number=number, repeat=5)) / number
+        print("{:>8} {:>11.1f} us {:>11.2f} us".format(n, t * 1e6, t * 1e6 / n))
+
+
+if __name__ == "__main__":
+    main()
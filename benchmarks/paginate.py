@@ -0,0 +1,51 @@
+# -*- coding:utf-8 -*-
+"""
+keyset pagination vs LIMIT/OFFSET (time of a page at several depths, sqlite3)
+
+$ python benchmarks/paginate.py
+"""
+import sys
+import os.path
+import sqlite3
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from nendo import make_record, Query, Executor  # NOQA
+from nendo.paginate import seek_keys, seek_predicate, SEEK_KEY  # NOQA
+
+T = make_record("T", "id grp value")
+
+
+def setup(n):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE T (id INTEGER PRIMARY KEY, grp INTEGER, value INTEGER)")
+    conn.executemany("INSERT INTO T VALUES (?, ?, ?)", ((i, i % 10, i * 7 % 1000) for i in range(n)))
+    return conn
+
+
+def measure(fn, repeat=5):
+    st = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - st) / repeat
+
+
+def main(n=1000000, page_size=1000):
+    conn = setup(n)
+    renderer = Executor(conn).renderer
+    query = Query().from_(T).select(T.id, T.grp, T.value).order_by(T.id).limit(page_size)
+    offset = renderer.compile(Query().from_(T).select(T.id, T.grp, T.value).order_by(T.id))
+    seek = renderer.compile(query.where(seek_predicate(seek_keys(query))))
+
+    print("{} rows, page size {}".format(n, page_size))
+    print("{:>10} {:>12} {:>12}".format("depth", "OFFSET", "keyset"))
+    for depth in (0, n // 100, n // 10, n // 2, n - page_size):
+        args = seek.bind({SEEK_KEY.format(0): depth - 1})
+        offset_sql = "{} LIMIT {} OFFSET {}".format(offset.sql, page_size, depth)
+        t0 = measure(lambda: conn.execute(offset_sql).fetchall())
+        t1 = measure(lambda: conn.execute(seek.sql, args).fetchall())
+        print("{:>10} {:>9.2f} ms {:>9.2f} ms".format(depth, t0 * 1e3, t1 * 1e3))
+
+
+if __name__ == "__main__":
+    main()
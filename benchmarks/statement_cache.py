@@ -0,0 +1,51 @@
+# -*- coding:utf-8 -*-
+"""
+statement cache size vs ~300 query shapes (sqlite3's cached_statements and the pool's LRU)
+
+$ python benchmarks/statement_cache.py
+"""
+import sys
+import os.path
+import random
+import sqlite3
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from nendo import ConnectionPool  # NOQA
+
+SHAPES = 300
+
+
+def connect(cache_size):
+    def _connect():
+        conn = sqlite3.connect(":memory:", cached_statements=cache_size)
+        conn.execute("CREATE TABLE T ({})".format(", ".join("c{} INTEGER".format(i) for i in range(20))))
+        conn.executemany("INSERT INTO T VALUES ({})".format(", ".join(["?"] * 20)), [[i] * 20 for i in range(100)])
+        return conn
+    return _connect
+
+
+def workload(n, seed=0):
+    rnd = random.Random(seed)
+    # skewed: a few shapes are hot
+    shapes = ["SELECT c{} FROM T WHERE c{} = ? AND c0 < {}".format(i % 20, (i * 7) % 20, i) for i in range(SHAPES)]
+    return [shapes[min(int(rnd.expovariate(1 / 60.0)), SHAPES - 1)] for _ in range(n)]
+
+
+def main(n=50000):
+    queries = workload(n)
+    print("{:>6} {:>10} {:>10} {:>10} {:>10}".format("size", "time", "hit rate", "misses", "evictions"))
+    for cache_size in (16, 64, 128, 300):
+        pool = ConnectionPool(connect(cache_size), size=1, statement_cache_size=cache_size)
+        with pool.connection() as conn:
+            st = time.perf_counter()
+            for i, sql in enumerate(queries):
+                conn.execute(sql, (i % 100, )).fetchall()
+            elapsed = time.perf_counter() - st
+        stats = pool.stats()
+        print("{:>6} {:>7.0f} ms {:>9.1%} {:>10} {:>10}".format(cache_size, elapsed * 1e3, stats.hit_rate, stats.misses, stats.evictions))
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
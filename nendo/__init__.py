@@ -1,40 +1,82 @@
 # -*- coding:utf-8 -*-
-import logging
-logger = logging.getLogger(__name__)
-from nendo.record import make_record
-from nendo.query import Query
-from nendo.alias import alias, subquery
-from nendo.compiler import compiler, ARGS
-from nendo.options import Options
+# names are imported lazily (PEP 562), `import nendo` itself doesn't load the compiler and codegen.
+import sys
+from importlib import import_module
+from types import ModuleType
 
+_LAZY_ATTRIBUTES = {
+    # name -> (module, attribute)
+    # a new name must not be the name of a submodule, `import nendo.<name> as m` returns the attribute.
+    # (compiler and alias are kept for compatibility, they are the functions)
+    "make_record": ("nendo.record", "make_record"),
+    "make_records": ("nendo.record", "make_records"),
+    "Query": ("nendo.query", "Query"),
+    "SelectQuery": ("nendo.query", "Query"),
+    "alias": ("nendo.alias", "alias"),
+    "subquery": ("nendo.alias", "subquery"),
+    "and_": ("nendo.expr", "and_"),
+    "or_": ("nendo.expr", "or_"),
+    "compiler": ("nendo.compiler", "compiler"),
+    "iter_chunks": ("nendo.compiler", "iter_chunks"),
+    "ARGS": ("nendo.compiler", "ARGS"),
+    "ARG_KEYS": ("nendo.compiler", "ARG_KEYS"),
+    "Options": ("nendo.options", "Options"),
+    "InList": ("nendo.options", "InList"),
+    "LRUCache": ("nendo.cache", "LRUCache"),
+    "fingerprint": ("nendo.cache", "fingerprint"),
+    "CompiledStatement": ("nendo.statement", "CompiledStatement"),
+    "compile_statement": ("nendo.statement", "compile_statement"),
+    "Insert": ("nendo.insert", "Insert"),
+    "iter_insert": ("nendo.insert", "iter_insert"),
+    "reflect_records": ("nendo.reflect", "reflect"),
+    "Executor": ("nendo.executor", "Executor"),
+    "AsyncExecutor": ("nendo.aio", "AsyncExecutor"),
+    "ConnectionPool": ("nendo.pool", "ConnectionPool"),
+    "PreparedSession": ("nendo.prepare", "PreparedSession"),
+    "paginate_query": ("nendo.paginate", "paginate"),
+    "explain_query": ("nendo.explain", "explain"),
+    "Renderer": ("nendo.renderer", "Renderer"),
+    "render": ("nendo.renderer", "render"),
+}
 
-class Renderer(object):
-    def __init__(self, use_validation=True, one_line_sql=True, interpolation="%s"):
-        self.use_validation = use_validation
-        self.one_line_sql = one_line_sql
-        self.interpolation = interpolation
 
-    def get_options(self, query):
-        return Options(use_validation=self.use_validation,
-                       one_table=len(list(query.tables())) <= 1,
-                       interpolation=self.interpolation,
-                       one_line_sql=self.one_line_sql)
+def __getattr__(name):
+    if name == "logger":
+        import logging
+        value = logging.getLogger(__name__)
+    else:
+        try:
+            module_name, attr = _LAZY_ATTRIBUTES[name]
+        except KeyError:
+            raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+        value = getattr(import_module(module_name), attr)
+    globals()[name] = value
+    return value
 
-    def __call__(self, query, **context):
-        options = self.get_options(query)
-        return _render(query, options, context)
 
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
-def _render(query, options, context):
-    sql = compiler(query, context, options=options)
-    return (sql, context[ARGS])
 
-render = Renderer()
-SelectQuery = Query
+class _Package(ModuleType):
+    def __setattr__(self, name, value):
+        # importing a submodule binds it to the package (e.g. nendo.compiler, nendo.alias),
+        # but these names are the functions of the same name.
+        if isinstance(value, ModuleType) and _LAZY_ATTRIBUTES.get(name, ("", ""))[0] == value.__name__:
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
 
 __all__ = [
     "make_record",
+    "make_records",
     "alias",
+    "and_",
+    "or_",
+    "CompiledStatement",
+    "Insert",
     "Query",
     "SelectQuery",
     "render",
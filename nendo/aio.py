@@ -0,0 +1,193 @@
+# -*- coding:utf-8 -*-
+import asyncio
+import threading
+import queue
+from .renderer import Renderer
+from .hydration import make_hydrator
+from .executor import interpolation_of
+
+
+class _Failure(object):
+    __slots__ = ("error", )
+
+    def __init__(self, error):
+        self.error = error
+
+
+class AsyncExecutor(object):
+    """
+    run queries from asyncio, on worker threads. each worker thread owns a DB-API connection
+    (created by connect() on the thread), so at most `size` queries run at the same time.
+
+    streaming is backpressured: a worker fetches at most buffer_size batches ahead of the consumer.
+
+    >>> executor = AsyncExecutor(lambda: sqlite3.connect("app.db"), size=4)
+    >>> rows = await executor.run(query, name="foo")
+    >>> async for row in executor.stream(query, name="foo"):
+    ...     print(row)
+    >>> await executor.close()
+    """
+    def __init__(self, connect, size=4, renderer=None, batch_size=1000, buffer_size=2):
+        self.connect = connect
+        self.size = size
+        self.renderer = renderer
+        self.batch_size = batch_size
+        self.buffer_size = buffer_size
+        self._semaphore = asyncio.Semaphore(size)
+        self._jobs = queue.Queue()
+        self._threads = []
+        self._closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _start(self):
+        while len(self._threads) < self.size:
+            th = threading.Thread(target=self._work, name="nendo-aio-{}".format(len(self._threads)), daemon=True)
+            th.start()
+            self._threads.append(th)
+
+    def _work(self):
+        try:
+            connection = self.connect()
+        except Exception as e:
+            connection, error = None, e
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    break
+                fn, future, loop = job
+                try:
+                    if connection is None:
+                        raise error
+                    result = fn(connection)
+                except BaseException as e:
+                    _call_soon(loop, _set_exception, future, e)
+                else:
+                    _call_soon(loop, _set_result, future, result)
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def _submit(self, fn):
+        """run fn(connection) on a worker thread, returns future"""
+        if self._closed:
+            raise RuntimeError("executor is closed")
+        self._start()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._jobs.put((fn, future, loop))
+        return future
+
+    async def _render(self, query, context):
+        # rendering is done on the event loop's thread (renderer's cache is not thread safe)
+        if self.renderer is None:
+            async with self._semaphore:
+                interpolation = await self._submit(interpolation_of)
+            if self.renderer is None:
+                self.renderer = Renderer(interpolation=interpolation)
+        return self.renderer(query, **context)
+
+    async def run(self, query, **context):
+        """returns all rows"""
+        sql, args = await self._render(query, context)
+        async with self._semaphore:
+            return await self._submit(lambda connection: _fetchall(connection, sql, args))
+
+    async def stream_batches(self, query, batch_size=None, hydrate=False, **context):
+        """yield lists of rows (or records, if hydrate is true). a worker is occupied until the iteration is finished"""
+        sql, args = await self._render(query, context)
+        size = batch_size or self.batch_size
+        convert = make_hydrator(query) if hydrate else None
+        loop = asyncio.get_running_loop()
+        buffer = asyncio.Queue(self.buffer_size)
+        stopped = threading.Event()
+
+        def put(item):
+            # blocks the worker while the buffer is full (backpressure)
+            asyncio.run_coroutine_threadsafe(buffer.put(item), loop).result()
+
+        def produce(connection):
+            cursor = connection.cursor()
+            try:
+                cursor.execute(sql, args)
+                while not stopped.is_set():
+                    rows = cursor.fetchmany(size)
+                    if rows and convert is not None:
+                        rows = list(map(convert, rows))
+                    put(rows)
+                    if not rows:
+                        break
+            except Exception as e:
+                put(_Failure(e))
+            finally:
+                cursor.close()
+
+        async with self._semaphore:
+            job = self._submit(produce)
+            try:
+                while True:
+                    item = await buffer.get()
+                    if isinstance(item, _Failure):
+                        raise item.error
+                    if not item:
+                        break
+                    yield item
+            finally:
+                # the consumer is gone (or finished), unblock the worker and wait for it
+                stopped.set()
+                while not job.done():
+                    getter = asyncio.ensure_future(buffer.get())
+                    await asyncio.wait([job, getter], return_when=asyncio.FIRST_COMPLETED)
+                    getter.cancel()
+
+    async def stream(self, query, batch_size=None, hydrate=False, **context):
+        """yield rows (or records, if hydrate is true)"""
+        batches = self.stream_batches(query, batch_size=batch_size, hydrate=hydrate, **context)
+        try:
+            async for rows in batches:
+                for row in rows:
+                    yield row
+        finally:
+            await batches.aclose()
+
+    async def close(self):
+        """stop worker threads (after running jobs), connections are closed on their threads"""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._jobs.put(None)
+        threads, self._threads = self._threads, []
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, lambda: [th.join() for th in threads])
+
+
+def _fetchall(connection, sql, args):
+    cursor = connection.cursor()
+    try:
+        cursor.execute(sql, args)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def _set_result(future, result):
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future, error):
+    if not future.done():
+        future.set_exception(error)
+
+
+def _call_soon(loop, fn, *args):
+    try:
+        loop.call_soon_threadsafe(fn, *args)
+    except RuntimeError:  # the loop is closed
+        pass
@@ -1,9 +1,10 @@
 # -*- coding:utf-8 -*-
-from singledispatch import singledispatch
+from .langhelpers import typedispatch, reify
 from .record import RecordMeta
 from .property import ConcreteProperty
 from .value import Function
 from .query import Query
+from .clause import _MEMOIZED
 from . import expr
 
 
@@ -108,6 +109,8 @@ class QueryRecord(_Joinable):
         return False  # xxx
 
     def __getattr__(self, k):
+        if k in _MEMOIZED:  # failed while computing the index, don't retry via __getattr__
+            raise AttributeError(k)
         value = getattr(self.query._from, k)
         if isinstance(value, RecordMeta):  # xxx:
             prefix = "{}_".format(value.get_name())
@@ -133,10 +136,16 @@ class QueryRecord(_Joinable):
     def swap(self, name):  # xxx
         return self
 
-    def props(self):
+    @reify
+    def _props(self):
+        r = []
         for prop in self.query.props():
             record = getattr(self, prop.record.get_name())
-            yield getattr(record, prop.original_name)
+            r.append(getattr(record, prop.original_name))
+        return r
+
+    def props(self):
+        return iter(self._props)
 
 
 class QueryBodyRecord(QueryRecord):
@@ -148,7 +157,7 @@ def subquery(query, name=None):
     return QueryBodyRecord(query, name=name)
 
 
-@singledispatch
+@typedispatch
 def alias(v, name):
     raise NotImplementedError(v)
 
@@ -0,0 +1,290 @@
+# -*- coding:utf-8 -*-
+import threading
+from collections import OrderedDict, namedtuple
+from .langhelpers import typedispatch
+from .query import Query, _QueryFrom, _QueryProperty
+from .clause import Clause, _SubSelectProperty
+from .expr import UOp, BOp, NOp, TriOp, JoinOp, Expr
+from .record import RecordMeta
+from .property import ConcreteProperty
+from .alias import AliasRecord, AliasProperty, AliasExpressionProperty, AliasFunction, QueryRecord
+from .value import Value, Prepared, Constant, Function, FakeRecord
+from .compiler import _IN_LIST_CONNECTIVES, _is_literal_list, in_list_shape, padded_values
+
+
+CacheInfo = namedtuple("CacheInfo", "hits, misses, evictions, maxsize, currsize")
+
+
+class LRUCache(object):
+    """
+    bounded mapping, the least recently used entry is evicted first.
+    on_evict(key, value) is called for each evicted entry (holding the lock).
+
+    thread safe, a cache is shared by threads (e.g. the hydrators, or AsyncExecutor's workers)
+    """
+
+    def __init__(self, maxsize=128, on_evict=None):
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+                self._data.move_to_end(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted = self._data.popitem(last=False)
+                self.evictions += 1
+                if self.on_evict is not None:
+                    self.on_evict(*evicted)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        return CacheInfo(hits=self.hits,
+                         misses=self.misses,
+                         evictions=self.evictions,
+                         maxsize=self.maxsize,
+                         currsize=len(self._data))
+
+
+_MEMO = "_fingerprint"
+_LISTS_MEMO = "_literal_lists"
+
+
+class _InListSlot(object):
+    """
+    a literal list of IN/NOT IN in fingerprint. the values are not a part of the shape,
+    all slots are equal (see literal_lists() and in_list_key())
+    """
+    __slots__ = ("value", )
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return other.__class__ is _InListSlot
+
+    def __ne__(self, other):
+        return other.__class__ is not _InListSlot
+
+    def __hash__(self):
+        return hash(_InListSlot)
+
+    def __repr__(self):
+        return "<InListSlot>"
+
+
+@typedispatch
+def fingerprint(v):
+    """
+    structural key of a query tree. two queries having same fingerprint are compiled to same sql,
+    only the values bound to Prepared can be different.
+    literal lists of IN/NOT IN are excluded, in_list_key() is the key of them.
+    """
+    raise NotImplementedError(v)
+
+
+@fingerprint.register(Query)
+def on_query(query):
+    # query is immutable, so the result is memoized on the instance
+    try:
+        return query.__dict__[_MEMO]
+    except KeyError:
+        value = query.__dict__[_MEMO] = (
+            query.__class__,
+            fingerprint(query._select),
+            fingerprint(query._from),
+            fingerprint(query._where),
+            fingerprint(query._group_by),
+            fingerprint(query._order_by),
+            fingerprint(query._having),
+            fingerprint(query._limit),
+        )
+        return value
+
+
+@fingerprint.register(Clause)
+def on_clause(clause):
+    return (clause.__class__, clause.suffix, tuple(fingerprint(e) for e in clause.args))
+
+
+@fingerprint.register(_QueryFrom)
+def on_union_from(clause):
+    # the name of first query is used as a name of union
+    return (clause.__class__, clause.suffix, clause.args[0].get_name(), tuple(fingerprint(e) for e in clause.args))
+
+
+@fingerprint.register(UOp)
+@fingerprint.register(BOp)
+@fingerprint.register(NOp)
+@fingerprint.register(TriOp)
+@fingerprint.register(JoinOp)
+def on_operator(op):
+    # flat, pre-order tuple. an explicit stack is used (deeply nested conditions are not recursed)
+    r = []
+    stack = [op]
+    while stack:
+        e = stack.pop()
+        if e.__class__ is _InListSlot:
+            r.append(e)
+        elif e.__class__ is BOp and e.op in _IN_LIST_CONNECTIVES and _is_literal_list(e.right):
+            r.append((e.__class__, e.op, None, 2))
+            stack.append(_InListSlot(e.right))
+            stack.append(e.left)
+        elif fingerprint.dispatch(e.__class__) is not on_operator:
+            r.append(fingerprint(e))
+        elif isinstance(e, JoinOp):
+            r.append((e.__class__, e.op, len(e.args)))
+            stack.extend(reversed(e.args))
+            stack.append(e.right)
+            stack.append(e.left)
+        else:
+            operands = e.operands
+            r.append((e.__class__, e.op, getattr(e, "op2", None), len(operands)))
+            stack.extend(reversed(operands))
+    return tuple(r)
+
+
+@fingerprint.register(QueryRecord)
+def on_query_record(record):
+    return (record.__class__, record.get_name(), fingerprint(record.query))
+
+
+@fingerprint.register(RecordMeta)
+def on_record(record):
+    return record
+
+
+@fingerprint.register(AliasRecord)
+def on_alias_record(record):
+    return (record.__class__, record.get_name(), fingerprint(record._core))
+
+
+@fingerprint.register(FakeRecord)
+def on_fake_record(record):
+    return (record.__class__, record.get_name())
+
+
+@fingerprint.register(ConcreteProperty)
+def on_property(prop):
+    return (prop.__class__, fingerprint(prop.record), prop.name, prop.is_correlated)
+
+
+@fingerprint.register(_QueryProperty)
+def on_query_property(prop):
+    return (prop.__class__, prop.query.get_name(), prop.name)
+
+
+@fingerprint.register(_SubSelectProperty)
+def on_subselect_property(prop):
+    return (prop.__class__, fingerprint(prop.prop))
+
+
+@fingerprint.register(AliasProperty)
+def on_alias_property(prop):
+    return (prop.__class__, fingerprint(prop.prop), prop.name)
+
+
+@fingerprint.register(AliasExpressionProperty)
+def on_alias_expression_property(prop):
+    return (prop.__class__, fingerprint(prop.record._parent.query))
+
+
+@fingerprint.register(Prepared)
+def on_prepared(v):
+    # placeholder position, the value is not a part of the shape
+    return (v.__class__, v.key)
+
+
+@fingerprint.register(Value)
+def on_value(v):
+    return (v.__class__, _literal(v.value))
+
+
+@fingerprint.register(Constant)
+def on_constant(v):
+    return (v.__class__, v.value, v.expr)
+
+
+@fingerprint.register(Function)
+def on_function(v):
+    return (v.__class__, v.value, tuple(fingerprint(e) for e in v.args))
+
+
+@fingerprint.register(AliasFunction)
+def on_alias_function(v):
+    return (v.__class__, fingerprint(v.fn), v.alias_name)
+
+
+def _literal(v):
+    # type is included. (1 == 1.0 == True, but these are rendered differently)
+    if isinstance(v, (list, tuple)):
+        return (v.__class__, tuple(fingerprint(e) if isinstance(e, Expr) else _literal(e) for e in v))
+    return (v.__class__, v)
+
+
+def literal_lists(query):
+    """literal lists (Value) of IN/NOT IN in query, in the order of fingerprint(query)"""
+    try:
+        return query.__dict__[_LISTS_MEMO]
+    except KeyError:
+        pass
+    lists = []
+    stack = [fingerprint(query)]
+    while stack:
+        e = stack.pop()
+        if e.__class__ is tuple:
+            stack.extend(reversed(e))
+        elif e.__class__ is _InListSlot:
+            lists.append(e.value)
+    value = query.__dict__[_LISTS_MEMO] = tuple(lists)
+    return value
+
+
+def in_list_key(query, in_list=None):
+    """
+    cache key of the literal lists of IN/NOT IN in query, to be used with fingerprint(query).
+    the values, if the lists are inlined. otherwise (bound as parameters, see nendo.options.InList),
+    the number of placeholders and the position of the first same list (a shared list is bound once).
+    """
+    lists = literal_lists(query)
+    if not lists:
+        return ()
+    if in_list is None:
+        return tuple(_literal(v.value) for v in lists)
+    first = {}
+    return tuple((first.setdefault(id(v), j), in_list_shape(len(v.value), in_list)) for j, v in enumerate(lists))
+
+
+def bound_lists(query, in_list):
+    """the values bound to the placeholders of each literal list of IN/NOT IN (see nendo.value.ListItem)"""
+    return tuple(padded_values(v.value, in_list) for v in literal_lists(query))
@@ -1,40 +1,81 @@
 # -*- coding:utf-8 -*-
+from itertools import chain
 from .env import Env
-from .expr import wrap
+from .langhelpers import reify
+from .expr import wrap, and_
 from .property import ConcreteProperty
 from .value import Function, Constant
 
 
 class Clause(object):
-    __slots__ = ("args", "env", "suffix")
-
-    def __init__(self, *args, env=None, suffix=""):
-        self.args = [wrap(e) for e in args]
+    """
+    clause is immutable. a clause derived by extend() shares the args of its parent
+    (persistent, these are concatenated lazily when args is accessed).
+    """
+    __slots__ = ("_parent", "_args", "env", "suffix")
+
+    def __init__(self, *args, env=None, suffix="", parent=None):
+        self._parent = parent  # clause whose args are placed before args
+        self._args = tuple([wrap(e) for e in args])
         self.env = env or Env()
         self.suffix = suffix
 
+    @property
+    def args(self):
+        if self._parent is not None:
+            chunks = []
+            c = self
+            while c._parent is not None:
+                chunks.append(c._args)
+                c = c._parent
+            chunks.append(c._args)
+            self._args = tuple(chain.from_iterable(reversed(chunks)))
+            self._parent = None
+        return self._args
+
     def get_name(self):
         return getattr(self, "_name", None) or self.__class__.__name__.upper()
 
     def make(self, *args):
-        return self.__class__(*self.args, env=self.env.make(), suffix=self.suffix)
+        return self.__class__(*self.args, env=self.env, suffix=self.suffix)
+
+    def extend(self, *args, suffix=None):
+        suffix = self.suffix if suffix is None else suffix
+        if not args and suffix == self.suffix:
+            return self
+        parent = None if self.is_empty() else self
+        return self.__class__(*args, env=self.env, suffix=suffix, parent=parent)
 
     def is_empty(self):
-        return not bool(self.args)
+        return self._parent is None and not self._args
+
+
+_MEMOIZED = frozenset(["_index", "_props", "_tables", "_prop_index", "_swapped"])
 
 
 class Select(Clause):
-    __slots__ = ("args", "env", "suffix")
+    @reify
+    def _index(self):
+        # name -> selected value (the first one is used, if the name is conflicted)
+        index = {}
+        for e in self.args:
+            index.setdefault(getattr(e, "name", None), e)
+        return index
+
+    @reify
+    def _props(self):
+        return tuple(chain.from_iterable(e.props() for e in self.args))
 
     def __getattr__(self, k):
-        for e in self.args:
-            if e.name == k:
-                return e
-        raise AttributeError(k)
+        if k in _MEMOIZED:  # failed while computing the index, don't retry via __getattr__
+            raise AttributeError(k)
+        try:
+            return self._index[k]
+        except KeyError:
+            raise AttributeError(k)
 
     def props(self):
-        for e in self.args:
-            yield from e.props()
+        return iter(self._props)
 
     def swap(self, query, name):
         return SubSelect(*[e if isinstance(e, (Function, Constant)) else _SubSelectProperty(query, e) for e in self.args])
@@ -63,37 +104,58 @@ class _SubSelectProperty(ConcreteProperty):
 
 
 class From(Clause):
-    __slots__ = ("args", "env", "suffix")
+    @reify
+    def _index(self):
+        # table name -> table (the first one is used, if the name is conflicted)
+        index = {}
+        for record in self.tables():
+            index.setdefault(record.get_name(), record)
+        return index
+
+    @reify
+    def _tables(self):
+        return tuple(chain.from_iterable(record.tables() for record in self.args))
+
+    @reify
+    def _props(self):
+        return tuple(chain.from_iterable(t.props() for t in self._tables))
 
     def __getattr__(self, k):
-        for record in self.tables():
-            if record.get_name() == k:
-                return record
-        raise AttributeError(k)
+        if k in _MEMOIZED:  # failed while computing the index, don't retry via __getattr__
+            raise AttributeError(k)
+        try:
+            return self._index[k]
+        except KeyError:
+            raise AttributeError(k)
 
     def tables(self):
-        for record in self.args:
-            yield from record.tables()
+        return iter(self._tables)
 
     def props(self):
-        for t in self.tables():
-            yield from t.props()
+        return iter(self._props)
 
     def swap(self, query, name):
         return self.__class__(*[e.swap(name) for e in self.args])
 
 
-class Where(Clause):
-    __slots__ = ("args", "env", "suffix")
+class _Conditions(Clause):
+    __slots__ = ("_conjunction", )
 
-    def __init__(self, *args, env=None, suffix=""):
-        super().__init__(*args, env=env, suffix=suffix)
-        if len(self.args) > 1:
-            # where(<cond>, <cond>) == where(<cond> and <cond>)
-            cond = self.args[0]
-            for e in self.args[1:]:
-                cond = cond.__and__(e)
-            self.args = [cond]
+    def __init__(self, *args, env=None, suffix="", parent=None):
+        super().__init__(*args, env=env, suffix=suffix, parent=parent)
+        self._conjunction = None
+
+    @property
+    def args(self):
+        # where(<cond>, <cond>) == where(<cond> and <cond>)
+        if self._conjunction is None:
+            conds = Clause.args.fget(self)
+            self._conjunction = (and_(*conds), ) if len(conds) > 1 else conds
+        return self._conjunction
+
+
+class Where(_Conditions):
+    __slots__ = ()
 
     def tables(self):
         for cond in self.args:
@@ -108,17 +170,8 @@ class GroupBy(Clause):
     _name = "GROUP BY"
 
 
-class Having(Clause):
-    __slots__ = ("args", "env", "suffix")
-
-    def __init__(self, *args, env=None, suffix=""):
-        super().__init__(*args, env=env, suffix=suffix)
-        if len(self.args) > 1:
-            # where(<cond>, <cond>) == where(<cond> and <cond>)
-            cond = self.args[0]
-            for e in self.args[1:]:
-                cond = cond.__and__(e)
-            self.args = [cond]
+class Having(_Conditions):
+    __slots__ = ()
 
 
 class Limit(Clause):
@@ -0,0 +1,123 @@
+# -*- coding:utf-8 -*-
+from array import array
+from collections import Counter
+from .exceptions import InvalidCombination
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+class NumpyColumn(object):
+    """growable numpy array, the dtype is promoted by values of each batch (e.g. int64 -> float64 -> object)"""
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.data = None
+        self.size = 0
+
+    def extend(self, values):
+        batch = numpy.asarray(values)
+        n = self.size + len(batch)
+        if self.data is None:
+            self.data = numpy.empty(max(self.capacity, n), dtype=batch.dtype)
+        else:
+            dtype = _promote(self.data.dtype, batch.dtype)
+            if n > len(self.data) or dtype != self.data.dtype:
+                data = numpy.empty(max(len(self.data) * 2, n) if n > len(self.data) else len(self.data), dtype=dtype)
+                data[:self.size] = self.data[:self.size]
+                self.data = data
+        self.data[self.size:n] = batch
+        self.size = n
+
+    def value(self):
+        if self.data is None:
+            return numpy.empty(0)
+        return self.data[:self.size].copy() if self.size < len(self.data) else self.data
+
+
+def _promote(x, y):
+    if x == y:
+        return x
+    # numbers with numbers, strings with strings. otherwise object (e.g. numpy casts 1 to "1" with str)
+    if (x.kind in "biuf" and y.kind in "biuf") or (x.kind in "SU" and y.kind in "SU"):
+        return numpy.result_type(x, y)
+    return numpy.dtype(object)
+
+
+class ArrayColumn(object):
+    """array.array of int ("q") or float ("d"), or list (if values are not numbers)"""
+    def __init__(self, capacity=None):
+        self.data = None
+
+    def extend(self, values):
+        if isinstance(self.data, list):
+            self.data.extend(values)
+            return
+        for typecode in _TYPECODES[self.data.typecode if self.data is not None else None]:
+            try:
+                batch = array(typecode, values)  # not extended directly, array.extend() is not atomic
+            except TypeError:
+                continue
+            except OverflowError:  # too large int (not converted to float, it loses precision)
+                break
+            if self.data is None:
+                self.data = batch
+            elif self.data.typecode != typecode:
+                self.data = array(typecode, self.data)
+                self.data.extend(batch)
+            else:
+                self.data.extend(batch)
+            return
+        self.data = list(self.data or ())
+        self.data.extend(values)
+
+    def value(self):
+        return self.data if self.data is not None else array("q")
+
+
+# current typecode -> candidates
+_TYPECODES = {None: ("q", "d"), "q": ("q", "d"), "d": ("d", )}
+
+
+def column_names(query):
+    """
+    names of the selected values of query (None, if a value has no name, e.g. a function).
+    a name shared by the columns of different tables is qualified by the table name (e.g. "T.id")
+    """
+    values = list(query._select.args) if not query._select.is_empty() else query.props()
+    names = [getattr(v, "name", None) for v in values]
+    counts = Counter(names)
+    r = []
+    for v, name in zip(values, names):
+        record = getattr(v, "record", None)
+        if name is not None and counts[name] > 1 and record is not None:
+            name = "{}.{}".format(record.get_name(), name)
+        r.append(name)
+    return r
+
+
+def fetch_columns(cursor, batch_size=1000, use_numpy=None, names=None):
+    """
+    fetch rows of an executed cursor into columns (column name -> array).
+    the names are names, or the names of cursor.description (if names is not passed, or a name is None).
+    rows are transposed batch by batch, numpy arrays are used if numpy is available.
+
+    >>> cursor.execute("SELECT id, score FROM T")
+    >>> fetch_columns(cursor)
+    {'id': array([1, 2, 3]), 'score': array([0.5, 0.25, 1.0])}
+    """
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    factory = NumpyColumn if use_numpy else ArrayColumn
+    names = [name or d[0] for name, d in zip(names or [None] * len(cursor.description), cursor.description)]
+    duplicated = [name for name, count in Counter(names).items() if count > 1]
+    if duplicated:
+        raise InvalidCombination("conflicted column names: {} (use alias)".format(", ".join(duplicated)))
+    columns = [factory(capacity=batch_size) for _ in names]
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for column, values in zip(columns, zip(*rows)):
+            column.extend(values)
+    return {name: column.value() for name, column in zip(names, columns)}
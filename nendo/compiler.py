@@ -1,127 +1,292 @@
 # -*- coding:utf-8 -*-
-from singledispatch import singledispatch
 from datetime import date, datetime, time
+from .langhelpers import typedispatch
 from .query import Query, _QueryFrom, _QueryProperty
 from .clause import Clause, _SubSelectProperty
-from .expr import BOp, PreOp, PostOp, TriOp, JoinOp, Expr
+from .expr import BOp, NOp, Row, PreOp, PostOp, TriOp, JoinOp, Expr
 from .record import RecordMeta
 from .property import ConcreteProperty
 from .alias import AliasRecord, AliasProperty, AliasExpressionProperty, AliasFunction, QueryRecord
-from .value import Value, Prepared, List, Constant, Function
-from .options import Options
+from .value import Value, Prepared, Bound, ListItem, List, Constant, Function
+from .options import Options, is_named, is_positional, param_name
+from .exceptions import ConflictName
 
 
 ARGS = "__i_args"  # xxx: this is the keyname of stored arguments
-DEFAULT_OPTIONS = Options(use_validation=True, one_table=False, one_line_sql=True, interpolation="%s")
+ARG_KEYS = "__i_arg_keys"  # keyname of stored context keys of arguments (same order as ARGS)
+ARG_INDEX = "__i_arg_index"  # keyname of context key -> position of the parameter (numbered or named paramstyle)
+ARG_NAMES = "__i_arg_names"  # keyname of parameter name -> context key (named paramstyle)
+IN_LIST_INDEX = "__i_in_list_index"  # keyname of id(literal list) -> position in nendo.cache.literal_lists(query)
+DEFAULT_OPTIONS = Options(use_validation=True, one_table=False, one_line_sql=True, interpolation="%s", in_list=None)
 
 
-@singledispatch
+@typedispatch
 def compiler(v, context, options=None, path=None):
     raise NotImplementedError(v)
 
 
-@compiler.register(Query)
-def on_query(query, context, options=None, path=None):
+class _Fragment(str):
+    """already compiled sql fragment (on the stack of iterate())"""
+    __slots__ = ()
+
+
+class _Action(object):
+    """side effect on the stack of iterate() (e.g. leaving a subquery)"""
+    __slots__ = ("fn", )
+
+    def __init__(self, fn):
+        self.fn = fn
+
+
+_OPEN = _Fragment("(")
+_CLOSE = _Fragment(")")
+_SPACE = _Fragment(" ")
+_NEWLINE = _Fragment("\n")
+_COMMA = _Fragment(", ")
+_SELECT = _Fragment("SELECT")
+
+# compiler's handler -> expansion (if a handler is overridden by compiler.register(), it is used as is)
+_EXPANSIONS = {}
+
+
+def streamed(expand):
+    """
+    define compiler's handler by expansion, expand(v, context, options, path) returns a sequence of
+    nodes and fragments. these are compiled by iterate() instead of recursive call.
+    """
+    def handler(v, context, options=None, path=None):
+        return "".join(iterate(v, context, options=options, path=path))
+    handler.__name__ = handler.__qualname__ = expand.__name__
+    handler.__doc__ = expand.__doc__
+    _EXPANSIONS[handler] = expand
+    return handler
+
+
+def iterate(v, context, options=None, path=None):
+    """
+    yield sql fragments. nodes are expanded with an explicit stack instead of recursion,
+    so deeply nested conditions (e.g. 10000 predicates) can be compiled, and the sql is not
+    copied at each nesting level.
+    """
     options = options or DEFAULT_OPTIONS
+    path = [] if path is None else path
+    stack = [v]
+    while stack:
+        e = stack.pop()
+        cls = e.__class__
+        if cls is _Fragment:
+            yield e
+        elif cls is _Action:
+            e.fn()
+        else:
+            handler = compiler.dispatch(cls)
+            expand = _EXPANSIONS.get(handler)
+            if expand is None:
+                yield handler(e, context, options=options, path=path)
+            else:
+                stack.extend(reversed(expand(e, context, options, path)))
+
+
+def iter_chunks(v, context, options=None, path=None, chunk_size=8192):
+    """yield sql in chunks, each chunk is at least chunk_size characters (except the last one)"""
+    buf = []
+    size = 0
+    for fragment in iterate(v, context, options=options, path=path):
+        buf.append(fragment)
+        size += len(fragment)
+        if size >= chunk_size:
+            yield "".join(buf)
+            buf = []
+            size = 0
+    if buf:
+        yield "".join(buf)
+
+
+def _interleave(items, separator):
+    r = []
+    for e in items:
+        r.append(e)
+        r.append(separator)
+    if r:
+        r.pop()
+    return r
+
+
+def _wrap_literal(e):
+    return e if isinstance(e, Expr) else Value(e)
+
+
+@compiler.register(Query)
+@streamed
+def on_query(query, context, options, path):
     if ARGS not in context:
-        context[ARGS] = []
+        context[ARGS] = {} if is_named(options.interpolation) else []
+    if ARG_KEYS not in context:
+        context[ARG_KEYS] = []
 
-    path = path or []
     if options.use_validation:
         query.validate(context)
 
+    separator = _SPACE if options.one_line_sql else _NEWLINE
     r = []
 
     if query._select.is_empty():
-        r.append("SELECT")
-        columns = []
-        for p in query.props():
-            columns.append(compiler(p, context, options=options, path=path))
-        r.append(", ".join(columns))
-    else:
-        r.append(compiler(query._select, context, options=options, path=path))
-
-    if not query._from.is_empty():
-        r.append(compiler(query._from, context, options=options, path=path))
-
-    if not query._where.is_empty():
-        r.append(compiler(query._where, context, options=options, path=path))
-    if not query._group_by.is_empty():
-        r.append(compiler(query._group_by, context, options=options, path=path))
-    if not query._order_by.is_empty():
-        r.append(compiler(query._order_by, context, options=options, path=path))
-    if not query._having.is_empty():
-        r.append(compiler(query._having, context, options=options, path=path))
-    if not query._limit.is_empty():
-        r.append(compiler(query._limit, context, options=options, path=path))
-
-    if options.one_line_sql:
-        return " ".join(r)
+        r.append(_SELECT)
+        r.append(separator)
+        r.extend(_interleave(query.props(), _COMMA))
     else:
-        return "\n".join(r)
+        r.append(query._select)
+
+    for clause in (query._from, query._where, query._group_by, query._order_by, query._having, query._limit):
+        if not clause.is_empty():
+            r.append(separator)
+            r.append(clause)
+    return r
 
 
 @compiler.register(Clause)
-def on_clause(clause, context, options=None, path=None):
-    name = "{} {}".format(clause.get_name(), clause.suffix) if clause.suffix else clause.get_name()
-    return "{} {}".format(name, ", ".join(compiler(e, context, options=options, path=path) for e in clause.args))
+@streamed
+def on_clause(clause, context, options, path):
+    name = "{} {} ".format(clause.get_name(), clause.suffix) if clause.suffix else "{} ".format(clause.get_name())
+    r = [_Fragment(name)]
+    r.extend(_interleave(clause.args, _COMMA))
+    return r
 
 
 @compiler.register(_QueryFrom)
-def on_union_from(select, context, options=None, path=None):
-    r = []
-    for e in select.args:
-        r.append("{}".format(compiler(e, context, options=options, path=path)))
-    name = "{} {}".format(select.get_name(), select.suffix) if select.suffix else select.get_name()
-    return "{} ({}) as {}".format(name, " {} ".format(select.separator).join(r), select.args[0].get_name())
+@streamed
+def on_union_from(select, context, options, path):
+    name = "{} {} (".format(select.get_name(), select.suffix) if select.suffix else "{} (".format(select.get_name())
+    r = [_Fragment(name)]
+    r.extend(_interleave(select.args, _Fragment(" {} ".format(select.separator))))
+    r.append(_Fragment(") as {}".format(select.args[0].get_name())))
+    return r
 
 
 @compiler.register(BOp)
-def on_bop(op, context, options=None, path=None):
-    return "({} {} {})".format(compiler(op.left, context, options=options, path=path), op.op, compiler(op.right, context, options=options, path=path))
+@streamed
+def on_bop(op, context, options, path):
+    if options.in_list is not None and op.op in _IN_LIST_CONNECTIVES and _is_literal_list(op.right):
+        return _expand_in_list(op, options.in_list, context)
+    return (_OPEN, op.left, _Fragment(" {} ".format(op.op)), op.right, _CLOSE)
+
+
+_IN_LIST_CONNECTIVES = {"IN": _Fragment(" OR "), "NOT IN": _Fragment(" AND ")}
+
+
+def _is_literal_list(v):
+    return (v.__class__ is Value
+            and isinstance(v.value, (list, tuple))
+            and bool(v.value)
+            and not any(isinstance(e, Expr) for e in v.value))
+
+
+def _bucket_size(n, in_list):
+    if in_list.bucket == "pow2":
+        size = 1
+        while size < n:
+            size <<= 1
+        return min(size, in_list.limit)
+    return n
+
+
+def in_list_shape(n, in_list):
+    """(the number of chunks, the number of placeholders of the last chunk) of a literal list of n values"""
+    chunks = max(1, -(-n // in_list.limit))
+    return (chunks, _bucket_size(n - (chunks - 1) * in_list.limit, in_list))
+
+
+def _padded_chunks(values, in_list):
+    limit = in_list.limit
+    for start in range(0, len(values), limit):
+        chunk = values[start:start + limit]
+        yield list(chunk) + [chunk[-1]] * (_bucket_size(len(chunk), in_list) - len(chunk))
+
+
+def padded_values(values, in_list):
+    """values of a literal list as bound to the placeholders, the chunks are padded by repeating their last value"""
+    return [v for chunk in _padded_chunks(values, in_list) for v in chunk]
+
+
+def _expand_in_list(op, in_list, context):
+    # x IN (1, 2, 3) -> (x IN (%s, %s, %s, %s)), padded by repeating the last value.
+    # x IN (<too many values>) -> ((x IN (%s, ...)) OR (x IN (%s, ...)))
+    # with a compiled statement, the values are bound from the list of the same position (ListItem), not baked in
+    index = context.get(IN_LIST_INDEX)
+    j = index.get(id(op.right)) if index is not None else None
+    chunks = list(_padded_chunks(op.right.value, in_list))
+    r = []
+    if len(chunks) > 1:
+        r.append(_OPEN)
+    i = 0
+    for chunk in chunks:
+        r.extend((_OPEN, op.left, _Fragment(" {} (".format(op.op))))
+        r.extend(_interleave([Bound(v) if j is None else ListItem(v, (j, i + k)) for k, v in enumerate(chunk)], _COMMA))
+        i += len(chunk)
+        r.append(_CLOSE)
+        r.append(_CLOSE)
+        r.append(_IN_LIST_CONNECTIVES[op.op])
+    r.pop()
+    if len(chunks) > 1:
+        r.append(_CLOSE)
+    return r
+
+
+@compiler.register(NOp)
+@streamed
+def on_nop(op, context, options, path):
+    r = [_OPEN]
+    r.extend(_interleave(op.args, _Fragment(" {} ".format(op.op))))
+    r.append(_CLOSE)
+    return r
+
+
+@compiler.register(Row)
+@streamed
+def on_row(op, context, options, path):
+    r = [_OPEN]
+    r.extend(_interleave(op.args, _COMMA))
+    r.append(_CLOSE)
+    return r
 
 
 @compiler.register(PreOp)
-def on_preop(op, context, options=None, path=None):
-    return "({} {})".format(op.op, compiler(op.value, context, options=options, path=path))
+@streamed
+def on_preop(op, context, options, path):
+    return (_OPEN, _Fragment("{} ".format(op.op)), op.value, _CLOSE)
 
 
 @compiler.register(PostOp)
-def on_postop(op, context, options=None, path=None):
-    return "{} {}".format(compiler(op.value, context, options=options, path=path), op.op)
+@streamed
+def on_postop(op, context, options, path):
+    return (op.value, _Fragment(" {}".format(op.op)))
 
 
 @compiler.register(TriOp)
-def on_triop(op, context, options=None, path=None):
-    return "({} {} {} {} {})".format(compiler(op.left, context, options=options, path=path),
-                                     op.op,
-                                     compiler(op.middle, context, options=options, path=path),
-                                     op.op2,
-                                     compiler(op.right, context, options=options, path=path))
+@streamed
+def on_triop(op, context, options, path):
+    return (_OPEN, op.left, _Fragment(" {} ".format(op.op)), op.middle, _Fragment(" {} ".format(op.op2)), op.right, _CLOSE)
 
 
 @compiler.register(JoinOp)
-def on_joinop(op, context, options=None, path=None):
-    r = []
-    r.append(compiler(op.left, context, options=options, path=path))
-    r.append(op.op)
-    r.append(compiler(op.right, context, options=options, path=path))
+@streamed
+def on_joinop(op, context, options, path):
+    r = [op.left, _Fragment(" {} ".format(op.op)), op.right]
     for e in op.args:
-        r.append("ON {}".format(compiler(e, context, options=options, path=path)))
-    return " ".join(r)
+        r.append(_Fragment(" ON "))
+        r.append(e)
+    return r
 
 
 @compiler.register(QueryRecord)
-def on_query_record(record, context, options=None, path=None):
+@streamed
+def on_query_record(record, context, options, path):
     name = record.get_name()
     if name:
-        path = path or []
         path.append(name)
-        value = "({}) as {}".format(compiler(record.query, context, options=options, path=path), name)
-        path.pop()
+        return (_OPEN, record.query, _Action(path.pop), _Fragment(") as {}".format(name)))
     else:
-        value = "({})".format(compiler(record.query, context, options=options, path=path))
-    return value
+        return (_OPEN, record.query, _CLOSE)
 
 
 @compiler.register(RecordMeta)
@@ -130,8 +295,9 @@ def on_record(record, context, options=None, path=None):
 
 
 @compiler.register(AliasRecord)
-def on_alias_record(record, context, options=None, path=None):
-    return "{} as {}".format(compiler(record._core, context, options=options, path=path), record.get_name())
+@streamed
+def on_alias_record(record, context, options, path):
+    return (record._core, _Fragment(" as {}".format(record.get_name())))
 
 
 @compiler.register(ConcreteProperty)
@@ -149,44 +315,80 @@ def on_query_property(prop, context, options=None, path=None):
 
 
 @compiler.register(_SubSelectProperty)
-def on_subselect_property(prop, context, options=None, path=None):
-    column_name = compiler(prop.prop, context, options=options, path=path)
-    return "{} as {}".format(column_name, prop.projection_name)
+@streamed
+def on_subselect_property(prop, context, options, path):
+    return (prop.prop, _Fragment(" as {}".format(prop.projection_name)))
 
 
 @compiler.register(AliasProperty)
-def on_alias_property(prop, context, options=None, path=None):
-    return "{} as {}".format(compiler(prop.prop, context, options=options, path=path), prop.name)
+@streamed
+def on_alias_property(prop, context, options, path):
+    return (prop.prop, _Fragment(" as {}".format(prop.name)))
 
 
 # xxx:
 @compiler.register(AliasExpressionProperty)
-def on_alias_expression_property(prop, context, options=None, path=None):
-    return "({})".format(compiler(prop.record._parent.query, context, options=options, path=path))
+@streamed
+def on_alias_expression_property(prop, context, options, path):
+    return (_OPEN, prop.record._parent.query, _CLOSE)
+
+
+def _parameter(key, value, context, interpolation):
+    # value is a function returning the bound value (not called if only keys are collected)
+    keys = context[ARG_KEYS]
+    args = context[ARGS]
+    if is_positional(interpolation):  # e.g. "%s", "?"
+        keys.append(key)
+        if args is not None:  # None: only keys are collected (see nendo.statement.compile_statement)
+            args.append(value())  # side-effect!
+        return interpolation
+
+    # numbered or named, a repeated parameter shares its placeholder
+    index = context.get(ARG_INDEX)
+    if index is None:
+        index = context[ARG_INDEX] = {}
+    i = index.get(key) if isinstance(key, str) else None  # each Bound is a distinct parameter
+    if i is None:
+        keys.append(key)
+        i = len(keys)
+        if isinstance(key, str):
+            index[key] = i
+        if is_named(interpolation):
+            _check_param_name(key, i, context)
+            if args is not None:
+                args[param_name(key, i)] = value()
+        elif args is not None:
+            args.append(value())
+    return interpolation.format(i, name=param_name(key, i))
+
+
+def _check_param_name(key, i, context):
+    # e.g. "sub_q.x" and "sub_q__x" (or Bound and "_1") would be bound to the same name
+    names = context.get(ARG_NAMES)
+    if names is None:
+        names = context[ARG_NAMES] = {}
+    name = param_name(key, i)
+    other = names.setdefault(name, key)
+    if other is not key:
+        raise ConflictName("parameter name {!r} is shared by {!r} and {!r}".format(name, other, key))
 
 
 @compiler.register(Prepared)
 def on_prepared(v, context, options=None, path=None):
-    if not path:
-        context[ARGS].append(context[v.key])
-        return options.interpolation
-    else:
-        path.append(v.key)
-        k = ".".join(path)
-        context[ARGS].append(context[k])  # side-effect!
-        return options.interpolation
+    k = ".".join(path + [v.key]) if path else v.key
+    return _parameter(k, lambda: context[k], context, options.interpolation)
+
+
+@compiler.register(Bound)
+def on_bound(v, context, options=None, path=None):
+    # not a key of context, the value itself is bound
+    return _parameter(v, lambda: v.value, context, options.interpolation)
 
 
 @compiler.register(List)  # list is not python's list
-def on_list(v, context, options=None, path=None):
-    v = v.value
-    r = []
-    for e in v:
-        if isinstance(e, Expr):
-            r.append(compiler(e, context, options=options, path=path))
-        else:
-            r.append(compiler(Value(e), context, options=options, path=path))
-    return ", ".join(r)
+@streamed
+def on_list(v, context, options, path):
+    return _interleave([_wrap_literal(e) for e in v.value], _COMMA)
 
 
 @compiler.register(Constant)
@@ -195,37 +397,40 @@ def on_constant(v, context, options=None, path=None):
 
 
 @compiler.register(Function)
-def on_function(v, context, options=None, path=None):
-    return "{}({})".format(v.value, ", ".join(compiler(e, context, options=options, path=path) for e in v.args))
+@streamed
+def on_function(v, context, options, path):
+    r = [_Fragment("{}(".format(v.value))]
+    r.extend(_interleave(v.args, _COMMA))
+    r.append(_CLOSE)
+    return r
 
 
 @compiler.register(AliasFunction)
-def on_alias_function(v, context, options=None, path=None):
-    return "{} as {}".format(compiler(v.fn, context, options=options, path=path), v.alias_name)
+@streamed
+def on_alias_function(v, context, options, path):
+    return (v.fn, _Fragment(" as {}".format(v.alias_name)))
 
 
 @compiler.register(Value)
-def on_value(v, context, options=None, path=None):
+@streamed
+def on_value(v, context, options, path):
     v = v.value
     if v is None:
-        return "NULL"
+        return (_Fragment("NULL"), )
     elif isinstance(v, (list, tuple)):
-        r = []
-        for e in v:
-            if isinstance(e, Expr):
-                r.append(compiler(e, context, options=options, path=path))
-            else:
-                r.append(compiler(Value(e), context, options=options, path=path))
-        return "({})".format(", ".join(r))
+        r = [_OPEN]
+        r.extend(_interleave([_wrap_literal(e) for e in v], _COMMA))
+        r.append(_CLOSE)
+        return r
     elif isinstance(v, str):
-        return "'{}'".format(v)
+        return (_Fragment("'{}'".format(v)), )
     elif isinstance(v, bool):
-        return "{}".format(int(v))
+        return (_Fragment("{}".format(int(v))), )
     else:
-        return convert(v)
+        return (_Fragment(convert(v)), )
 
 
-@singledispatch
+@typedispatch
 def convert(v):
     return str(v)
 
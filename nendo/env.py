@@ -1,17 +1,54 @@
 # -*- coding:utf-8 -*-
 class Env(object):
-    def __init__(self, env=None):
-        self.env = env or {}
-        assert isinstance(self.env, dict)
+    """
+    parameters (e.g. Prepared values) of an expression.
+
+    merge() only links the envs of operands (like collections.ChainMap), so building
+    an expression is linear in the number of parameters. the entries are flattened
+    when `env` is accessed.
+    """
+    __slots__ = ("_env", "parents")
+
+    def __init__(self, env=None, parents=None):
+        self._env = env or {}
+        assert isinstance(self._env, dict)
+        self.parents = parents or []
+
+    @property
+    def env(self):
+        return self.flatten()
+
+    def items(self):
+        return self.flatten().items()
+
+    def is_empty(self):
+        return not self._env and not self.parents
 
     def make(self):
-        return self.__class__(env=self.env.copy())
+        return self.__class__(parents=[self])
 
     def merge(self, *targets):
         for t in targets:
-            # broken?
-            while hasattr(t, "env"):
-                t = t.env
-            if hasattr(t, "items"):
-                for k, v in t.items():
-                    self.env[k] = v
+            # expression -> its env
+            if not isinstance(t, (Env, dict)):
+                t = getattr(t, "env", None)
+            if isinstance(t, dict):
+                t = Env(t.copy())
+            if t is None or t is self or t.is_empty():
+                continue
+            self.parents.append(t)
+
+    def flatten(self):
+        # the later merged entries have priority (same as eager merging). iterative, because
+        # the chain can be as deep as the expression is.
+        r = {}
+        seen = set()
+        stack = [self]
+        while stack:
+            e = stack.pop()
+            if id(e) in seen:
+                continue
+            seen.add(id(e))
+            r.update(e._env)
+            stack.extend(reversed(e.parents))
+        return r
@@ -13,3 +13,7 @@ class MissingName(ValidationError):
 
 class InvalidCombination(ValidationError):
     pass
+
+
+class PoolTimeout(Exception):
+    pass
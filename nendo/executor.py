@@ -0,0 +1,82 @@
+# -*- coding:utf-8 -*-
+import sys
+from .renderer import Renderer
+from .hydration import make_hydrator
+from .options import PARAMSTYLES
+
+
+def interpolation_of(connection, default="%s"):
+    """placeholder of the DB-API module of connection (e.g. sqlite3.paramstyle == "qmark" -> "?")"""
+    from .pool import PooledConnection
+    if isinstance(connection, PooledConnection):
+        connection = connection.connection
+    module_name = connection.__class__.__module__
+    while module_name:
+        module = sys.modules.get(module_name)
+        paramstyle = getattr(module, "paramstyle", None)
+        if paramstyle is not None:
+            return PARAMSTYLES.get(paramstyle, default)
+        module_name = module_name.rpartition(".")[0]
+    return default
+
+
+class Executor(object):
+    """
+    run queries on a DB-API connection. rows are fetched lazily by fetchmany(batch_size).
+
+    >>> executor = Executor(sqlite3.connect("app.db"))
+    >>> for user in executor.iter_records(query, name="foo"):
+    ...     print(user.id)
+    """
+    def __init__(self, connection, renderer=None, batch_size=1000):
+        self.connection = connection
+        self.renderer = renderer or Renderer(interpolation=interpolation_of(connection))
+        self.batch_size = batch_size
+
+    def execute(self, query, **context):
+        """returns the cursor"""
+        sql, args = self.renderer(query, **context)
+        cursor = self.connection.cursor()
+        cursor.execute(sql, args)
+        return cursor
+
+    def iter_batches(self, query, batch_size=None, hydrate=False, **context):
+        """yield lists of rows (or records, if hydrate is true), each list has at most batch_size rows"""
+        size = batch_size or self.batch_size
+        convert = make_hydrator(query) if hydrate else None
+        cursor = self.execute(query, **context)
+        try:
+            while True:
+                rows = cursor.fetchmany(size)
+                if not rows:
+                    break
+                yield list(map(convert, rows)) if convert is not None else rows
+        finally:
+            cursor.close()
+
+    def iter_rows(self, query, batch_size=None, **context):
+        for rows in self.iter_batches(query, batch_size=batch_size, **context):
+            yield from rows
+
+    def iter_records(self, query, batch_size=None, **context):
+        """yield record instances (see nendo.hydration.make_hydrator)"""
+        for records in self.iter_batches(query, batch_size=batch_size, hydrate=True, **context):
+            yield from records
+
+    def paginate(self, query, page_size=None, hydrate=False, row_values=True, **context):
+        """yield pages of query by keyset pagination (see nendo.paginate.iter_pages)"""
+        from .paginate import iter_pages
+        return iter_pages(self, query, page_size or self.batch_size, hydrate=hydrate, row_values=row_values, **context)
+
+    def fetch_columns(self, query, batch_size=None, use_numpy=None, **context):
+        """
+        fetch the result as columns, name of selected value -> array (see nendo.columnar.fetch_columns).
+        a column name shared by different tables is qualified by the table name (e.g. "T.id").
+        """
+        from .columnar import fetch_columns, column_names
+        names = column_names(query)
+        cursor = self.execute(query, **context)
+        try:
+            return fetch_columns(cursor, batch_size=batch_size or self.batch_size, use_numpy=use_numpy, names=names)
+        finally:
+            cursor.close()
@@ -0,0 +1,135 @@
+# -*- coding:utf-8 -*-
+import re
+import sys
+
+# sqlite: "SCAN T", "SCAN TABLE T AS x USING INDEX i" (older versions), "SCAN x USING COVERING INDEX i"
+_SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS (\w+))?( USING (?:COVERING )?INDEX\b)?")
+# postgresql: "Seq Scan on t", "Parallel Seq Scan on t x"
+_SEQ_SCAN = re.compile(r"\bSeq Scan on (\w+)(?: (\w+))?")
+
+
+class PlanNode(object):
+    """a node of query plan. the root node (id=0) has the top level steps as its children"""
+    __slots__ = ("id", "parent", "detail", "children")
+
+    def __init__(self, id, parent, detail, children=None):
+        self.id = id
+        self.parent = parent
+        self.detail = detail
+        self.children = children or []
+
+    def walk(self):
+        """yield nodes in pre-order, including self"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def full_scans(self, allow_index_scan=False):
+        """names of fully scanned tables (or their aliases), a scan by an index is not counted if allow_index_scan"""
+        names = []
+        for node in self.walk():
+            m = _SQLITE_SCAN.match(node.detail)
+            if m is not None:
+                if not (allow_index_scan and m.group(3)):
+                    names.extend(name for name in m.group(1, 2) if name)
+                continue
+            m = _SEQ_SCAN.search(node.detail)
+            if m is not None:
+                names.extend(name for name in m.group(1, 2) if name)
+        return names
+
+    def format(self, indent="  "):
+        lines = []
+        stack = [(self, 0)]
+        while stack:
+            node, depth = stack.pop()
+            lines.append("{}{}".format(indent * depth, node.detail))
+            stack.extend((child, depth + 1) for child in reversed(node.children))
+        return "\n".join(lines)
+
+    __str__ = format
+
+    def __repr__(self):
+        return "<PlanNode {} {!r} children={}>".format(self.id, self.detail, len(self.children))
+
+
+def build_plan(rows):
+    """plan tree from rows of sqlite's EXPLAIN QUERY PLAN, (id, parent, notused, detail)"""
+    root = PlanNode(0, None, "QUERY PLAN")
+    nodes = {0: root}
+    for row in rows:
+        id_, parent, detail = row[0], row[1], row[-1]
+        node = nodes[id_] = PlanNode(id_, parent, detail)
+        nodes.get(parent, root).children.append(node)
+    return root
+
+
+def parse_plan(lines):
+    """
+    plan tree from text of EXPLAIN (e.g. postgresql), the nesting is given by indentation.
+
+    >>> print(parse_plan(["Limit  (cost=...)", "  ->  Seq Scan on t  (cost=...)", "        Filter: (id > 10)"]))
+    QUERY PLAN
+      Limit  (cost=...)
+        Seq Scan on t  (cost=...)
+          Filter: (id > 10)
+    """
+    root = PlanNode(0, None, "QUERY PLAN")
+    stack = [(-1, root)]  # (indentation, node)
+    for i, line in enumerate(lines, 1):
+        text = line.lstrip()
+        depth = len(line) - len(text)
+        if text.startswith("->"):
+            text = text[2:].lstrip()
+        while stack[-1][0] >= depth:
+            stack.pop()
+        parent = stack[-1][1]
+        node = PlanNode(i, parent.id, text.rstrip())
+        parent.children.append(node)
+        stack.append((depth, node))
+    return root
+
+
+def _is_sqlite(connection):
+    from .pool import PooledConnection
+    if isinstance(connection, PooledConnection):
+        connection = connection.connection
+    sqlite3 = sys.modules.get("sqlite3")  # not imported, if it is not used
+    return sqlite3 is not None and isinstance(connection, sqlite3.Connection)
+
+
+def explain(query, connection, renderer=None, **context):
+    """
+    render query (by renderer, or a renderer for the paramstyle of connection), and returns its plan tree.
+    EXPLAIN QUERY PLAN is used on sqlite, otherwise EXPLAIN.
+
+    >>> print(explain(Query().from_(User).where(User.name == Prepared("name")), conn, name="foo"))
+    QUERY PLAN
+      SCAN User
+    """
+    from .executor import Executor
+    sqlite = _is_sqlite(connection)
+    sql, args = Executor(connection, renderer=renderer).renderer(query, **context)
+    cursor = connection.cursor()
+    try:
+        cursor.execute("{} {}".format("EXPLAIN QUERY PLAN" if sqlite else "EXPLAIN", sql), args)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    if sqlite:
+        return build_plan(rows)
+    return parse_plan([" ".join(str(v) for v in row) for row in rows])
+
+
+def assert_no_full_scan(plan, table, allow_index_scan=False):
+    """
+    fails (AssertionError) if table (a record, or a name) is fully scanned in plan.
+    an aliased table is reported by its alias.
+
+    >>> assert_no_full_scan(explain(query, conn, id=1), User)
+    """
+    name = table.get_name() if hasattr(table, "get_name") else table
+    if name in plan.full_scans(allow_index_scan=allow_index_scan):
+        raise AssertionError("full scan on {}:\n{}".format(name, plan.format()))
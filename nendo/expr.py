@@ -1,13 +1,13 @@
 # -*- coding:utf-8 -*-
-from singledispatch import singledispatch
 from functools import wraps, partial
+from itertools import chain
 from datetime import date, datetime
-from .langhelpers import reify
+from .langhelpers import reify, typedispatch
 from .env import Env
 from .exceptions import InvalidCombination
 
 
-@singledispatch
+@typedispatch
 def wrap(other):
     return other
 
@@ -90,14 +90,18 @@ class UOp(Expr):
         self.value = value
         super().__init__(env=env)
 
+    @property
+    def operands(self):
+        return (self.value, )
+
     def tables(self):
-        yield from self.value.tables()
+        return walk(self, "tables")
 
     def props(self):
-        yield from self.value.props()
+        return walk(self, "props")
 
     def __repr__(self):
-        return "<U: {} {} {}>".format(self.op, self.value)
+        return "<U: {} {}>".format(self.op, self.value)
 
 
 class PreOp(UOp):
@@ -121,18 +125,68 @@ class BOp(Expr):
         self.right = right
         super().__init__(env=env)
 
+    @property
+    def operands(self):
+        return (self.left, self.right)
+
     def tables(self):
-        yield from self.left.tables()
-        yield from self.right.tables()
+        return walk(self, "tables")
 
     def props(self):
-        yield from self.left.props()
-        yield from self.right.props()
+        return walk(self, "props")
 
     def __repr__(self):
         return "<B: {} {} {}>".format(self.op, self.left, self.right)
 
 
+class NOp(Expr):
+    """n-ary operator. (e.g. (a AND b AND c))"""
+    __slots__ = ("op", "_prefix", "_args", "_env")
+
+    def __init__(self, op, args, env=None, prefix=None):
+        self.op = op
+        self._prefix = prefix  # NOp whose args are placed before args (shared, not copied)
+        self._args = tuple(args)
+        super().__init__(env=env)
+
+    @property
+    def args(self):
+        if self._prefix is not None:
+            chunks = []
+            e = self
+            while e._prefix is not None:
+                chunks.append(e._args)
+                e = e._prefix
+            chunks.append(e._args)
+            self._args = tuple(chain.from_iterable(reversed(chunks)))
+            self._prefix = None
+        return self._args
+
+    @property
+    def operands(self):
+        return self.args
+
+    def tables(self):
+        return walk(self, "tables")
+
+    def props(self):
+        return walk(self, "props")
+
+    def __repr__(self):
+        return "<N: {} {}>".format(self.op, self.args)
+
+
+class Row(NOp):
+    """row value. (e.g. (a, b) > (1, 2))"""
+    __slots__ = ()
+
+    def __init__(self, args, env=None):
+        super().__init__(",", args, env=env)
+
+    def __repr__(self):
+        return "<R: {}>".format(self.args)
+
+
 class TriOp(Expr):
     __slots__ = ("op", "op2", "left", "middle", "right", "_env")
 
@@ -147,15 +201,15 @@ class TriOp(Expr):
     def __repr__(self):
         return "<T: {} {} {} {}>".format(self.op, self.left, self.middle, self.right)
 
+    @property
+    def operands(self):
+        return (self.left, self.middle, self.right)
+
     def tables(self):
-        yield from self.left.tables()
-        yield from self.middle.tables()
-        yield from self.right.tables()
+        return walk(self, "tables")
 
     def props(self):
-        yield from self.left.props()
-        yield from self.middle.props()
-        yield from self.right.props()
+        return walk(self, "props")
 
 
 class JoinOp(Expr):  # todo: move
@@ -176,12 +230,10 @@ class JoinOp(Expr):  # todo: move
         return "<J: {} {} {} {}>".format(self.op, self.left, self.right, self.args)
 
     def tables(self):
-        yield from self.left.tables()
-        yield from self.right.tables()
+        return walk(self, "tables")
 
     def props(self):
-        for cond in self.args:
-            yield from cond.props()
+        return walk(self, "props")
 
     def swap(self, name):
         return self  # xxx
@@ -198,6 +250,27 @@ class JoinOp(Expr):  # todo: move
     def cross_join(self, other, *args):
         return CrossJoin(self, other, args)
 
+
+def walk(expr, name):
+    """
+    iterative version of expr.tables() / expr.props() (name is "tables" or "props").
+    operators are expanded with an explicit stack, so deeply nested conditions don't consume python's stack.
+    """
+    stack = [expr]
+    while stack:
+        e = stack.pop()
+        if isinstance(e, JoinOp):
+            if name == "tables":
+                stack.append(e.right)
+                stack.append(e.left)
+            else:
+                stack.extend(reversed(e.args))
+        elif isinstance(e, (UOp, BOp, NOp, TriOp)):
+            stack.extend(reversed(e.operands))
+        else:
+            yield from getattr(e, name)()
+
+
 Not = partial(PreOp, "NOT")
 Asc = partial(PostOp, "ASC")
 Desc = partial(PostOp, "DESC")
@@ -209,8 +282,55 @@ Gt = partial(BOp, '>')
 Lt = partial(BOp, '<')
 Ge = partial(BOp, '>=')
 Le = partial(BOp, '<=')
-And = partial(BOp, 'AND')
-Or = partial(BOp, 'OR')
+
+
+def _flatten(op, args):
+    # (a AND b) AND c == a AND b AND c
+    r = []
+    for e in args:
+        if isinstance(e, NOp) and e.op == op:
+            r.extend(e.args)
+        else:
+            r.append(e)
+    return r
+
+
+def _nop(op, args):
+    first = args[0]
+    if isinstance(first, NOp) and first.op == op:
+        # a chain like `a & b & c & ...`, the args of left operand are shared
+        return NOp(op, _flatten(op, args[1:]), prefix=first)
+    return NOp(op, _flatten(op, args))
+
+
+def And(*args):
+    return _nop("AND", args)
+
+
+def Or(*args):
+    return _nop("OR", args)
+
+
+def _connect(factory, args):
+    if not args:
+        raise InvalidCombination("at least one condition is required")
+    if len(args) == 1:
+        return wrap(args[0])
+    value = factory(*[wrap(e) for e in args])
+    value.env.merge(*args)  # side effect
+    return value
+
+
+def and_(*args):
+    """and_(a, b, c) == (a AND b AND c)"""
+    return _connect(And, args)
+
+
+def or_(*args):
+    """or_(a, b, c) == (a OR b OR c)"""
+    return _connect(Or, args)
+
+
 Eq = partial(BOp, '=')
 Ne = partial(BOp, '<>')
 Is = partial(BOp, 'IS')
@@ -0,0 +1,61 @@
+# -*- coding:utf-8 -*-
+from .langhelpers import as_python_code
+from .record import RecordMeta
+from .cache import LRUCache
+from .exceptions import InvalidCombination
+
+# (record, keys) -> hydrator, the generated function is shared by the queries selecting same columns
+# (shared by threads, LRUCache is thread safe)
+_HYDRATORS = LRUCache(256)
+
+
+def make_hydrator(query, record=None):
+    """
+    returns a function building a record instance from a row tuple of DB-API cursor.
+    the order of values is the order of the columns of query's SELECT. (the columns not selected are None)
+
+    >>> hydrate = make_hydrator(Query().from_(User).select(User.id, User.name))
+    >>> hydrate((1, "foo")).name
+    'foo'
+    """
+    # selected values (not query.props(), a function's arguments are not columns of the row)
+    props = list(query._select.args) if not query._select.is_empty() else query.props()
+    if record is None:
+        record = getattr(props[0], "record", None) if props else None
+    if not isinstance(record, RecordMeta):
+        raise InvalidCombination("hydration target is not a record: {!r}".format(record))
+
+    keys = []
+    for prop in props:
+        if getattr(prop, "record", None) is not record or getattr(prop, "_key", None) not in record.__slots__:
+            raise InvalidCombination("{!r} is not a column of {}".format(prop, record.get_name()))
+        keys.append(prop._key)
+    cache_key = (record, tuple(keys))
+    hydrator = _HYDRATORS.get(cache_key)
+    if hydrator is None:
+        hydrator = _HYDRATORS[cache_key] = _make_hydrator("hydrate", record, keys)
+    return hydrator
+
+
+def hydrate(query, rows, record=None):
+    """lazily build record instances from rows (e.g. a cursor)"""
+    return map(make_hydrator(query, record=record), rows)
+
+
+@as_python_code
+def _make_hydrator(m, name, record, keys):
+    """
+    >>> _make_hydrator("hydrate", User, ["_c_name", "_c_id"])  # User(id, name, email)
+    # def hydrate(row):
+    #     return record(row[1], row[0], None)
+    """
+    m.env["record"] = record
+    slots = ["_c_{}".format(attr) for attr in record._property_name_list]
+    with m.def_(name, "row"):
+        if keys and keys == slots:
+            m.return_("record(*row)")  # all columns (in the order of __init__)
+        else:
+            position = {k: i for i, k in enumerate(keys)}  # the last one, if a column is selected twice
+            m.return_("record({})".format(", ".join(
+                "row[{}]".format(position[k]) if k in position else "None" for k in slots
+            )))
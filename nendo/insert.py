@@ -0,0 +1,107 @@
+# -*- coding:utf-8 -*-
+from itertools import islice, chain
+from .exceptions import InvalidCombination
+from .options import is_named, is_positional
+
+
+class Insert(object):
+    """
+    INSERT statement for a record (multi-row VALUES, optionally with ON CONFLICT)
+
+    >>> Insert(User).on_conflict(User.id).do_update(User.name)
+    # INSERT INTO User (id, name) VALUES (%s, %s), ... ON CONFLICT (id) DO UPDATE SET name = excluded.name
+    """
+    def __init__(self, record, *columns, conflict=None, update=None, nothing=False):
+        self.record = record
+        self.columns = columns or tuple(record.props())
+        self.conflict = conflict or ()
+        self.update = update or ()
+        self.nothing = nothing
+
+    def make(self, conflict=None, update=None, nothing=None):
+        return self.__class__(
+            self.record,
+            *self.columns,
+            conflict=self.conflict if conflict is None else conflict,
+            update=self.update if update is None else update,
+            nothing=self.nothing if nothing is None else nothing
+        )
+
+    def on_conflict(self, *columns):
+        return self.make(conflict=columns)
+
+    def do_update(self, *columns):
+        if not self.conflict:
+            raise InvalidCombination("do_update() requires on_conflict()")
+        return self.make(update=columns or tuple(c for c in self.columns if c.name not in self.conflict_names), nothing=False)
+
+    def do_nothing(self):
+        return self.make(update=(), nothing=True)
+
+    @property
+    def conflict_names(self):
+        return [c.name for c in self.conflict]
+
+    def get_name(self):
+        return self.record.get_name()
+
+    def values_of(self, row):
+        """a row is a record instance, a mapping or a sequence (in the order of columns)"""
+        if isinstance(row, self.record):
+            return [getattr(row, c.attr) for c in self.columns]
+        elif hasattr(row, "keys"):
+            return [row[c.attr] for c in self.columns]
+        elif len(row) != len(self.columns):
+            raise InvalidCombination("{} values are passed, but {} columns".format(len(row), len(self.columns)))
+        return row
+
+    def param_names(self, nrows):
+        """names of parameters (named paramstyle), <column>_<row>"""
+        return ["{}_{}".format(c.attr, i) for i in range(nrows) for c in self.columns]
+
+    def sql(self, nrows, interpolation="%s"):
+        if is_positional(interpolation):
+            placeholders = "({})".format(", ".join([interpolation] * len(self.columns)))
+            values = ", ".join([placeholders] * nrows)
+        else:
+            ncols = len(self.columns)
+            names = self.param_names(nrows)
+            values = ", ".join(
+                "({})".format(", ".join(interpolation.format(i + 1, name=names[i]) for i in range(row * ncols, (row + 1) * ncols)))
+                for row in range(nrows)
+            )
+        r = ["INSERT INTO {} ({}) VALUES {}".format(
+            self.get_name(),
+            ", ".join(c.name for c in self.columns),
+            values
+        )]
+        if self.conflict:
+            r.append("ON CONFLICT ({})".format(", ".join(self.conflict_names)))
+            if self.nothing or not self.update:
+                r.append("DO NOTHING")
+            else:
+                r.append("DO UPDATE SET {}".format(", ".join("{0} = excluded.{0}".format(c.name) for c in self.update)))
+        return " ".join(r)
+
+
+def iter_insert(insert, rows, max_params=999, interpolation="%s"):
+    """
+    yield (sql, args) for each chunk of rows. rows can be a generator,
+    each statement has at most max_params parameters. (args are a dict, if interpolation is named)
+    """
+    rows_per_statement = max(1, max_params // len(insert.columns))
+    full_sql = None
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, rows_per_statement))
+        if not chunk:
+            break
+        args = list(chain.from_iterable(insert.values_of(row) for row in chunk))
+        if is_named(interpolation):
+            args = dict(zip(insert.param_names(len(chunk)), args))
+        if len(chunk) == rows_per_statement:
+            if full_sql is None:
+                full_sql = insert.sql(rows_per_statement, interpolation=interpolation)
+            yield (full_sql, args)
+        else:
+            yield (insert.sql(len(chunk), interpolation=interpolation), args)
@@ -1,7 +1,5 @@
 # -*- coding:utf-8 -*-
-from prestring.python import PythonModule
-import logging
-logger = logging.getLogger(__name__)
+from functools import update_wrapper
 
 
 class Counter(object):
@@ -32,13 +30,70 @@ class reify(object):
         return val
 
 
+def typedispatch(fn):
+    """
+    single dispatch function, like singledispatch.
+    handlers are cached by exact type of the first argument, MRO is resolved only on first sight.
+
+    >>> @typedispatch
+    ... def f(v):
+    ...     return "default"
+    >>> @f.register(int)
+    ... def on_int(v):
+    ...     return "int"
+    """
+    registry = {object: fn}
+    cache = {}
+
+    def dispatch(cls):
+        try:
+            return cache[cls]
+        except KeyError:
+            handler = cache[cls] = _resolve(registry, cls)
+            return handler
+
+    def register(cls, func=None):
+        if func is None:
+            return lambda func: register(cls, func)
+        registry[cls] = func
+        cache.clear()
+        return func
+
+    def wrapper(v, *args, **kwargs):
+        try:
+            handler = cache[v.__class__]
+        except KeyError:
+            handler = dispatch(v.__class__)
+        return handler(v, *args, **kwargs)
+
+    wrapper.register = register
+    wrapper.dispatch = dispatch
+    wrapper.registry = registry
+    update_wrapper(wrapper, fn)
+    return wrapper
+
+
+def _resolve(registry, cls):
+    for c in cls.__mro__:
+        if c is not object and c in registry:
+            return registry[c]
+    for c, handler in registry.items():  # virtual subclass (e.g. abc.ABCMeta.register)
+        if c is not object and issubclass(cls, c):
+            return handler
+    return registry[object]
+
+
 def as_python_code(fn):
-    def wrapper(name, *args, **kwargs):
+    def wrapper(*args, **kwargs):
+        # the first argument is the name of generated object (not a keyword, e.g. make_record(..., name=...))
+        name = args[0]
+        import logging
+        from prestring.python import PythonModule  # codegen is loaded on first use
         m = PythonModule()
         m.env = {}
-        fn(m, name, *args, **kwargs)
+        fn(m, *args, **kwargs)
         code = str(m)
-        logger.debug("-- as_python_code --\n%s", code)
+        logging.getLogger(__name__).debug("-- as_python_code --\n%s", code)
         # activate python code
         exec(code, m.env)
         return m.env[name]
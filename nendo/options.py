@@ -1,3 +1,41 @@
 # -*- coding:utf-8 -*-
 from collections import namedtuple
-Options = namedtuple("Options", "use_validation, one_table, one_line_sql, interpolation")
+Options = namedtuple("Options", "use_validation, one_table, one_line_sql, interpolation, in_list")
+Options.__new__.__defaults__ = (None, )  # in_list
+
+# binding literal IN lists as parameters.
+# the number of placeholders is padded to bucket ("pow2" or None(exact)),
+# and a list longer than limit is split into chunks.
+InList = namedtuple("InList", "bucket, limit")
+InList.__new__.__defaults__ = ("pow2", 1000)
+
+# interpolation of each paramstyle (DB-API's paramstyle, and "dollar" for PostgreSQL's $1).
+# "{}" is formatted with the position of the parameter, "{name}" with its name.
+# with numbered and named styles, a repeated parameter is bound once. with named styles, args are a dict.
+PARAMSTYLES = {
+    "qmark": "?",
+    "format": "%s",
+    "numeric": ":{}",
+    "dollar": "${}",
+    "named": ":{name}",
+    "pyformat": "%({name})s",
+}
+
+
+def is_named(interpolation):
+    return "{name}" in interpolation
+
+
+def is_positional(interpolation):
+    """each parameter is bound by its occurrence (no placeholder is shared)"""
+    return "{" not in interpolation
+
+
+def param_name(key, i):
+    """
+    name of a parameter, key is a context key (or value.Bound, it is named by its position).
+    names can be conflicted (e.g. "sub_q.x" and "sub_q__x"), the compiler raises ConflictName for them.
+    """
+    if isinstance(key, str):
+        return key.replace(".", "__")
+    return "_{}".format(i)
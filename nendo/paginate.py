@@ -0,0 +1,149 @@
+# -*- coding:utf-8 -*-
+from .expr import PostOp, Row, Gt, Lt, Eq, And, Or
+from .property import ConcreteProperty
+from .alias import AliasProperty
+from .value import Value, Prepared
+from .hydration import make_hydrator
+from .exceptions import InvalidCombination
+
+SEEK_KEY = "__seek_{}"  # the context key of the value of the i-th ORDER BY column, on the last row
+
+
+def seek_keys(query):
+    """(expression, descending) of each column of query's ORDER BY (an aliased column is the column itself)"""
+    keys = []
+    for e in query._order_by.args:
+        if isinstance(e, PostOp):
+            keys.append((_unalias(e.value), e.op == "DESC"))
+        else:
+            keys.append((_unalias(e), False))
+    if not keys:
+        raise InvalidCombination("keyset pagination needs ORDER BY")
+    return keys
+
+
+def seek_predicate(keys, row_values=True):
+    """
+    condition of the rows after the last row, the values of the last row are Prepared(SEEK_KEY.format(i)).
+
+    (a, b) > (%s, %s)  -- same direction, if row_values is true
+    ((a > %s) OR ((a = %s) AND (b < %s)))  -- mixed directions (e.g. ORDER BY a, b DESC)
+    """
+    values = [Prepared(SEEK_KEY.format(i)) for i in range(len(keys))]
+    directions = set(desc for _, desc in keys)
+    if row_values and len(keys) > 1 and len(directions) == 1:
+        op = Lt if directions.pop() else Gt
+        return op(Row([e for e, _ in keys]), Row(values))
+
+    conditions = []
+    for i, (e, desc) in enumerate(keys):
+        condition = (Lt if desc else Gt)(e, values[i])
+        if i > 0:
+            condition = And(*[Eq(keys[j][0], values[j]) for j in range(i)] + [condition])
+        conditions.append(condition)
+    return conditions[0] if len(conditions) == 1 else Or(*conditions)
+
+
+def _unalias(e):
+    while isinstance(e, AliasProperty):
+        e = e.prop
+    return e
+
+
+def _is_same_column(x, y):
+    x, y = _unalias(x), _unalias(y)
+    return x is y or (isinstance(x, ConcreteProperty) and isinstance(y, ConcreteProperty)
+                      and x.record is y.record and x.name == y.name)
+
+
+def _unaliased_order_by(query):
+    # an aliased column is rendered as `x as name`, which is not valid in ORDER BY
+    args = []
+    for e in query._order_by.args:
+        if isinstance(e, PostOp):
+            args.append(PostOp(e.op, _unalias(e.value)))
+        else:
+            args.append(_unalias(e))
+    return query.order_by(*args, replace=True)
+
+
+def key_positions(query, keys):
+    """positions of the ORDER BY columns in the row"""
+    columns = list(query._select.args) if not query._select.is_empty() else query.props()
+    positions = []
+    for e, _ in keys:
+        for i, column in enumerate(columns):
+            if _is_same_column(column, e):
+                positions.append(i)
+                break
+        else:
+            raise InvalidCombination("ORDER BY: {!r} is not selected, it is needed for keyset pagination".format(e))
+    return positions
+
+
+def _limit_of(query):
+    args = query._limit.args
+    if not args:
+        return None
+    if len(args) == 1 and args[0].__class__ is Value and isinstance(args[0].value, int):
+        return args[0].value
+    raise InvalidCombination("LIMIT {!r} can't be used with keyset pagination, only a number of rows".format(args))
+
+
+def iter_pages(executor, query, page_size, hydrate=False, row_values=True, **context):
+    """
+    yield pages (lists of rows) of query, by keyset (seek) pagination.
+    a page is fetched by `WHERE <seek predicate> ORDER BY ... LIMIT page_size`, so the cost of a page
+    doesn't depend on its depth (unlike OFFSET). the LIMIT of query (a number) is the total number of rows.
+
+    the ORDER BY columns must be selected (as is, or aliased), not NULL, and unique as a whole
+    (e.g. end with a primary key).
+    """
+    keys = seek_keys(query)
+    positions = key_positions(query, keys)
+    remaining = _limit_of(query)
+    convert = make_hydrator(query) if hydrate else None
+    query = _unaliased_order_by(query)
+    # statements are compiled once, only the values of the last row are bound for each page.
+    # (the last page is compiled again, if it is shortened by LIMIT)
+    renderer = executor.renderer
+    size = page_size if remaining is None else min(page_size, remaining)
+    statement = renderer.compile(query.limit(size, replace=True))
+    seek_query = query.where(seek_predicate(keys, row_values=row_values))
+    seek = seek_size = None
+    while size > 0:
+        cursor = executor.connection.cursor()
+        try:
+            cursor.execute(statement.sql, statement.bind(values if seek is not None else context))
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        if not rows:
+            break
+        last = rows[-1]
+        yield list(map(convert, rows)) if convert is not None else rows
+        if len(rows) < size:
+            break
+        if remaining is not None:
+            remaining -= len(rows)
+            size = min(page_size, remaining)
+            if size <= 0:
+                break
+        if seek_size != size:
+            seek, seek_size = renderer.compile(seek_query.limit(size, replace=True)), size
+        values = dict(context)
+        values.update((SEEK_KEY.format(i), last[p]) for i, p in enumerate(positions))
+        statement = seek
+
+
+def paginate(query, page_size, connection, renderer=None, hydrate=False, row_values=True, **context):
+    """
+    yield pages of query on a DB-API connection, by keyset pagination (see iter_pages)
+
+    >>> query = Query().from_(User).select(User.id, User.name).order_by(User.id)
+    >>> for rows in paginate(query, 1000, sqlite3.connect("app.db")):
+    ...     export(rows)
+    """
+    from .executor import Executor
+    executor = Executor(connection, renderer=renderer)
+    return iter_pages(executor, query, page_size, hydrate=hydrate, row_values=row_values, **context)
@@ -0,0 +1,192 @@
+# -*- coding:utf-8 -*-
+import threading
+import queue
+from collections import namedtuple
+from contextlib import contextmanager
+from .cache import LRUCache
+from .exceptions import PoolTimeout
+
+
+PoolStats = namedtuple("PoolStats", "size, created, idle, hits, misses, evictions, hit_rate")
+
+
+def _identity(connection, sql):
+    return sql
+
+
+class PooledConnection(object):
+    """
+    DB-API connection with an LRU of prepared statements (keyed by sql).
+
+    prepare(connection, sql) returns the sql to be executed instead, and deallocate(connection, sql, prepared)
+    is called when the statement is evicted (e.g. PREPARE/DEALLOCATE on PostgreSQL).
+
+    without prepare, the LRU is bookkeeping only: the statement is cached by the driver itself
+    (e.g. sqlite3's cached_statements), and its hit rate is that of the driver only if both have the same size.
+    (e.g. sqlite3.connect(..., cached_statements=<statement_cache_size>))
+    """
+    def __init__(self, connection, statement_cache_size=128, prepare=None, deallocate=None):
+        self.connection = connection
+        self.prepare = prepare or _identity
+        self.deallocate = deallocate
+        self.statements = LRUCache(statement_cache_size, on_evict=self._on_evict)
+
+    def _on_evict(self, sql, prepared):
+        if self.deallocate is not None:
+            self.deallocate(self.connection, sql, prepared)
+
+    def prepared(self, sql):
+        prepared = self.statements.get(sql)
+        if prepared is None:
+            prepared = self.statements[sql] = self.prepare(self.connection, sql)
+        return prepared
+
+    def cursor(self):
+        return PooledCursor(self, self.connection.cursor())
+
+    def execute(self, sql, args=()):
+        """execute on an explicit cursor, returns the cursor"""
+        cursor = self.cursor()
+        cursor.execute(sql, args)
+        return cursor
+
+    def commit(self):
+        return self.connection.commit()
+
+    def rollback(self):
+        return self.connection.rollback()
+
+    def close(self):
+        self.statements.clear()
+        return self.connection.close()
+
+
+class PooledCursor(object):
+    """cursor executing prepared statements of its connection"""
+    def __init__(self, owner, cursor):
+        self.owner = owner
+        self.cursor = cursor
+
+    def execute(self, sql, args=()):
+        self.cursor.execute(self.owner.prepared(sql), args)
+        return self
+
+    def __iter__(self):
+        return iter(self.cursor)
+
+    def __getattr__(self, k):
+        return getattr(self.cursor, k)
+
+
+class ConnectionPool(object):
+    """
+    hands out at most `size` connections (created lazily by connect()). the most recently released
+    connection is reused first, to keep its statement cache warm. connections are rolled back on release.
+    (the statement cache of the driver should be sized by statement_cache_size, see PooledConnection)
+
+    >>> pool = ConnectionPool(lambda: sqlite3.connect("app.db", cached_statements=300), statement_cache_size=300)
+    >>> with pool.connection() as conn:
+    ...     rows = Executor(conn).iter_rows(query)
+    >>> pool.stats().hit_rate
+    """
+    def __init__(self, connect, size=4, statement_cache_size=128, prepare=None, deallocate=None, timeout=None):
+        self.connect = connect
+        self.size = size
+        self.statement_cache_size = statement_cache_size
+        self.prepare = prepare
+        self.deallocate = deallocate
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._connections = []
+        self._checked_out = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def acquire(self, timeout=None):
+        conn = self._acquire(timeout)
+        with self._lock:
+            self._checked_out.add(conn)
+        return conn
+
+    def _acquire(self, timeout):
+        if self._closed:
+            raise RuntimeError("pool is closed")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_create = len(self._connections) < self.size
+            if can_create:
+                self._connections.append(None)  # reserved
+        if can_create:
+            return self._create()
+        try:
+            return self._idle.get(timeout=timeout if timeout is not None else self.timeout)
+        except queue.Empty:
+            raise PoolTimeout("all {} connections are in use".format(self.size))
+
+    def _create(self):
+        try:
+            conn = PooledConnection(self.connect(), statement_cache_size=self.statement_cache_size,
+                                    prepare=self.prepare, deallocate=self.deallocate)
+        except BaseException:
+            with self._lock:
+                self._connections.remove(None)
+            raise
+        with self._lock:
+            self._connections[self._connections.index(None)] = conn
+        return conn
+
+    def release(self, conn):
+        with self._lock:
+            if conn not in self._checked_out:  # e.g. released twice, two borrowers would share it
+                raise RuntimeError("connection is not acquired from this pool")
+            self._checked_out.remove(conn)
+        if self._closed:
+            conn.close()
+            return
+        try:
+            conn.rollback()
+        except BaseException:
+            # e.g. the connection is dropped, it is discarded and its slot is freed for a new connection
+            with self._lock:
+                self._connections.remove(conn)
+            try:
+                conn.close()
+            except Exception:
+                pass
+            raise
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = self.acquire(timeout=timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """close idle connections (connections in use are closed when they are released)"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def stats(self):
+        """statistics of the pool, the statement caches (LRUs of PooledConnection) are summed up over connections"""
+        with self._lock:
+            connections = [c for c in self._connections if c is not None]
+        infos = [c.statements.info() for c in connections]
+        hits = sum(info.hits for info in infos)
+        misses = sum(info.misses for info in infos)
+        return PoolStats(size=self.size,
+                         created=len(connections),
+                         idle=self._idle.qsize(),
+                         hits=hits,
+                         misses=misses,
+                         evictions=sum(info.evictions for info in infos),
+                         hit_rate=hits / (hits + misses) if hits + misses else 0.0)
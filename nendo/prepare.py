@@ -0,0 +1,81 @@
+# -*- coding:utf-8 -*-
+import hashlib
+from .renderer import Renderer
+from .cache import LRUCache
+
+
+def statement_name(sql, prefix="nendo_", length=16):
+    """name of server-side prepared statement, derived from the compiled sql"""
+    return prefix + hashlib.sha1(sql.encode("utf-8")).hexdigest()[:length]
+
+
+class PreparedSession(object):
+    """
+    server-side prepared statements (PREPARE/EXECUTE) of a session (a connection).
+    the first call of a query shape returns PREPARE and EXECUTE, later calls return only EXECUTE.
+
+    >>> session = PreparedSession()
+    >>> session(query, id=1)
+    [('PREPARE nendo_2f1e... AS SELECT name FROM T WHERE (id = $1)', []), ('EXECUTE nendo_2f1e...(%s)', [1])]
+    >>> session(query, id=2)
+    [('EXECUTE nendo_2f1e...(%s)', [2])]
+
+    if max_statements is passed, the least recently used statement is deallocated (DEALLOCATE) when
+    the number of prepared statements exceeds it.
+    """
+    def __init__(self, interpolation="%s", numbered_interpolation="${}", max_statements=None, cache_size=1024, **kwargs):
+        self.interpolation = interpolation
+        self.renderer = Renderer(interpolation=numbered_interpolation, cache_size=cache_size, **kwargs)
+        self.max_statements = max_statements
+        self._deallocated = []
+        self.prepared = LRUCache(max_statements or float("inf"), on_evict=self._on_evict)
+
+    def _on_evict(self, name, _):
+        self._deallocated.append(name)
+
+    def __call__(self, query, **context):
+        """returns a list of (sql, args)"""
+        _, statements = self._statements(query, context)
+        self._deallocated = []  # these are executed by the caller
+        return [(sql, args) for _, sql, args in statements]
+
+    def _statements(self, query, context):
+        # returns name and a list of (evicted name or None, sql, args).
+        # the pending DEALLOCATEs are kept in _deallocated until they are executed (or failed).
+        statement = self.renderer.compile(query)
+        args = statement.bind(context)
+        name = statement_name(statement.sql)
+        r = []
+        if self.prepared.get(name) is None:
+            self.prepared[name] = True
+            r.extend((evicted, "DEALLOCATE {}".format(evicted), []) for evicted in self._deallocated)
+            r.append((None, "PREPARE {} AS {}".format(name, statement.sql), []))
+        if args:
+            r.append((None, "EXECUTE {}({})".format(name, ", ".join([self.interpolation] * len(args))), args))
+        else:
+            r.append((None, "EXECUTE {}".format(name), args))
+        return name, r
+
+    def execute(self, cursor, query, **context):
+        """execute the query on cursor, returns the cursor"""
+        name, statements = self._statements(query, context)
+        prepared = len(statements) == 1  # only EXECUTE, prepared by the previous call
+        for evicted, sql, args in statements:
+            try:
+                cursor.execute(sql, args)
+            except Exception:
+                if evicted is not None:  # e.g. dropped by the server already, it isn't retried
+                    self._deallocated.remove(evicted)
+                if not prepared:  # PREPARE is failed (or not executed), the server doesn't have the statement
+                    self.prepared.pop(name)
+                raise
+            if evicted is not None:
+                self._deallocated.remove(evicted)
+            elif not prepared:
+                prepared = True  # PREPARE is succeeded, a failure of EXECUTE doesn't deallocate it
+        return cursor
+
+    def reset(self):
+        """forget prepared statements (e.g. after reconnection or DISCARD ALL)"""
+        self.prepared.clear()
+        self._deallocated = []
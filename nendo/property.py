@@ -5,10 +5,10 @@ from .expr import lift, Expr, liftN
 class NamedProperty(object):
     __slots__ = ("name", "_concrete", "_key")
 
-    def __init__(self, name):
-        self.name = name
+    def __init__(self, name, key=None):
+        self.name = name  # the name in sql
         self._concrete = None
-        self._key = "_{}".format(name)
+        self._key = key or "_c_{}".format(name)  # the slot of the value on a record instance
 
     def __get__(self, ob, type_=None):
         if ob is None:
@@ -140,6 +140,11 @@ class ConcreteProperty(Property):
         instance.is_correlated = True
         return instance
 
+    @property
+    def attr(self):
+        """the attribute name on the record (not same as name, if the column is not an identifier)"""
+        return self._key[3:] if self._key.startswith("_c_") else self.name
+
     @property
     def original_name(self):
         return self.name
@@ -1,7 +1,6 @@
 # -*- coding:utf-8 -*-
-from itertools import chain
 from .langhelpers import reify, COUNTER
-from .clause import Select, Where, From, OrderBy, Having, Limit, GroupBy
+from .clause import Select, Where, From, OrderBy, Having, Limit, GroupBy, _MEMOIZED
 from .env import Env
 from .exceptions import ConflictName, MissingName, InvalidCombination
 from .property import ConcreteProperty
@@ -51,6 +50,8 @@ class _QueryProperty(ConcreteProperty):
 
 
 class Query(object):
+    _validated = False  # query is immutable, so validation is needed only once
+
     def __init__(self, select=None, where=None, from_=None, having=None, group_by=None, order_by=None, limit=None, env=None):
         self.env = env or Env()
         self._select = select or Select()
@@ -68,65 +69,74 @@ class Query(object):
         return self.__class__(from_=_UnionAllFrom(self, other))
 
     def make(self, select=None, where=None, from_=None, having=None, group_by=None, order_by=None, limit=None, env=None):
+        # clauses are immutable, so untouched clauses are shared with the derived query
         return self.__class__(
-            select=select or self._select.make(),
-            where=where or self._where.make(),
-            from_=from_ or self._from.make(),
-            group_by=group_by or self._group_by.make(),
-            order_by=order_by or self._order_by.make(),
-            having=having or self._having.make(),
-            limit=limit or self._limit.make(),
-            env=env or self.env.make()
+            select=select or self._select,
+            where=where or self._where,
+            from_=from_ or self._from,
+            group_by=group_by or self._group_by,
+            order_by=order_by or self._order_by,
+            having=having or self._having,
+            limit=limit or self._limit,
+            env=env or self.env
         )
 
     def swap(self, name):
-        return self.make(
-            select=self._select.swap(self, name),
-            from_=self._from.swap(self, name)
-        )
+        # query is immutable, so the swapped query is reused for the same name
+        swapped = self._swapped.get(name)
+        if swapped is None:
+            swapped = self._swapped[name] = self.make(
+                select=self._select.swap(self, name),
+                from_=self._from.swap(self, name)
+            )
+        return swapped
+
+    @reify
+    def _swapped(self):
+        return {}
 
     def select(self, *args, replace=False, distinct=False):
         suffix = "DISTINCT" if distinct else ""
         if replace:
             return self.make(select=Select(*args, suffix=suffix))
         else:
-            return self.make(select=Select(*chain(self._select.args, args), suffix=suffix))
+            return self.make(select=self._select.extend(*args, suffix=suffix))
 
     def where(self, *args, replace=False):
         if replace:
             return self.make(where=Where(*args))
         else:
-            return self.make(where=Where(*chain(self._where.args, args)))
+            return self.make(where=self._where.extend(*args))
 
     def from_(self, *args, replace=False):
         if replace:
             return self.make(from_=From(*args))
         else:
-            return self.make(from_=From(*chain(self._from.args, args)))
+            return self.make(from_=self._from.extend(*args))
 
     def order_by(self, *args, replace=False):
         if replace:
             return self.make(order_by=OrderBy(*args))
         else:
-            return self.make(order_by=OrderBy(*chain(self._order_by.args, args)))
+            return self.make(order_by=self._order_by.extend(*args))
 
     def group_by(self, *args, replace=False):
         if replace:
             return self.make(group_by=GroupBy(*args))
         else:
-            return self.make(group_by=GroupBy(*chain(self._group_by.args, args)))
+            return self.make(group_by=self._group_by.extend(*args))
 
     def having(self, *args, replace=False):
         if replace:
             return self.make(having=Having(*args))
         else:
-            return self.make(having=Having(*chain(self._having.args, args)))
+            return self.make(having=self._having.extend(*args))
 
     def limit(self, *args, replace=False):
         if replace:
             return self.make(limit=Limit(*args))
         else:
-            return self.make(limit=Limit(*chain(self._limit.args, args)))
+            return self.make(limit=self._limit.extend(*args))
 
     def _table_validation(self, context, tables):
         # from validation
@@ -165,23 +175,45 @@ class Query(object):
                     raise ConflictName("FROM: {} is not found from FROM clause in {}".format(p.original_name, prop_name_set))
 
     def validate(self, context):
+        if self._validated:
+            return
         tables = self.tables()
         self._table_validation(context, tables)
         self._column_validation(context, tables)
+        self._validated = True
 
-    def props(self):
+    @reify
+    def _props(self):
         return list(self._select.props()) or list(self._from.props())
 
-    def tables(self):
+    @reify
+    def _tables(self):
         return list(self._from.tables())
 
+    @reify
+    def _prop_index(self):
+        # name -> prop (the first one is used, if the name is conflicted)
+        index = {}
+        for prop in self._props:
+            index.setdefault(prop.name, prop)
+        return index
+
+    def props(self):
+        return list(self._props)
+
+    def tables(self):
+        return list(self._tables)
+
     def __getattr__(self, k):
-        for prop in self.props():
-            if prop.name == k:
-                prop = _QueryProperty(self, prop, prop.name)
-                setattr(self, k, prop)
-                return prop
-        raise AttributeError(k)
+        if k in _MEMOIZED:  # failed while computing the index, don't retry via __getattr__
+            raise AttributeError(k)
+        try:
+            prop = self._prop_index[k]
+        except KeyError:
+            raise AttributeError(k)
+        prop = _QueryProperty(self, prop, prop.name)
+        setattr(self, k, prop)
+        return prop
 
     @reify
     def _name(self):
@@ -1,4 +1,5 @@
 # -*- coding:utf-8 -*-
+import os
 from .langhelpers import as_python_code
 from . import expr
 
@@ -7,10 +8,12 @@ class RecordMeta(type):
     pass
 
 
-RecordBase = RecordMeta("RecordBase", (), {})
+RecordBase = RecordMeta("RecordBase", (), {"__slots__": ()})
 
 
 class Record(RecordBase):
+    __slots__ = ()  # generated records are slotted, a row doesn't have __dict__
+
     @classmethod
     def get_name(cls):
         return getattr(cls, "_name", None) or cls.__name__
@@ -27,6 +30,12 @@ class Record(RecordBase):
     def tables(cls):
         yield cls
 
+    _primary_key_list = ()
+
+    @classmethod
+    def primary_keys(cls):
+        return [getattr(cls, p) for p in cls._primary_key_list]
+
     @classmethod
     def join(cls, other, *args):
         return expr.Join(cls, other, args)
@@ -45,29 +54,170 @@ class Record(RecordBase):
 
 
 @as_python_code
-def make_record(m, clsname, template, name=None):
+def make_record(m, clsname, template, name=None, primary_keys=None):
     """
     >>> make_record("Foo",  "x, y, z")
+    >>> make_record("Foo",  "x, y, z", primary_keys=["x"])
     """
     from nendo.record import Record
     from nendo.property import NamedProperty
     m.env["Record"] = Record
     m.env["NamedProperty"] = NamedProperty
+    _emit_record(m, clsname, _parse_template(template), name=name, primary_keys=primary_keys)
+
+
+# bump this, if the generated code is changed (the on-disk cache of make_records() is invalidated)
+_CODEGEN_VERSION = 4
+
 
-    attrs = [x.strip() for x in template.replace(",", "").split(" ") if x != ""]
+def _parse_template(template):
+    if not isinstance(template, str):
+        return [x.strip() for x in template]
+    return [x.strip() for x in template.replace(",", "").split(" ") if x != ""]
+
+
+def _emit_record(m, clsname, attrs, name=None, primary_keys=None):
+    # an attribute is a name, or (name, column), if the column in sql is not an identifier (e.g. '"my col"')
+    columns = [(attr, attr) if isinstance(attr, str) else tuple(attr) for attr in attrs]
+    attrs = [attr for attr, _ in columns]
     with m.class_(clsname, "Record"):
+        m.stmt("__slots__ = {!r}".format(tuple("_c_{}".format(attr) for attr in attrs)))
         if attrs:
             with m.method("__init__", ", ".join(attrs)):
                 for attr in attrs:
-                    fmt = "self._{attr} = {attr}"
+                    fmt = "self._c_{attr} = {attr}"
                     m.stmt(fmt.format(attr=attr))
-        for attr in attrs:
-            m.stmt("{attr} = NamedProperty({attr!r})".format(attr=attr))
+        for attr, column in columns:
+            if attr == column:
+                m.stmt("{attr} = NamedProperty({attr!r})".format(attr=attr))
+            else:
+                m.stmt("{attr} = NamedProperty({column!r}, key={key!r})".format(attr=attr, column=column, key="_c_" + attr))
 
         if name is not None:
             m.stmt("_name = {!r}".format(name))
 
+        if primary_keys:
+            m.stmt("_primary_key_list = {!r}".format(list(primary_keys)))
+
         m.stmt("_property_name_list = {!r}".format(attrs))
         m.stmt("@classmethod")
         with m.method("props"):
             m.return_("[getattr(self, p) for p in self._property_name_list]")
+
+
+def make_records(schema, cache_dir=None):
+    """
+    generate record classes of a whole schema in one module. schema is a mapping
+    (class name -> template, (template, table name) or (template, table name, primary keys)),
+    or plain text (a "<class name>: <template>" per line).
+
+    if cache_dir is passed, the generated source and bytecode are cached, keyed by the hash of the schema.
+
+    >>> records = make_records({"User": "id name", "Group": ("id name", "groups")})
+    >>> records = make_records('''
+    ... User: id name
+    ... Group: id name
+    ... ''', cache_dir=".nendo")
+    >>> records.User
+    """
+    return _make_records(_parse_schema(schema), cache_dir=cache_dir)
+
+
+def _make_records(definitions, cache_dir=None):
+    """definitions: a list of (class name, attribute names, table name, primary keys)"""
+    from nendo.langhelpers import Registry
+    key = _schema_key(definitions)
+    code = None
+    if cache_dir is not None:
+        code = _load_code(cache_dir, key)
+    if code is None:
+        source = _generate_module(definitions)
+        filename = _cache_path(cache_dir, key, ".py") if cache_dir is not None else "<nendo.records {}>".format(key)
+        code = compile(source, filename, "exec")
+        if cache_dir is not None:
+            _store_code(cache_dir, key, source, code)
+
+    env = {}
+    exec(code, env)
+    registry = Registry()
+    for clsname, _, _, _ in definitions:
+        registry(env[clsname])
+    return registry
+
+
+def _parse_schema(schema):
+    if isinstance(schema, str):
+        items = []
+        for line in schema.splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            clsname, sep, template = line.partition(":")
+            if not sep:
+                raise ValueError("invalid schema line: {!r}".format(line))
+            items.append((clsname.strip(), template))
+    else:
+        items = schema.items()
+
+    definitions = []
+    for clsname, template in items:
+        name = primary_keys = None
+        if isinstance(template, tuple):
+            template, name, *rest = template
+            if rest:
+                primary_keys = list(rest[0])
+        definitions.append((clsname, _parse_template(template), name, primary_keys))
+    return definitions
+
+
+def _schema_key(definitions):
+    import hashlib
+    import importlib.util
+    h = hashlib.sha1()
+    h.update(importlib.util.MAGIC_NUMBER)  # bytecode is not compatible between python versions
+    h.update(repr((_CODEGEN_VERSION, definitions)).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _generate_module(definitions):
+    from prestring.python import PythonModule
+    m = PythonModule()
+    m.from_("nendo.record", "Record")
+    m.from_("nendo.property", "NamedProperty")
+    m.sep()
+    for clsname, attrs, name, primary_keys in definitions:
+        _emit_record(m, clsname, attrs, name=name, primary_keys=primary_keys)
+    return str(m)
+
+
+def _cache_path(cache_dir, key, ext):
+    return os.path.join(cache_dir, "nendo_records_{}{}".format(key, ext))
+
+
+def _load_code(cache_dir, key):
+    import logging
+    import marshal
+    try:
+        with open(_cache_path(cache_dir, key, ".marshal"), "rb") as rf:
+            return marshal.load(rf)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, TypeError) as e:  # broken cache, regenerated
+        logging.getLogger(__name__).warning("failed to load cached records (%s): %r", key, e)
+        return None
+
+
+def _store_code(cache_dir, key, source, code):
+    import logging
+    import marshal
+    import tempfile
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        for ext, data in ((".py", source.encode("utf-8")), (".marshal", marshal.dumps(code))):
+            # written atomically, other processes may read the cache at the same time
+            fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=".nendo_records_")
+            with os.fdopen(fd, "wb") as wf:
+                wf.write(data)
+            os.replace(tmp, _cache_path(cache_dir, key, ext))
+    except OSError as e:
+        logging.getLogger(__name__).warning("failed to store cached records (%s): %r", key, e)
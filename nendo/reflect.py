@@ -0,0 +1,136 @@
+# -*- coding:utf-8 -*-
+import os
+import re
+import keyword
+from .record import Record, _make_records
+
+# names of the generated class body and Record's methods, a column of these names is renamed
+_RESERVED = frozenset(["props", "_name", "_property_name_list"] + [k for k in dir(Record) if not k.startswith("__")])
+
+
+def reflect(connection, cache_dir=None):
+    """
+    generate records of all tables and views of a sqlite3 connection (in one module, see make_records()).
+
+    if cache_dir is passed, the reflected schema is cached, keyed on `PRAGMA schema_version`
+    (and the generated code is cached, too). so the introspection is skipped until the schema is changed.
+
+    >>> records = reflect(sqlite3.connect("app.db"), cache_dir=".nendo")
+    >>> Query().from_(records.users).select(records.users.id)
+    """
+    path = _database_path(connection) if cache_dir is not None else None
+    definitions = None
+    if path:
+        version = _schema_version(connection)
+        definitions = _load_schema(cache_dir, path, version)
+    if definitions is None:
+        definitions = introspect(connection)
+        if path:
+            _store_schema(cache_dir, path, version, definitions)
+    return _make_records(definitions, cache_dir=cache_dir)
+
+
+def introspect(connection):
+    """
+    returns a list of (class name, attributes, table name, primary keys), ordered by table name.
+    a table or column whose name is not a python identifier (e.g. "group members", "from") is renamed
+    (e.g. group_members, from_), and its name is quoted in sql. an attribute of renamed column is
+    (attribute name, quoted column name), see nendo.record.make_records().
+    """
+    rows = connection.execute(
+        "SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name NOT LIKE 'sqlite_%' ORDER BY name"
+    ).fetchall()
+    names = [name for (name, ) in rows]
+    definitions = []
+    for name, clsname in zip(names, _identifiers(names)):
+        # (cid, name, type, notnull, dflt_value, pk), pk is the position in the primary key (or 0)
+        columns = sorted(connection.execute("PRAGMA table_info({})".format(_quote(name))).fetchall())
+        column_names = [c[1] for c in columns]
+        attrs = _identifiers(column_names, reserved=_RESERVED)
+        attr_of = dict(zip(column_names, attrs))
+        primary_keys = [attr_of[c[1]] for c in sorted((c for c in columns if c[5]), key=lambda c: c[5])]
+        definitions.append((
+            clsname,
+            [attr if attr == column else (attr, _quote(column)) for attr, column in zip(attrs, column_names)],
+            _quote(name) if clsname != name else None,
+            primary_keys or None
+        ))
+    return definitions
+
+
+def _quote(name):
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def _identifiers(names, reserved=frozenset()):
+    """
+    python identifiers for names. a name which is a valid identifier is kept as is,
+    others are renamed, and suffixed with "_" until it is not conflicted (e.g. "group members" -> group_members_,
+    if group_members exists)
+    """
+    taken = set(reserved)
+    taken.update(name for name in names if _is_valid(name) and name not in reserved)
+    r = []
+    for name in names:
+        if _is_valid(name) and name not in reserved:
+            r.append(name)
+            continue
+        identifier = re.sub(r"\W", "_", name)
+        if not identifier.isidentifier():
+            identifier = "_" + identifier
+        if keyword.iskeyword(identifier):
+            identifier += "_"
+        while identifier in taken:
+            identifier += "_"
+        taken.add(identifier)
+        r.append(identifier)
+    return r
+
+
+def _is_valid(name):
+    return name.isidentifier() and not keyword.iskeyword(name)
+
+
+def _schema_version(connection):
+    return connection.execute("PRAGMA schema_version").fetchone()[0]
+
+
+def _database_path(connection):
+    # (seq, name, file). file is empty, if the database is in-memory (not cached)
+    for _, name, path in connection.execute("PRAGMA database_list").fetchall():
+        if name == "main":
+            return os.path.abspath(path) if path else None
+    return None
+
+
+def _schema_path(cache_dir, path):
+    import hashlib
+    return os.path.join(cache_dir, "nendo_schema_{}.json".format(hashlib.sha1(path.encode("utf-8")).hexdigest()))
+
+
+def _load_schema(cache_dir, path, version):
+    import json
+    try:
+        with open(_schema_path(cache_dir, path), encoding="utf-8") as rf:
+            data = json.load(rf)
+    except (OSError, ValueError):
+        return None
+    if data.get("path") != path or data.get("schema_version") != version:
+        return None
+    # json has no tuple, (attribute name, column) is restored
+    return [(clsname, [a if isinstance(a, str) else tuple(a) for a in attrs], name, primary_keys)
+            for clsname, attrs, name, primary_keys in data["definitions"]]
+
+
+def _store_schema(cache_dir, path, version, definitions):
+    import json
+    import logging
+    import tempfile
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=".nendo_schema_")
+        with os.fdopen(fd, "w", encoding="utf-8") as wf:
+            json.dump({"path": path, "schema_version": version, "definitions": definitions}, wf)
+        os.replace(tmp, _schema_path(cache_dir, path))
+    except OSError as e:
+        logging.getLogger(__name__).warning("failed to store reflected schema (%s): %r", path, e)
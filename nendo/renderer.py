@@ -0,0 +1,126 @@
+# -*- coding:utf-8 -*-
+from .compiler import compiler, iter_chunks, ARGS, ARG_KEYS
+from .options import Options, PARAMSTYLES, is_named
+from .cache import LRUCache, fingerprint, bound_lists, in_list_key
+from .statement import compile_statement
+from .insert import iter_insert
+
+
+class Renderer(object):
+    """
+    if cache_size is passed, compiled sql is cached by the shape of query (see nendo.cache.fingerprint).
+    on cache hit, only arguments are collected from context.
+
+    chunk_size is the size of chunks yielded by iter_render().
+
+    if in_list (nendo.options.InList) is passed, literal lists of IN/NOT IN are bound as parameters.
+
+    if use_validation is "once", a query is validated only on the first rendering of its shape.
+
+    paramstyle (e.g. "qmark", "dollar", "named", see nendo.options.PARAMSTYLES) is a shortcut of interpolation.
+    with numbered and named paramstyles, a repeated Prepared key is bound once (and args are a dict, if named).
+    """
+    def __init__(self, use_validation=True, one_line_sql=True, interpolation="%s", cache_size=None, chunk_size=8192,
+                 in_list=None, validation_cache_size=1024, paramstyle=None):
+        self.use_validation = use_validation
+        self.one_line_sql = one_line_sql
+        self.interpolation = PARAMSTYLES[paramstyle] if paramstyle is not None else interpolation
+        self.in_list = in_list
+        self.cache = LRUCache(cache_size) if cache_size else None
+        self.validated = LRUCache(validation_cache_size) if use_validation == "once" else None
+        self.chunk_size = chunk_size
+
+    def get_options(self, query):
+        use_validation = self.use_validation
+        if self.validated is not None:
+            use_validation = fingerprint(query) not in self.validated
+        return Options(use_validation=use_validation,
+                       one_table=len(query.tables()) <= 1,
+                       interpolation=self.interpolation,
+                       one_line_sql=self.one_line_sql,
+                       in_list=self.in_list)
+
+    def cache_info(self):
+        return self.cache.info() if self.cache is not None else None
+
+    def _mark_as_validated(self, query, options):
+        if self.validated is not None and options.use_validation:
+            self.validated[fingerprint(query)] = True
+
+    def compile(self, query):
+        """compile query to reusable CompiledStatement (context is not needed)"""
+        options = self.get_options(query)
+        if self.cache is None:
+            statement = compile_statement(query, options=options)
+            self._mark_as_validated(query, options)
+            return statement
+        # validation doesn't change the sql
+        key = (options._replace(use_validation=None), fingerprint(query), in_list_key(query, self.in_list))
+        statement = self.cache.get(key)
+        if statement is None:
+            statement = self.cache[key] = compile_statement(query, options=options)
+            self._mark_as_validated(query, options)
+        elif statement.lists:
+            # same shape, but the values of IN lists are of this query
+            statement = statement.for_lists(bound_lists(query, self.in_list))
+        return statement
+
+    def __call__(self, query, **context):
+        if self.cache is None:
+            options = self.get_options(query)
+            result = _render(query, options, context)
+            self._mark_as_validated(query, options)
+            return result
+        statement = self.compile(query)
+        return (statement.sql, statement.bind(context))
+
+    def render_many(self, query, contexts):
+        """
+        compile once and bind many contexts, returns (sql, args_iterator) (e.g. for cursor.executemany()).
+        contexts can be a generator, arguments are streamed as tuples.
+        """
+        statement = self.compile(query)
+        return (statement.sql, statement.bind_many(contexts))
+
+    def insert_many(self, insert, rows, max_params=999):
+        """yield (sql, args) of multi-row INSERT for each chunk of rows (see nendo.insert.iter_insert)"""
+        return iter_insert(insert, rows, max_params=max_params, interpolation=self.interpolation)
+
+    def iter_render(self, query, **context):
+        """
+        streaming version of __call__, returns (chunks, args).
+        args is filled while chunks are consumed.
+        """
+        args = context[ARGS] = {} if is_named(self.interpolation) else []
+        context[ARG_KEYS] = []
+        if self.cache is not None:
+            statement = self.compile(query)
+            if statement.named:
+                args.update(statement.bind(context))
+            else:
+                args.extend(statement.bind(context))
+            return (iter([statement.sql]), args)
+        options = self.get_options(query)
+        chunks = iter_chunks(query, context, options=options, chunk_size=self.chunk_size)
+        return (self._validated_chunks(query, options, chunks), args)
+
+    def _validated_chunks(self, query, options, chunks):
+        # the query is valid, only if all chunks are rendered
+        yield from chunks
+        self._mark_as_validated(query, options)
+
+    def write(self, query, writer, **context):
+        """write sql to writer (file-like object or list), and return args"""
+        write = writer.write if hasattr(writer, "write") else writer.append
+        chunks, args = self.iter_render(query, **context)
+        for chunk in chunks:
+            write(chunk)
+        return args
+
+
+def _render(query, options, context):
+    sql = compiler(query, context, options=options)
+    return (sql, context[ARGS])
+
+
+render = Renderer()
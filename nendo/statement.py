@@ -0,0 +1,96 @@
+# -*- coding:utf-8 -*-
+from copy import copy
+from .langhelpers import as_python_code, reify
+from .compiler import compiler, ARGS, ARG_KEYS, IN_LIST_INDEX
+from .value import Bound, ListItem
+from .options import is_named, param_name
+from .query import Query
+
+
+class CompiledStatement(object):
+    """
+    compiled sql and the context keys of its parameters.
+    (a literal bound as a parameter (value.Bound) is kept as is, instead of a key)
+    if named is true, arguments are bound as a dict (named paramstyle, see nendo.options.PARAMSTYLES)
+
+    the values of literal IN lists bound as parameters (value.ListItem) are taken from lists,
+    the padded values of the lists of the compiled query (see for_lists() and nendo.cache.bound_lists()).
+
+    >>> statement = compile_statement(query)
+    >>> statement.bind({"upper_bound": 10})
+    [10]
+    """
+    def __init__(self, sql, keys, named=False, lists=()):
+        self.sql = sql
+        self.keys = tuple(keys)
+        self.named = named
+        self.lists = lists
+        self.extract = make_extractor("extract", self.keys, as_dict=named)
+
+    def for_lists(self, lists):
+        """same statement binding the values of lists (the literal IN lists of another query of the same shape)"""
+        statement = copy(self)
+        statement.lists = lists
+        return statement
+
+    @reify
+    def extract_tuple(self):
+        if self.named:
+            return self.extract
+        return make_extractor("extract_tuple", self.keys, as_tuple=True)
+
+    def bind(self, context):
+        return self.extract(context, self.lists)
+
+    def bind_many(self, contexts):
+        """lazily bind each context (e.g. for executemany()), contexts can be a generator"""
+        lists = self.lists
+        extract = self.extract_tuple
+        return (extract(context, lists) for context in contexts)
+
+    def __call__(self, **context):
+        return (self.sql, self.extract(context, self.lists))
+
+    def __repr__(self):
+        return "<CompiledStatement: {!r} {!r}>".format(self.sql, self.keys)
+
+
+def compile_statement(query, options=None):
+    context = {ARGS: None, ARG_KEYS: []}  # collecting keys only, values are not needed
+    lists = ()
+    if options is not None and options.in_list is not None and isinstance(query, Query):
+        from .cache import literal_lists, bound_lists
+        index = context[IN_LIST_INDEX] = {}
+        for j, v in enumerate(literal_lists(query)):
+            index.setdefault(id(v), j)
+    sql = compiler(query, context, options=options)
+    named = options is not None and is_named(options.interpolation)
+    if any(isinstance(k, ListItem) for k in context[ARG_KEYS]):
+        lists = bound_lists(query, options.in_list)
+    return CompiledStatement(sql, context[ARG_KEYS], named=named, lists=lists)
+
+
+@as_python_code
+def make_extractor(m, name, keys, as_tuple=False, as_dict=False):
+    """
+    >>> make_extractor("extract", ["x", "sub_q.y", ListItem(1, (0, 2))])
+    # def extract(context, lists=()):
+    #     return [context['x'], context['sub_q.y'], lists[0][2]]
+    """
+    r = []
+    for i, k in enumerate(keys):
+        if isinstance(k, ListItem):
+            r.append("lists[{}][{}]".format(*k.position))
+        elif isinstance(k, Bound):
+            const = "_v{}".format(i)
+            m.env[const] = k.value
+            r.append(const)
+        else:
+            r.append("context[{!r}]".format(k))
+    if as_dict:
+        r = ["{!r}: {}".format(param_name(k, i), e) for i, (k, e) in enumerate(zip(keys, r), 1)]
+        fmt = "{{{}}}"
+    else:
+        fmt = "({}, )" if as_tuple and r else ("({})" if as_tuple else "[{}]")
+    with m.def_(name, "context", "lists=()"):
+        m.return_(fmt.format(", ".join(r)))
@@ -0,0 +1,173 @@
+# -*- coding:utf-8 -*-
+import unittest
+from evilunit import test_target
+
+
+def _makeRecord(*args, **kwargs):
+    from nendo import make_record
+    return make_record(*args, **kwargs)
+
+
+class _Database(object):
+    """sqlite database on a temporary file (shared by connections of worker threads)"""
+    def __init__(self, n):
+        import os
+        import sqlite3
+        import tempfile
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("CREATE TABLE T (id INTEGER PRIMARY KEY, name TEXT)")
+            conn.executemany("INSERT INTO T VALUES (?, ?)", [(i, "name{}".format(i)) for i in range(n)])
+        self.fetched = []
+        self.threads = set()
+
+    def connect(self):
+        import sqlite3
+        import threading
+        database = self
+        self.threads.add(threading.current_thread().name)
+        conn = sqlite3.connect(self.path)
+
+        class Cursor(object):
+            def __init__(self):
+                self.cursor = conn.cursor()
+
+            def execute(self, sql, args):
+                return self.cursor.execute(sql, args)
+
+            def fetchall(self):
+                return self.cursor.fetchall()
+
+            def fetchmany(self, size):
+                rows = self.cursor.fetchmany(size)
+                database.fetched.append(len(rows))
+                return rows
+
+            def close(self):
+                self.cursor.close()
+
+        class Connection(object):
+            def cursor(self):
+                return Cursor()
+
+            def close(self):
+                conn.close()
+        return Connection()
+
+    def cleanup(self):
+        import os
+        os.remove(self.path)
+
+
+@test_target("nendo.aio:AsyncExecutor")
+class AsyncExecutorTests(unittest.TestCase):
+    def _makeDatabase(self, n):
+        database = _Database(n)
+        self.addCleanup(database.cleanup)
+        return database
+
+    def _makeQuery(self, T):
+        from nendo import Query
+        from nendo.value import Prepared
+        return Query().from_(T).where(T.id < Prepared("upper_bound")).order_by(T.id)
+
+    def _makeRenderer(self):
+        from nendo import Renderer
+        return Renderer(interpolation="?")
+
+    def _run(self, coro):
+        import asyncio
+        return asyncio.run(coro)
+
+    def test_run(self):
+        T = _makeRecord("T", "id name")
+        database = self._makeDatabase(10)
+
+        async def run():
+            async with self._makeOne(database.connect, size=2, renderer=self._makeRenderer()) as target:
+                return await target.run(self._makeQuery(T), upper_bound=3)
+        self.assertEqual(self._run(run()), [(0, "name0"), (1, "name1"), (2, "name2")])
+
+    def test_run__concurrently(self):
+        import asyncio
+        T = _makeRecord("T", "id name")
+        database = self._makeDatabase(10)
+
+        async def run():
+            async with self._makeOne(database.connect, size=3, renderer=self._makeRenderer()) as target:
+                return await asyncio.gather(*[target.run(self._makeQuery(T), upper_bound=i) for i in range(10)])
+        result = self._run(run())
+        self.assertEqual([len(rows) for rows in result], list(range(10)))
+        self.assertEqual(len(database.threads), 3)
+
+    def test_run__default_renderer(self):
+        import sqlite3
+        T = _makeRecord("T", "id name")
+        database = self._makeDatabase(10)
+
+        async def run():
+            async with self._makeOne(lambda: sqlite3.connect(database.path), size=1) as target:
+                return await target.run(self._makeQuery(T), upper_bound=2)
+        self.assertEqual(self._run(run()), [(0, "name0"), (1, "name1")])
+
+    def test_run__error(self):
+        import sqlite3
+        G = _makeRecord("G", "id")
+        database = self._makeDatabase(1)
+
+        async def run():
+            async with self._makeOne(database.connect, size=1, renderer=self._makeRenderer()) as target:
+                with self.assertRaises(sqlite3.OperationalError):
+                    await target.run(self._makeQuery(G), upper_bound=1)
+                return await target.run(self._makeQuery(_makeRecord("T", "id name")), upper_bound=1)
+        self.assertEqual(self._run(run()), [(0, "name0")])
+
+    def test_stream(self):
+        T = _makeRecord("T", "id name")
+        database = self._makeDatabase(10)
+
+        async def run():
+            async with self._makeOne(database.connect, size=1, renderer=self._makeRenderer(), batch_size=3) as target:
+                return [row async for row in target.stream(self._makeQuery(T), upper_bound=8)]
+        self.assertEqual([row[0] for row in self._run(run())], list(range(8)))
+        self.assertEqual(database.fetched, [3, 3, 2, 0])
+
+    def test_stream__hydrate(self):
+        T = _makeRecord("T", "id name")
+        database = self._makeDatabase(3)
+
+        async def run():
+            async with self._makeOne(database.connect, size=1, renderer=self._makeRenderer()) as target:
+                return [ob.name async for ob in target.stream(self._makeQuery(T), hydrate=True, upper_bound=3)]
+        self.assertEqual(self._run(run()), ["name0", "name1", "name2"])
+
+    def test_stream__backpressure(self):
+        import asyncio
+        T = _makeRecord("T", "id name")
+        database = self._makeDatabase(100)
+
+        async def run():
+            async with self._makeOne(database.connect, size=1, renderer=self._makeRenderer(), batch_size=2, buffer_size=1) as target:
+                rows = target.stream(self._makeQuery(T), upper_bound=100)
+                await rows.__anext__()
+                await asyncio.sleep(0.05)
+                fetched = len(database.fetched)
+                await rows.aclose()
+                # the worker is released
+                return fetched, await target.run(self._makeQuery(T), upper_bound=1)
+        fetched, result = self._run(run())
+        self.assertLessEqual(fetched, 3)  # consumed + buffered + blocked in put
+        self.assertEqual(result, [(0, "name0")])
+
+    def test_closed(self):
+        T = _makeRecord("T", "id name")
+        database = self._makeDatabase(1)
+
+        async def run():
+            target = self._makeOne(database.connect, size=1, renderer=self._makeRenderer())
+            await target.run(self._makeQuery(T), upper_bound=1)
+            await target.close()
+            with self.assertRaises(RuntimeError):
+                await target.run(self._makeQuery(T), upper_bound=1)
+        self._run(run())
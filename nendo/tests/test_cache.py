@@ -0,0 +1,160 @@
+# -*- coding:utf-8 -*-
+import unittest
+from evilunit import test_target
+
+
+def _makeRecord(*args, **kwargs):
+    from nendo import make_record
+    return make_record(*args, **kwargs)
+
+
+@test_target("nendo:Renderer")
+class RenderWithCacheTests(unittest.TestCase):
+    def _makeQuery(self, T, upper_bound=None):
+        from nendo import Query
+        from nendo.value import Prepared
+        return Query().from_(T).where(T.id <= (upper_bound or Prepared("upper_bound"))).select(T.id)
+
+    def test_hit(self):
+        T = _makeRecord("T", "id name")
+        target = self._makeOne(cache_size=10)
+        result0 = target(self._makeQuery(T), upper_bound=10)
+        result1 = target(self._makeQuery(T), upper_bound=20)
+        self.assertEqual(result0, ("SELECT id FROM T WHERE (id <= %s)", [10]))
+        self.assertEqual(result1, ("SELECT id FROM T WHERE (id <= %s)", [20]))
+        self.assertEqual(target.cache_info()[:3], (1, 1, 0))
+
+    def test_miss__literal_is_changed(self):
+        T = _makeRecord("T", "id name")
+        target = self._makeOne(cache_size=10)
+        result0 = target(self._makeQuery(T, upper_bound=10))
+        result1 = target(self._makeQuery(T, upper_bound=10.0))
+        self.assertEqual(result0, ("SELECT id FROM T WHERE (id <= 10)", []))
+        self.assertEqual(result1, ("SELECT id FROM T WHERE (id <= 10.0)", []))
+        self.assertEqual(target.cache_info()[:3], (0, 2, 0))
+
+    def test_eviction(self):
+        T = _makeRecord("T", "id name")
+        G = _makeRecord("G", "id name")
+        target = self._makeOne(cache_size=1)
+        target(self._makeQuery(T), upper_bound=10)
+        target(self._makeQuery(G), upper_bound=10)
+        target(self._makeQuery(T), upper_bound=10)
+        self.assertEqual(target.cache_info(), (0, 3, 2, 1, 1))
+
+    def test_subquery__prepared(self):
+        from nendo import Query, alias
+        from nendo.value import Prepared
+        tb1 = _makeRecord("tb1", "id tb2_id")
+        tb2 = _makeRecord("tb2", "id id2")
+        q = Query().from_(tb2).where(tb2.id >= Prepared("lower_bound"), tb2.id <= Prepared("upper_bound")).select(tb2.id2)
+        sub_q = alias(q, "sub_q")
+        query = Query().from_(tb1.join(sub_q, tb1.id <= sub_q.tb2.id2)).where(tb1.id != Prepared("id"))
+
+        target = self._makeOne(cache_size=10)
+        context = {"sub_q.lower_bound": 1, "sub_q.upper_bound": 2, "id": 3}
+        sql, args = target(query, **context)
+        self.assertEqual(args, [1, 2, 3])
+
+        context = {"sub_q.lower_bound": 10, "sub_q.upper_bound": 20, "id": 30}
+        cached_sql, args = target(query, **context)
+        self.assertEqual(cached_sql, sql)
+        self.assertEqual(args, [10, 20, 30])
+        self.assertEqual(target.cache_info().hits, 1)
+
+    def test_compile__shared_statement(self):
+        T = _makeRecord("T", "id name")
+        target = self._makeOne(cache_size=10)
+        result0 = target.compile(self._makeQuery(T))
+        result1 = target.compile(self._makeQuery(T))
+        self.assertIs(result0, result1)
+        self.assertEqual(result1.bind({"upper_bound": 10}), [10])
+
+    def test_in_list__bound(self):
+        from nendo import Query
+        from nendo.options import InList
+        from nendo.value import Prepared
+        T = _makeRecord("T", "id name")
+        target = self._makeOne(cache_size=10, in_list=InList())
+        query = Query().from_(T).where(T.id.in_([1, 2, 3]), T.name == Prepared("name")).select(T.id)
+        target(query, name="foo")
+        result = target(query, name="bar")
+        self.assertEqual(result, ("SELECT id FROM T WHERE ((id IN (%s, %s, %s, %s)) AND (name = %s))", [1, 2, 3, 3, "bar"]))
+        self.assertEqual(target.cache_info().hits, 1)
+
+    def test_in_list__shared_by_bucket(self):
+        from nendo import Query
+        from nendo.options import InList
+        T = _makeRecord("T", "id name")
+        target = self._makeOne(cache_size=10, in_list=InList())
+        for values in ([1, 2, 3], [4, 5, 6], [7, 8, 9, 10]):
+            result = target(Query().from_(T).where(T.id.in_(values)).select(T.id))
+            self.assertEqual(result, ("SELECT id FROM T WHERE (id IN (%s, %s, %s, %s))", (values + values[-1:])[:4]))
+        self.assertEqual(target.cache_info()[:3], (2, 1, 0))
+        target(Query().from_(T).where(T.id.in_([1, 2, 3, 4, 5])).select(T.id))
+        self.assertEqual(target.cache_info()[:3], (2, 2, 0))
+
+    def test_in_list__order_of_lists(self):
+        from nendo import Query
+        from nendo.options import InList
+        T = _makeRecord("T", "id name")
+        target = self._makeOne(cache_size=10, in_list=InList())
+        target(Query().from_(T).where(T.id.in_([1]), T.name.not_in(["a"])).select(T.id))
+        result = target(Query().from_(T).where(T.id.in_([2]), T.name.not_in(["b"])).select(T.id))
+        self.assertEqual(result[1], [2, "b"])
+        self.assertEqual(target.cache_info().hits, 1)
+
+    def test_in_list__inlined(self):
+        from nendo import Query
+        T = _makeRecord("T", "id name")
+        target = self._makeOne(cache_size=10)
+        target(Query().from_(T).where(T.id.in_([1, 2])).select(T.id))
+        result = target(Query().from_(T).where(T.id.in_([3, 4])).select(T.id))
+        self.assertEqual(result, ("SELECT id FROM T WHERE (id IN (3, 4))", []))
+        self.assertEqual(target.cache_info().misses, 2)
+
+    def test_without_cache(self):
+        target = self._makeOne()
+        self.assertIsNone(target.cache_info())
+
+
+@test_target("nendo.cache:LRUCache")
+class LRUCacheTests(unittest.TestCase):
+    def test_least_recently_used_is_evicted(self):
+        target = self._makeOne(maxsize=2)
+        target["a"] = 1
+        target["b"] = 2
+        target.get("a")
+        target["c"] = 3
+        self.assertIn("a", target)
+        self.assertNotIn("b", target)
+        self.assertEqual(target.info(), (1, 0, 1, 2, 2))
+
+    def test_on_evict(self):
+        evicted = []
+        target = self._makeOne(maxsize=1, on_evict=lambda k, v: evicted.append((k, v)))
+        target["a"] = 1
+        target["b"] = 2
+        self.assertEqual(evicted, [("a", 1)])
+
+    def test_threads(self):
+        import threading
+        target = self._makeOne(maxsize=4)
+        errors = []
+
+        def run(n):
+            try:
+                for i in range(2000):
+                    k = (n + i) % 8
+                    if target.get(k) is None:
+                        target[k] = i
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(n, )) for n in range(8)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(target), 4)
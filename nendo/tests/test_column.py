@@ -67,3 +67,73 @@ class PropsTest(unittest.TestCase):
         query = self._makeOne().from_(T.join(G, T.id == G.t_id)).select(T.id, G.id)
         result = list(query.props())
         self.assertEqual(result, [T.id, G.id])
+
+
+@test_target("nendo.query:Query")
+class TablesTest(unittest.TestCase):
+    def test_deeply_nested_condition(self):
+        from functools import reduce
+        from operator import or_
+        T = _makeRecord("T", "id, name")
+        G = _makeRecord("G", "id, name")
+        cond = reduce(or_, [T.id == i for i in range(10000)] + [G.id == T.id])
+        query = self._makeOne().from_(T, G).where(cond)
+        self.assertEqual(list(query._where.tables()), [T] * 10000 + [G, T])
+        self.assertEqual(len(list(cond.props())), 10002)
+
+
+@test_target("nendo.query:Query")
+class BuilderTest(unittest.TestCase):
+    def test_untouched_clauses_are_shared(self):
+        T = _makeRecord("T", "id, name")
+        query = self._makeOne().from_(T).select(T.id)
+        result = query.where(T.id == 1)
+        self.assertIs(result._select, query._select)
+        self.assertIs(result._from, query._from)
+        self.assertIs(result.env, query.env)
+
+    def test_branches_are_independent(self):
+        from nendo.compiler import compiler
+        T = _makeRecord("T", "id, name")
+        query = self._makeOne().from_(T).where(T.id > 0)
+        q0 = query.where(T.name == "foo")
+        q1 = query.where(T.name == "bar").where(T.id < 10)
+        self.assertEqual(compiler(query, {}), "SELECT T.id, T.name FROM T WHERE (T.id > 0)")
+        self.assertEqual(compiler(q0, {}), "SELECT T.id, T.name FROM T WHERE ((T.id > 0) AND (T.name = 'foo'))")
+        self.assertEqual(compiler(q1, {}), "SELECT T.id, T.name FROM T WHERE ((T.id > 0) AND (T.name = 'bar') AND (T.id < 10))")
+
+    def test_select__distinct(self):
+        from nendo.compiler import compiler
+        T = _makeRecord("T", "id, name")
+        query = self._makeOne().from_(T).select(T.id)
+        result = query.select(T.name, distinct=True)
+        self.assertEqual(compiler(result, {}), "SELECT DISTINCT T.id, T.name FROM T")
+        self.assertEqual(compiler(query, {}), "SELECT T.id FROM T")
+
+
+@test_target("nendo.query:Query")
+class NameIndexTest(unittest.TestCase):
+    def test_attribute__conflicted_name(self):
+        T = _makeRecord("T", "id, name")
+        G = _makeRecord("G", "id, name")
+        query = self._makeOne().from_(T, G).select(T.id, G.id)
+        self.assertIs(query.id.record, T)
+        self.assertIs(query._select.id, T.id)
+        self.assertIs(query._from.G, G)
+        with self.assertRaises(AttributeError):
+            query.missing
+
+    def test_wide_subquery(self):
+        from nendo import alias
+        columns = ["c{}".format(i) for i in range(200)]
+        T = _makeRecord("T", " ".join(columns))
+        query = self._makeOne().from_(T)
+        sub = alias(query, "sub")
+        self.assertEqual([p.name for p in sub.props()], ["T_{}".format(c) for c in columns])
+        self.assertEqual(sub.T.c199.name, "T_c199")
+
+    def test_swap__reused(self):
+        T = _makeRecord("T", "id, name")
+        query = self._makeOne().from_(T).select(T.id)
+        self.assertIs(query.swap("a"), query.swap("a"))
+        self.assertIsNot(query.swap("a"), query.swap("b"))
@@ -0,0 +1,110 @@
+# -*- coding:utf-8 -*-
+import unittest
+from evilunit import test_function, test_target
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _makeCursor(rows):
+    import sqlite3
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE T (id INTEGER, score REAL, name TEXT)")
+    conn.executemany("INSERT INTO T VALUES (?, ?, ?)", rows)
+    return conn.execute("SELECT id, score, name FROM T ORDER BY id")
+
+
+@test_function("nendo.columnar:fetch_columns")
+class FetchColumnsTests(unittest.TestCase):
+    def test_array(self):
+        from array import array
+        cursor = _makeCursor([(i, i / 2, "n{}".format(i)) for i in range(5)])
+        result = self._callFUT(cursor, batch_size=2, use_numpy=False)
+        self.assertEqual(list(result.keys()), ["id", "score", "name"])
+        self.assertEqual(result["id"], array("q", [0, 1, 2, 3, 4]))
+        self.assertEqual(result["score"], array("d", [0.0, 0.5, 1.0, 1.5, 2.0]))
+        self.assertEqual(result["name"], ["n0", "n1", "n2", "n3", "n4"])
+
+    def test_array__empty(self):
+        result = self._callFUT(_makeCursor([]), use_numpy=False)
+        self.assertEqual(len(result["id"]), 0)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy(self):
+        cursor = _makeCursor([(i, i / 2, "n{}".format(i)) for i in range(5)])
+        result = self._callFUT(cursor, batch_size=2, use_numpy=True)
+        self.assertEqual(result["id"].dtype, numpy.int64)
+        self.assertEqual(result["id"].tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(result["score"].tolist(), [0.0, 0.5, 1.0, 1.5, 2.0])
+        self.assertEqual(result["name"].tolist(), ["n0", "n1", "n2", "n3", "n4"])
+
+    def test_conflicted_names(self):
+        import sqlite3
+        from nendo.exceptions import InvalidCombination
+        cursor = sqlite3.connect(":memory:").execute("SELECT 1 AS id, 2 AS id")
+        with self.assertRaises(InvalidCombination):
+            self._callFUT(cursor)
+
+
+@test_target("nendo.columnar:ArrayColumn")
+class ArrayColumnTests(unittest.TestCase):
+    def test_promotion__int_to_float(self):
+        target = self._makeOne()
+        target.extend((1, 2))
+        target.extend((0.5, ))
+        self.assertEqual(target.value().typecode, "d")
+        self.assertEqual(target.value().tolist(), [1.0, 2.0, 0.5])
+
+    def test_promotion__to_list(self):
+        target = self._makeOne()
+        target.extend((1, 2))
+        target.extend((None, 2 ** 70))
+        self.assertEqual(target.value(), [1, 2, None, 2 ** 70])
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+@test_target("nendo.columnar:NumpyColumn")
+class NumpyColumnTests(unittest.TestCase):
+    def test_grow_and_promotion(self):
+        target = self._makeOne(capacity=2)
+        target.extend((1, 2))
+        target.extend((0.5, 1.5, 2.5))
+        result = target.value()
+        self.assertEqual(result.dtype, numpy.float64)
+        self.assertEqual(result.tolist(), [1.0, 2.0, 0.5, 1.5, 2.5])
+
+    def test_promotion__to_object(self):
+        target = self._makeOne()
+        target.extend((1, 2))
+        target.extend(("x", ))
+        self.assertEqual(target.value().tolist(), [1, 2, "x"])
+
+
+@test_target("nendo.executor:Executor")
+class ExecutorFetchColumnsTests(unittest.TestCase):
+    def test_it(self):
+        import sqlite3
+        from nendo import make_record, Query
+        from nendo.value import Prepared
+        T = make_record("T", "id name")
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE T (id INTEGER, name TEXT)")
+        conn.executemany("INSERT INTO T VALUES (?, ?)", [(i, "n{}".format(i)) for i in range(10)])
+        query = Query().from_(T).where(T.id < Prepared("n")).select(T.id).order_by(T.id)
+        result = self._makeOne(conn, batch_size=3).fetch_columns(query, n=4)
+        self.assertEqual(list(result["id"]), [0, 1, 2, 3])
+
+    def test_same_names(self):
+        import sqlite3
+        from nendo import make_record, Query
+        T = make_record("T", "id")
+        G = make_record("G", "id t_id")
+        conn = sqlite3.connect(":memory:")
+        conn.executescript("CREATE TABLE T (id INTEGER); CREATE TABLE G (id INTEGER, t_id INTEGER);"
+                           "INSERT INTO T VALUES (1); INSERT INTO G VALUES (2, 1);")
+        query = Query().from_(T, G).where(T.id == G.t_id).select(T.id, G.id)
+        result = self._makeOne(conn).fetch_columns(query, use_numpy=False)
+        self.assertEqual({k: list(v) for k, v in result.items()}, {"T.id": [1], "G.id": [2]})
+
@@ -0,0 +1,34 @@
+# -*- coding:utf-8 -*-
+import unittest
+from evilunit import test_target
+
+
+@test_target("nendo.env:Env")
+class EnvTests(unittest.TestCase):
+    def test_merge__is_lazy(self):
+        parent = self._makeOne({"a": 1})
+        target = self._makeOne()
+        target.merge(parent)
+        parent._env["b"] = 2  # not copied by merge()
+        self.assertEqual(target.env, {"a": 1, "b": 2})
+
+    def test_merge__empty_env_is_not_linked(self):
+        target = self._makeOne()
+        target.merge(self._makeOne(), None, 1)
+        self.assertEqual(target.parents, [])
+
+    def test_expression(self):
+        from nendo import make_record
+        from nendo.value import Prepared
+        T = make_record("T", "id")
+        expr = (T.id == Prepared("a")) & ((T.id + 1) < Prepared("b"))
+        self.assertEqual(sorted(expr.env.env.keys()), ["a", "b"])
+
+    def test_deep_chain(self):
+        from nendo import make_record
+        from nendo.value import Prepared
+        T = make_record("T", "id")
+        expr = T.id
+        for i in range(5000):
+            expr = expr + Prepared("v{}".format(i))
+        self.assertEqual(len(expr.env.env), 5000)
@@ -0,0 +1,107 @@
+# -*- coding:utf-8 -*-
+import unittest
+from evilunit import test_target, test_function
+
+
+def _makeRecord(*args, **kwargs):
+    from nendo import make_record
+    return make_record(*args, **kwargs)
+
+
+class _Connection(object):
+    """sqlite3 connection recording fetchmany() calls"""
+    def __init__(self, n):
+        import sqlite3
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute("CREATE TABLE T (id INTEGER PRIMARY KEY, name TEXT)")
+        self.conn.executemany("INSERT INTO T VALUES (?, ?)", [(i, "name{}".format(i)) for i in range(n)])
+        self.fetched = []
+        self.closed = 0
+
+    def cursor(self):
+        connection = self
+        cursor = self.conn.cursor()
+
+        class Cursor(object):
+            def execute(self, sql, args):
+                return cursor.execute(sql, args)
+
+            def fetchmany(self, size):
+                rows = cursor.fetchmany(size)
+                connection.fetched.append(len(rows))
+                return rows
+
+            def close(self):
+                connection.closed += 1
+                cursor.close()
+        return Cursor()
+
+
+@test_target("nendo.executor:Executor")
+class ExecutorTests(unittest.TestCase):
+    def _makeQuery(self, T):
+        from nendo import Query
+        from nendo.value import Prepared
+        return Query().from_(T).where(T.id < Prepared("upper_bound")).order_by(T.id)
+
+    def _makeRenderer(self):
+        from nendo import Renderer
+        return Renderer(interpolation="?")
+
+    def test_iter_rows__lazy(self):
+        T = _makeRecord("T", "id name")
+        connection = _Connection(10)
+        target = self._makeOne(connection, renderer=self._makeRenderer(), batch_size=3)
+        rows = target.iter_rows(self._makeQuery(T), upper_bound=8)
+        self.assertEqual(next(rows), (0, "name0"))
+        self.assertEqual(connection.fetched, [3])
+        self.assertEqual([row[0] for row in rows], [1, 2, 3, 4, 5, 6, 7])
+        self.assertEqual(connection.fetched, [3, 3, 2, 0])
+        self.assertEqual(connection.closed, 1)
+
+    def test_iter_batches(self):
+        T = _makeRecord("T", "id name")
+        target = self._makeOne(_Connection(10), renderer=self._makeRenderer())
+        result = list(target.iter_batches(self._makeQuery(T), batch_size=4, upper_bound=10))
+        self.assertEqual([len(rows) for rows in result], [4, 4, 2])
+
+    def test_iter_batches__hydrate(self):
+        T = _makeRecord("T", "id name")
+        target = self._makeOne(_Connection(3), renderer=self._makeRenderer())
+        result = list(target.iter_batches(self._makeQuery(T).select(T.name), hydrate=True, upper_bound=10))
+        self.assertEqual([[ob.name for ob in records] for records in result], [["name0", "name1", "name2"]])
+
+    def test_iter_records(self):
+        T = _makeRecord("T", "id name")
+        target = self._makeOne(_Connection(5), renderer=self._makeRenderer(), batch_size=2)
+        result = list(target.iter_records(self._makeQuery(T), upper_bound=3))
+        self.assertTrue(all(isinstance(ob, T) for ob in result))
+        self.assertEqual([(ob.id, ob.name) for ob in result], [(0, "name0"), (1, "name1"), (2, "name2")])
+
+    def test_abandoned_iteration__cursor_is_closed(self):
+        T = _makeRecord("T", "id name")
+        connection = _Connection(10)
+        target = self._makeOne(connection, renderer=self._makeRenderer(), batch_size=3)
+        rows = target.iter_rows(self._makeQuery(T), upper_bound=10)
+        next(rows)
+        rows.close()
+        self.assertEqual(connection.closed, 1)
+
+    def test_default_renderer__sqlite3(self):
+        import sqlite3
+        T = _makeRecord("T", "id name")
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE T (id INTEGER PRIMARY KEY, name TEXT)")
+        connection.execute("INSERT INTO T VALUES (1, 'foo')")
+        target = self._makeOne(connection)
+        self.assertEqual(list(target.iter_rows(self._makeQuery(T), upper_bound=10)), [(1, "foo")])
+
+
+@test_function("nendo.executor:interpolation_of")
+class InterpolationOfTests(unittest.TestCase):
+    def test_sqlite3(self):
+        import sqlite3
+        self.assertEqual(self._callFUT(sqlite3.connect(":memory:")), "?")
+
+    def test_unknown(self):
+        self.assertEqual(self._callFUT(object()), "%s")
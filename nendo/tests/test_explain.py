@@ -0,0 +1,99 @@
+# -*- coding:utf-8 -*-
+import unittest
+from evilunit import test_function
+
+
+def _makeRecord(*args, **kwargs):
+    from nendo import make_record
+    return make_record(*args, **kwargs)
+
+
+def _makeConnection():
+    import sqlite3
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE T (id INTEGER PRIMARY KEY, name TEXT)")
+    connection.execute("CREATE TABLE U (id INTEGER PRIMARY KEY, t_id INTEGER, value INTEGER)")
+    connection.execute("CREATE INDEX U_t_id ON U (t_id)")
+    return connection
+
+
+@test_function("nendo.explain:explain")
+class ExplainTests(unittest.TestCase):
+    def test_search(self):
+        from nendo import Query
+        from nendo.value import Prepared
+        T = _makeRecord("T", "id name")
+        plan = self._callFUT(Query().from_(T).where(T.id == Prepared("id")), _makeConnection(), id=1)
+        self.assertEqual(plan.detail, "QUERY PLAN")
+        self.assertEqual(len(plan.children), 1)
+        self.assertTrue(plan.children[0].detail.startswith("SEARCH T"))
+        self.assertEqual(plan.full_scans(), [])
+
+    def test_scan(self):
+        from nendo import Query
+        from nendo.value import Prepared
+        T = _makeRecord("T", "id name")
+        plan = self._callFUT(Query().from_(T).where(T.name == Prepared("name")), _makeConnection(), name="foo")
+        self.assertEqual(plan.full_scans(), ["T"])
+
+    def test_subquery(self):
+        from nendo import Query, subquery
+        T = _makeRecord("T", "id name")
+        U = _makeRecord("U", "id t_id value")
+        inner = Query().from_(U).where(U.value == 10).select(U.t_id)
+        plan = self._callFUT(Query().from_(T).where(T.id.in_(subquery(inner))), _makeConnection())
+        self.assertIn("U", plan.full_scans())
+        nested = [node for node in plan.walk() if node.parent not in (None, 0)]
+        self.assertTrue(nested)
+
+
+@test_function("nendo.explain:assert_no_full_scan")
+class AssertNoFullScanTests(unittest.TestCase):
+    def _explain(self, query, **context):
+        from nendo.explain import explain
+        return explain(query, _makeConnection(), **context)
+
+    def test_ok(self):
+        from nendo import Query
+        T = _makeRecord("T", "id name")
+        U = _makeRecord("U", "id t_id value")
+        query = Query().from_(T, U).where(T.id == U.t_id, T.id == 1)
+        plan = self._explain(query)
+        self._callFUT(plan, T)
+        self._callFUT(plan, "U")
+
+    def test_full_scan(self):
+        from nendo import Query
+        T = _makeRecord("T", "id name")
+        plan = self._explain(Query().from_(T).where(T.name == "foo"))
+        with self.assertRaisesRegex(AssertionError, "full scan on T"):
+            self._callFUT(plan, T)
+
+    def test_index_scan(self):
+        from nendo import Query
+        U = _makeRecord("U", "id t_id value")
+        plan = self._explain(Query().from_(U).select(U.t_id).order_by(U.t_id))
+        with self.assertRaises(AssertionError):
+            self._callFUT(plan, U)
+        self._callFUT(plan, U, allow_index_scan=True)
+
+
+@test_function("nendo.explain:parse_plan")
+class ParsePlanTests(unittest.TestCase):
+    def test_postgresql(self):
+        lines = [
+            "Hash Join  (cost=1.09..2.21 rows=4 width=72)",
+            "  Hash Cond: (u.t_id = t.id)",
+            "  ->  Seq Scan on u  (cost=0.00..1.04 rows=4 width=36)",
+            "  ->  Hash  (cost=1.04..1.04 rows=4 width=36)",
+            "        ->  Index Scan using t_pkey on t x  (cost=0.00..1.04 rows=4 width=36)",
+        ]
+        plan = self._callFUT(lines)
+        join, = plan.children
+        self.assertEqual([c.detail.split("  ")[0] for c in join.children], ["Hash Cond: (u.t_id = t.id)", "Seq Scan on u", "Hash"])
+        self.assertEqual(join.children[2].children[0].parent, join.children[2].id)
+        self.assertEqual(plan.full_scans(), ["u"])
+
+    def test_parallel_seq_scan_with_alias(self):
+        plan = self._callFUT(["Gather", "  ->  Parallel Seq Scan on t x  (cost=0.00..1.04 rows=4 width=36)"])
+        self.assertEqual(plan.full_scans(), ["t", "x"])
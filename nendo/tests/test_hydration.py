@@ -0,0 +1,55 @@
+# -*- coding:utf-8 -*-
+import unittest
+from evilunit import test_function
+
+
+def _makeRecord(*args, **kwargs):
+    from nendo import make_record
+    return make_record(*args, **kwargs)
+
+
+@test_function("nendo.hydration:make_hydrator")
+class MakeHydratorTests(unittest.TestCase):
+    def _makeQuery(self):
+        from nendo import Query
+        return Query()
+
+    def test_all_columns(self):
+        T = _makeRecord("T", "id name value")
+        hydrate = self._callFUT(self._makeQuery().from_(T))
+        ob = hydrate((1, "foo", 10))
+        self.assertIsInstance(ob, T)
+        self.assertEqual((ob.id, ob.name, ob.value), (1, "foo", 10))
+
+    def test_order_of_select(self):
+        T = _makeRecord("T", "id name value")
+        hydrate = self._callFUT(self._makeQuery().from_(T).select(T.name, T.id))
+        ob = hydrate(("foo", 1))
+        self.assertEqual((ob.id, ob.name), (1, "foo"))
+        self.assertIsNone(ob.value)
+
+    def test_cached(self):
+        T = _makeRecord("T", "id name value")
+        hydrate0 = self._callFUT(self._makeQuery().from_(T).select(T.name, T.id))
+        hydrate1 = self._callFUT(self._makeQuery().from_(T).where(T.id == 1).select(T.name, T.id))
+        self.assertIs(hydrate0, hydrate1)
+        self.assertIsNot(hydrate0, self._callFUT(self._makeQuery().from_(T).select(T.id, T.name)))
+
+    def test_not_a_column(self):
+        from nendo.exceptions import InvalidCombination
+        from nendo.value import Function
+        T = _makeRecord("T", "id name")
+        with self.assertRaises(InvalidCombination):
+            self._callFUT(self._makeQuery().from_(T).select(T.id, Function("count", T.id)))
+
+    def test_sqlite3(self):
+        import sqlite3
+        from nendo import Renderer
+        from nendo.hydration import hydrate
+        T = _makeRecord("T", "id name")
+        conn = sqlite3.connect(":memory:")
+        conn.executescript("CREATE TABLE T (id INTEGER, name TEXT); INSERT INTO T VALUES (1, 'foo'), (2, 'bar');")
+        query = self._makeQuery().from_(T).order_by(T.id)
+        sql, args = Renderer(interpolation="?")(query)
+        result = hydrate(query, conn.execute(sql, args))
+        self.assertEqual([(ob.id, ob.name) for ob in result], [(1, "foo"), (2, "bar")])
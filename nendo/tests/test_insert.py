@@ -0,0 +1,81 @@
+# -*- coding:utf-8 -*-
+import unittest
+from evilunit import test_target
+
+
+def _makeRecord(*args, **kwargs):
+    from nendo import make_record
+    return make_record(*args, **kwargs)
+
+
+@test_target("nendo.insert:Insert")
+class SQLTests(unittest.TestCase):
+    def test_it(self):
+        T = _makeRecord("T", "id name")
+        result = self._makeOne(T).sql(2)
+        self.assertEqual(result, "INSERT INTO T (id, name) VALUES (%s, %s), (%s, %s)")
+
+    def test_columns(self):
+        T = _makeRecord("T", "id name")
+        result = self._makeOne(T, T.name).sql(1, interpolation="?")
+        self.assertEqual(result, "INSERT INTO T (name) VALUES (?)")
+
+    def test_upsert(self):
+        T = _makeRecord("T", "id name value")
+        result = self._makeOne(T).on_conflict(T.id).do_update().sql(1)
+        expected = "INSERT INTO T (id, name, value) VALUES (%s, %s, %s) ON CONFLICT (id) DO UPDATE SET name = excluded.name, value = excluded.value"
+        self.assertEqual(result, expected)
+
+    def test_upsert__do_nothing(self):
+        T = _makeRecord("T", "id name")
+        result = self._makeOne(T).on_conflict(T.id).do_nothing().sql(1)
+        self.assertEqual(result, "INSERT INTO T (id, name) VALUES (%s, %s) ON CONFLICT (id) DO NOTHING")
+
+    def test_do_update__without_on_conflict(self):
+        from nendo.exceptions import InvalidCombination
+        T = _makeRecord("T", "id name")
+        with self.assertRaises(InvalidCombination):
+            self._makeOne(T).do_update(T.name)
+
+
+@test_target("nendo:Renderer")
+class InsertManyTests(unittest.TestCase):
+    def _connect(self):
+        import sqlite3
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE T (id INTEGER PRIMARY KEY, name TEXT)")
+        return conn
+
+    def test_chunked(self):
+        from nendo import Insert
+        T = _makeRecord("T", "id name")
+        conn = self._connect()
+        target = self._makeOne(interpolation="?")
+        rows = (T(i, "name{}".format(i)) if i % 2 else (i, "name{}".format(i)) for i in range(260))
+        statements = list(target.insert_many(Insert(T), rows, max_params=100))
+        self.assertEqual([len(args) for _, args in statements], [100] * 5 + [20])
+        self.assertEqual(len(set(sql for sql, _ in statements)), 2)
+        for sql, args in statements:
+            conn.execute(sql, args)
+        self.assertEqual(conn.execute("SELECT count(*), max(id) FROM T").fetchone(), (260, 259))
+
+    def test_upsert(self):
+        from nendo import Insert
+        T = _makeRecord("T", "id name")
+        conn = self._connect()
+        target = self._makeOne(interpolation="?")
+        insert = Insert(T).on_conflict(T.id).do_update(T.name)
+        for rows in ([(1, "foo"), (2, "bar")], [{"id": 2, "name": "boo"}, {"id": 3, "name": "baz"}]):
+            for sql, args in target.insert_many(insert, rows):
+                conn.execute(sql, args)
+        self.assertEqual(conn.execute("SELECT id, name FROM T ORDER BY id").fetchall(), [(1, "foo"), (2, "boo"), (3, "baz")])
+
+    def test_named(self):
+        from nendo import Insert
+        T = _makeRecord("T", "id name")
+        conn = self._connect()
+        target = self._makeOne(paramstyle="named")
+        for sql, args in target.insert_many(Insert(T), [(1, "foo"), (2, "bar")]):
+            self.assertEqual(sql, "INSERT INTO T (id, name) VALUES (:id_0, :name_0), (:id_1, :name_1)")
+            conn.execute(sql, args)
+        self.assertEqual(conn.execute("SELECT id, name FROM T ORDER BY id").fetchall(), [(1, "foo"), (2, "bar")])
@@ -0,0 +1,41 @@
+# -*- coding:utf-8 -*-
+import unittest
+from evilunit import test_function
+
+
+@test_function("nendo.langhelpers:typedispatch")
+class TypeDispatchTests(unittest.TestCase):
+    def _makeOne(self):
+        def default(v):
+            return "default"
+        target = self._callFUT(default)
+
+        @target.register(int)
+        def on_int(v):
+            return "int"
+        return target
+
+    def test_exact_type(self):
+        target = self._makeOne()
+        self.assertEqual(target(1), "int")
+        self.assertEqual(target("x"), "default")
+
+    def test_mro(self):
+        target = self._makeOne()
+        self.assertEqual(target(True), "int")
+
+    def test_register__after_dispatch(self):
+        target = self._makeOne()
+        self.assertEqual(target(True), "int")
+
+        @target.register(bool)
+        def on_bool(v):
+            return "bool"
+        self.assertEqual(target(True), "bool")
+        self.assertEqual(target(1), "int")
+
+    def test_virtual_subclass(self):
+        from collections.abc import Sequence
+        target = self._makeOne()
+        target.register(Sequence, lambda v: "sequence")
+        self.assertEqual(target((1, 2)), "sequence")
@@ -0,0 +1,36 @@
+# -*- coding:utf-8 -*-
+import unittest
+
+
+class LazyAttributesTests(unittest.TestCase):
+    def test_function(self):
+        from nendo import paginate_query, explain_query, reflect_records
+        from nendo.paginate import paginate
+        from nendo.explain import explain
+        from nendo.reflect import reflect
+        self.assertEqual((paginate_query, explain_query, reflect_records), (paginate, explain, reflect))
+
+    def test_submodule(self):
+        import sys
+        import nendo
+        import nendo.paginate as m
+        from nendo import paginate
+        self.assertIs(m, sys.modules["nendo.paginate"])
+        self.assertIs(paginate, m)
+        self.assertIs(nendo.paginate, m)
+        self.assertIs(m.paginate, nendo.paginate_query)
+
+    def test_submodule__loaded_after_function(self):
+        import os
+        import subprocess
+        import sys
+        import nendo
+        cwd = os.path.dirname(os.path.dirname(os.path.abspath(nendo.__file__)))
+        code = "import nendo; nendo.explain_query; import nendo.explain as m; print(type(m).__name__)"
+        result = subprocess.check_output([sys.executable, "-c", code], cwd=cwd)
+        self.assertEqual(result.strip(), b"module")
+
+    def test_unknown(self):
+        import nendo
+        with self.assertRaises(AttributeError):
+            nendo.unknown
@@ -0,0 +1,147 @@
+# -*- coding:utf-8 -*-
+import unittest
+from evilunit import test_function
+
+
+def _makeRecord(*args, **kwargs):
+    from nendo import make_record
+    return make_record(*args, **kwargs)
+
+
+def _render(query):
+    from nendo import Renderer
+    return Renderer(interpolation="?").compile(query).sql
+
+
+@test_function("nendo.paginate:seek_predicate")
+class SeekPredicateTests(unittest.TestCase):
+    def _makeQuery(self, T, *order_by):
+        from nendo import Query
+        return Query().from_(T).select(T.id).order_by(*order_by)
+
+    def _where(self, T, *order_by, **kwargs):
+        from nendo.paginate import seek_keys
+        query = self._makeQuery(T, *order_by)
+        return _render(query.where(self._callFUT(seek_keys(query), **kwargs)))
+
+    def test_one_column(self):
+        T = _makeRecord("T", "id a")
+        result = self._where(T, T.id)
+        self.assertEqual(result, "SELECT id FROM T WHERE (id > ?) ORDER BY id")
+
+    def test_one_column__desc(self):
+        T = _makeRecord("T", "id a")
+        result = self._where(T, T.id.desc())
+        self.assertEqual(result, "SELECT id FROM T WHERE (id < ?) ORDER BY id DESC")
+
+    def test_row_values(self):
+        T = _makeRecord("T", "id a")
+        result = self._where(T, T.a.desc(), T.id.desc())
+        self.assertEqual(result, "SELECT id FROM T WHERE ((a, id) < (?, ?)) ORDER BY a DESC, id DESC")
+
+    def test_mixed_directions(self):
+        T = _makeRecord("T", "id a")
+        result = self._where(T, T.a, T.id.desc())
+        expected = "SELECT id FROM T WHERE ((a > ?) OR ((a = ?) AND (id < ?))) ORDER BY a, id DESC"
+        self.assertEqual(result, expected)
+
+    def test_without_row_values(self):
+        T = _makeRecord("T", "id a")
+        result = self._where(T, T.a.asc(), T.id, row_values=False)
+        expected = "SELECT id FROM T WHERE ((a > ?) OR ((a = ?) AND (id > ?))) ORDER BY a ASC, id"
+        self.assertEqual(result, expected)
+
+    def test_without_order_by(self):
+        from nendo.paginate import seek_keys
+        from nendo.exceptions import InvalidCombination
+        T = _makeRecord("T", "id a")
+        with self.assertRaises(InvalidCombination):
+            seek_keys(self._makeQuery(T))
+
+
+@test_function("nendo.paginate:paginate")
+class PaginateTests(unittest.TestCase):
+    def _makeConnection(self, rows):
+        import sqlite3
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE T (id INTEGER PRIMARY KEY, a INTEGER)")
+        connection.executemany("INSERT INTO T VALUES (?, ?)", rows)
+        return connection
+
+    def _makeQuery(self, T):
+        from nendo import Query
+        return Query().from_(T).select(T.id, T.a)
+
+    def test_pages(self):
+        T = _makeRecord("T", "id a")
+        connection = self._makeConnection([(i, i % 3) for i in range(7)])
+        result = list(self._callFUT(self._makeQuery(T).order_by(T.id), 3, connection))
+        self.assertEqual([[row[0] for row in rows] for rows in result], [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_mixed_directions(self):
+        T = _makeRecord("T", "id a")
+        rows = [(i, i % 3) for i in range(10)]
+        connection = self._makeConnection(rows)
+        query = self._makeQuery(T).order_by(T.a.desc(), T.id)
+        result = [row for page in self._callFUT(query, 4, connection) for row in page]
+        self.assertEqual(result, sorted(rows, key=lambda row: (-row[1], row[0])))
+
+    def test_row_values(self):
+        T = _makeRecord("T", "id a")
+        rows = [(i, i % 3) for i in range(10)]
+        connection = self._makeConnection(rows)
+        query = self._makeQuery(T).order_by(T.a.desc(), T.id.desc())
+        result = [row for page in self._callFUT(query, 3, connection) for row in page]
+        self.assertEqual(result, sorted(rows, key=lambda row: (-row[1], -row[0])))
+
+    def test_with_condition(self):
+        from nendo.value import Prepared
+        T = _makeRecord("T", "id a")
+        connection = self._makeConnection([(i, i % 3) for i in range(10)])
+        query = self._makeQuery(T).where(T.a == Prepared("a")).order_by(T.id)
+        result = list(self._callFUT(query, 2, connection, a=0))
+        self.assertEqual([[row[0] for row in rows] for rows in result], [[0, 3], [6, 9]])
+
+    def test_limit(self):
+        T = _makeRecord("T", "id a")
+        connection = self._makeConnection([(i, 0) for i in range(10)])
+        result = list(self._callFUT(self._makeQuery(T).order_by(T.id).limit(5), 2, connection))
+        self.assertEqual([[row[0] for row in rows] for rows in result], [[0, 1], [2, 3], [4]])
+
+    def test_limit__not_number(self):
+        from nendo.value import Prepared
+        from nendo.exceptions import InvalidCombination
+        T = _makeRecord("T", "id a")
+        query = self._makeQuery(T).order_by(T.id).limit(Prepared("n"))
+        with self.assertRaises(InvalidCombination):
+            next(self._callFUT(query, 2, self._makeConnection([]), n=1))
+
+    def test_aliased(self):
+        from nendo import Query, alias
+        T = _makeRecord("T", "id a")
+        connection = self._makeConnection([(i, 0) for i in range(5)])
+        tid = alias(T.id, "tid")
+        for order_by in (T.id, tid):
+            query = Query().from_(T).select(tid, T.a).order_by(order_by)
+            result = list(self._callFUT(query, 2, connection))
+            self.assertEqual([[row[0] for row in rows] for rows in result], [[0, 1], [2, 3], [4]])
+
+    def test_exact_pages(self):
+        T = _makeRecord("T", "id a")
+        connection = self._makeConnection([(i, 0) for i in range(4)])
+        result = list(self._callFUT(self._makeQuery(T).order_by(T.id), 2, connection))
+        self.assertEqual(len(result), 2)
+
+    def test_hydrate(self):
+        T = _makeRecord("T", "id a")
+        connection = self._makeConnection([(1, 10), (2, 20)])
+        pages = list(self._callFUT(self._makeQuery(T).order_by(T.id), 1, connection, hydrate=True))
+        self.assertEqual([[(r.id, r.a) for r in rows] for rows in pages], [[(1, 10)], [(2, 20)]])
+
+    def test_order_by_not_selected(self):
+        from nendo import Query
+        from nendo.exceptions import InvalidCombination
+        T = _makeRecord("T", "id a")
+        query = Query().from_(T).select(T.id).order_by(T.a)
+        with self.assertRaises(InvalidCombination):
+            next(self._callFUT(query, 2, self._makeConnection([])))
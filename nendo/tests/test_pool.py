@@ -0,0 +1,108 @@
+# -*- coding:utf-8 -*-
+import unittest
+from evilunit import test_target
+
+
+def _connect():
+    import sqlite3
+    conn = sqlite3.connect(":memory:", cached_statements=2, check_same_thread=False)
+    conn.execute("CREATE TABLE T (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.executemany("INSERT INTO T VALUES (?, ?)", [(i, "name{}".format(i)) for i in range(10)])
+    return conn
+
+
+@test_target("nendo.pool:ConnectionPool")
+class ConnectionPoolTests(unittest.TestCase):
+    def test_statement_cache(self):
+        target = self._makeOne(_connect, size=1, statement_cache_size=2)
+        with target.connection() as conn:
+            for i in range(3):
+                self.assertEqual(conn.execute("SELECT name FROM T WHERE id = ?", (i, )).fetchone(), ("name{}".format(i), ))
+            conn.execute("SELECT count(*) FROM T").fetchone()
+        result = target.stats()
+        self.assertEqual(result[:6], (1, 1, 1, 2, 2, 0))
+        self.assertEqual(result.hit_rate, 0.5)
+
+    def test_eviction__deallocate(self):
+        deallocated = []
+        target = self._makeOne(_connect, size=1, statement_cache_size=2,
+                               deallocate=lambda conn, sql, prepared: deallocated.append(sql))
+        with target.connection() as conn:
+            for sql in ["SELECT 1", "SELECT 2", "SELECT 1", "SELECT 3"]:
+                conn.execute(sql)
+        self.assertEqual(deallocated, ["SELECT 2"])
+        self.assertEqual(target.stats().evictions, 1)
+
+    def test_prepare(self):
+        target = self._makeOne(_connect, size=1, prepare=lambda conn, sql: sql + " -- prepared")
+        with target.connection() as conn:
+            self.assertEqual(conn.execute("SELECT count(*) FROM T").fetchone(), (10, ))
+            self.assertEqual(conn.prepared("SELECT count(*) FROM T"), "SELECT count(*) FROM T -- prepared")
+
+    def test_reuse__most_recently_released(self):
+        target = self._makeOne(_connect, size=2)
+        conn0 = target.acquire()
+        conn1 = target.acquire()
+        target.release(conn0)
+        target.release(conn1)
+        self.assertIs(target.acquire(), conn1)
+        self.assertEqual(target.stats().created, 2)
+
+    def test_released_twice(self):
+        target = self._makeOne(_connect, size=2)
+        conn = target.acquire()
+        target.release(conn)
+        with self.assertRaises(RuntimeError):
+            target.release(conn)
+        self.assertIs(target.acquire(), conn)
+        self.assertIsNot(target.acquire(), conn)
+
+    def test_rollback_is_failed(self):
+        class Dropped(object):
+            def rollback(self):
+                raise OSError("connection is dropped")
+
+            def close(self):
+                pass
+
+        connections = [Dropped(), _connect()]
+        target = self._makeOne(lambda: connections.pop(0), size=1)
+        conn = target.acquire()
+        with self.assertRaises(OSError):
+            target.release(conn)
+        result = target.acquire(timeout=0.01)
+        self.assertIsNot(result, conn)
+        self.assertEqual(result.execute("SELECT count(*) FROM T").fetchone(), (10, ))
+
+    def test_timeout(self):
+        from nendo.exceptions import PoolTimeout
+        target = self._makeOne(_connect, size=1)
+        target.acquire()
+        with self.assertRaises(PoolTimeout):
+            target.acquire(timeout=0.01)
+
+    def test_released_from_another_thread(self):
+        import threading
+        target = self._makeOne(_connect, size=1)
+        conn = target.acquire()
+        threading.Timer(0.01, target.release, args=(conn, )).start()
+        self.assertIs(target.acquire(timeout=1), conn)
+
+    def test_executor(self):
+        from nendo import make_record, Query, Executor
+        from nendo.value import Prepared
+        T = make_record("T", "id name")
+        query = Query().from_(T).where(T.id == Prepared("id")).select(T.name)
+        target = self._makeOne(_connect, size=1)
+        with target.connection() as conn:
+            executor = Executor(conn)
+            self.assertEqual([list(executor.iter_rows(query, id=i)) for i in range(2)], [[("name0", )], [("name1", )]])
+        self.assertEqual(target.stats()[3:5], (1, 1))
+
+    def test_close(self):
+        target = self._makeOne(_connect, size=1)
+        with target.connection():
+            pass
+        target.close()
+        with self.assertRaises(RuntimeError):
+            target.acquire()
@@ -0,0 +1,145 @@
+# -*- coding:utf-8 -*-
+import re
+import unittest
+from evilunit import test_target, test_function
+
+
+class _FakeCursor(object):
+    """PREPARE/EXECUTE/DEALLOCATE of a server, statements are kept per session"""
+    def __init__(self):
+        self.statements = {}
+        self.executed = []
+
+    def execute(self, sql, args):
+        self.executed.append(sql.split(" ", 1)[0])
+        m = re.match(r"PREPARE (\w+) AS (.+)$", sql)
+        if m is not None:
+            if m.group(1) in self.statements:
+                raise RuntimeError("already exists: {}".format(m.group(1)))
+            if "missing" in m.group(2):
+                raise RuntimeError("syntax error")
+            self.statements[m.group(1)] = m.group(2)
+            return
+        m = re.match(r"DEALLOCATE (\w+)$", sql)
+        if m is not None:
+            del self.statements[m.group(1)]
+            return
+        m = re.match(r"EXECUTE (\w+)", sql)
+        body = self.statements[m.group(1)]  # KeyError: not prepared
+        if None in args:
+            raise RuntimeError("not null constraint")
+        self.result = (body, list(args))
+
+
+def _makeQuery(T):
+    from nendo import Query
+    from nendo.value import Prepared
+    return Query().from_(T).where(T.id == Prepared("id"), T.name != Prepared("name")).select(T.name)
+
+
+@test_target("nendo.prepare:PreparedSession")
+class PreparedSessionTests(unittest.TestCase):
+    def test_prepare_once(self):
+        from nendo import make_record
+        T = make_record("T", "id name")
+        target = self._makeOne()
+        result0 = target(_makeQuery(T), id=1, name="foo")
+        result1 = target(_makeQuery(T), id=2, name="bar")
+        name = result0[0][0].split(" ")[1]
+        self.assertTrue(name.startswith("nendo_"))
+        self.assertEqual(result0, [
+            ("PREPARE {} AS SELECT name FROM T WHERE ((id = $1) AND (name <> $2))".format(name), []),
+            ("EXECUTE {}(%s, %s)".format(name), [1, "foo"]),
+        ])
+        self.assertEqual(result1, [("EXECUTE {}(%s, %s)".format(name), [2, "bar"])])
+
+    def test_without_parameters(self):
+        from nendo import make_record, Query
+        T = make_record("T", "id name")
+        result = self._makeOne()(Query().from_(T))
+        self.assertEqual(result[1], ("EXECUTE {}".format(result[0][0].split(" ")[1]), []))
+
+    def test_execute(self):
+        from nendo import make_record
+        T = make_record("T", "id name")
+        cursor = _FakeCursor()
+        target = self._makeOne()
+        for i in range(3):
+            target.execute(cursor, _makeQuery(T), id=i, name="foo")
+        self.assertEqual(cursor.executed, ["PREPARE", "EXECUTE", "EXECUTE", "EXECUTE"])
+        self.assertEqual(cursor.result, ("SELECT name FROM T WHERE ((id = $1) AND (name <> $2))", [2, "foo"]))
+
+    def test_execute__prepare_is_failed(self):
+        from nendo import make_record, Query
+        T = make_record("missing", "id")
+        cursor = _FakeCursor()
+        target = self._makeOne()
+        with self.assertRaises(RuntimeError):
+            target.execute(cursor, Query().from_(T))
+        with self.assertRaises(RuntimeError):
+            target.execute(cursor, Query().from_(T))
+        self.assertEqual(cursor.executed, ["PREPARE", "PREPARE"])
+
+    def test_execute__execute_is_failed(self):
+        from nendo import make_record
+        T = make_record("T", "id name")
+        cursor = _FakeCursor()
+        target = self._makeOne()
+        with self.assertRaises(RuntimeError):
+            target.execute(cursor, _makeQuery(T), id=None, name="foo")
+        target.execute(cursor, _makeQuery(T), id=1, name="foo")
+        self.assertEqual(cursor.executed, ["PREPARE", "EXECUTE", "EXECUTE"])
+        self.assertEqual(cursor.result[1], [1, "foo"])
+
+    def test_execute__deallocate_is_failed(self):
+        from nendo import make_record, Query
+        T0, T1 = [make_record("T{}".format(i), "id") for i in range(2)]
+        cursor = _FakeCursor()
+        target = self._makeOne(max_statements=1)
+        target.execute(cursor, Query().from_(T0))
+        # the server has dropped the statement of T0 already (e.g. reconnected), DEALLOCATE is rejected
+        cursor.statements = {}
+        with self.assertRaises(KeyError):
+            target.execute(cursor, Query().from_(T1))
+        target.execute(cursor, Query().from_(T1))
+        target.execute(cursor, Query().from_(T1))
+        self.assertEqual(cursor.executed, ["PREPARE", "EXECUTE", "DEALLOCATE", "PREPARE", "EXECUTE", "EXECUTE"])
+        self.assertEqual(len(cursor.statements), 1)
+
+    def test_max_statements__deallocated(self):
+        from nendo import make_record, Query
+        cursor = _FakeCursor()
+        target = self._makeOne(max_statements=2)
+        records = [make_record("T{}".format(i), "id") for i in range(3)]
+        for T in records + records[-1:]:
+            target.execute(cursor, Query().from_(T))
+        self.assertEqual(cursor.executed, ["PREPARE", "EXECUTE", "PREPARE", "EXECUTE", "DEALLOCATE", "PREPARE", "EXECUTE", "EXECUTE"])
+        self.assertEqual(len(cursor.statements), 2)
+
+    def test_reset(self):
+        from nendo import make_record, Query
+        T = make_record("T", "id")
+        target = self._makeOne()
+        target(Query().from_(T))
+        target.reset()
+        self.assertEqual(len(target(Query().from_(T))), 2)
+
+
+@test_function("nendo.prepare:statement_name")
+class StatementNameTests(unittest.TestCase):
+    def test_it(self):
+        self.assertEqual(self._callFUT("SELECT 1"), self._callFUT("SELECT 1"))
+        self.assertNotEqual(self._callFUT("SELECT 1"), self._callFUT("SELECT 2"))
+        self.assertEqual(len(self._callFUT("SELECT 1", prefix="p", length=8)), 9)
+
+
+@test_target("nendo:Renderer")
+class NumberedInterpolationTests(unittest.TestCase):
+    def test_it(self):
+        from nendo import make_record, Query
+        from nendo.options import InList
+        from nendo.value import Prepared
+        T = make_record("T", "id name")
+        query = Query().from_(T).where(T.id.in_([1, 2, 3]), T.name == Prepared("name"))
+        result = self._makeOne(interpolation=":{}", in_list=InList())(query, name="foo")
+        self.assertEqual(result, ("SELECT id, name FROM T WHERE ((id IN (:1, :2, :3, :4)) AND (name = :5))", [1, 2, 3, 3, "foo"]))
@@ -46,6 +46,24 @@ class Tests(unittest.TestCase):
         self.assertEqual(result, expected)
         self.assertEqual(context["__i_args"], ["foo", "foo"])
 
+    def test_select_prepared__conflict__numbered(self):
+        from nendo.compiler import DEFAULT_OPTIONS
+        from nendo.value import Prepared
+        target = (self._makeQuery().select(Prepared("hello"), Prepared("world"), Prepared("hello")))
+        context = {"hello": "foo", "world": "bar"}
+        result = self._callFUT(target, context, options=DEFAULT_OPTIONS._replace(interpolation="${}"))
+        self.assertEqual(result, "SELECT $1, $2, $1")
+        self.assertEqual(context["__i_args"], ["foo", "bar"])
+
+    def test_select_prepared__conflict__named(self):
+        from nendo.compiler import DEFAULT_OPTIONS
+        from nendo.value import Prepared
+        target = (self._makeQuery().select(Prepared("hello"), Prepared("world"), Prepared("hello")))
+        context = {"hello": "foo", "world": "bar"}
+        result = self._callFUT(target, context, options=DEFAULT_OPTIONS._replace(interpolation=":{name}"))
+        self.assertEqual(result, "SELECT :hello, :world, :hello")
+        self.assertEqual(context["__i_args"], {"hello": "foo", "world": "bar"})
+
     def test_normally(self):
         T = self._makeRecord("T", "id, name")
         target = self._makeQuery().from_(T).where(T.id < 10).select(T.id, T.name).limit(1).order_by(T.id.desc())
@@ -88,6 +106,67 @@ class Tests(unittest.TestCase):
         expected = "SELECT T.id, T.pt FROM T WHERE (T.pt IN ('3', '4', '5'))"
         self.assertEqual(result, expected)
 
+    def test_where__many_conditions(self):
+        T = self._makeRecord("T", "id")
+        target = self._makeQuery().from_(T).where(*[T.id != i for i in range(10000)])
+        result = self._callFUT(target, {})
+        self.assertTrue(result.startswith("SELECT T.id FROM T WHERE ((T.id <> 0) AND (T.id <> 1) AND"))
+        self.assertTrue(result.endswith("AND (T.id <> 9999))"))
+
+    def test_where__and_or_chain(self):
+        T = self._makeRecord("T", "id pt")
+        target = self._makeQuery().from_(T).where((T.id == 1) & (T.id == 2) & ((T.pt == 3) | (T.pt == 4) | (T.pt == 5)), T.id > 0)
+        result = self._callFUT(target, {})
+        expected = "SELECT T.id, T.pt FROM T WHERE ((T.id = 1) AND (T.id = 2) AND ((T.pt = 3) OR (T.pt = 4) OR (T.pt = 5)) AND (T.id > 0))"
+        self.assertEqual(result, expected)
+
+    def test_where__and_or_function(self):
+        from nendo import and_, or_
+        from nendo.value import Prepared, NULL
+        T = self._makeRecord("T", "id pt")
+        target = self._makeQuery().from_(T).where(or_(and_(T.id == Prepared("id"), T.pt == 1), T.pt.is_(NULL)))
+        context = {"id": 10}
+        result = self._callFUT(target, context)
+        expected = "SELECT T.id, T.pt FROM T WHERE (((T.id = %s) AND (T.pt = 1)) OR (T.pt IS NULL))"
+        self.assertEqual(result, expected)
+        self.assertEqual(context["__i_args"], [10])
+
+    def _makeOptions(self, **kwargs):
+        from nendo.compiler import DEFAULT_OPTIONS
+        from nendo.options import InList
+        return DEFAULT_OPTIONS._replace(in_list=InList(**kwargs))
+
+    def test_in__bound(self):
+        T = self._makeRecord("T", "id pt")
+        target = self._makeQuery().from_(T).where(T.pt.in_(["3", "4", "5"]))
+        context = {}
+        result = self._callFUT(target, context, options=self._makeOptions())
+        expected = "SELECT T.id, T.pt FROM T WHERE (T.pt IN (%s, %s, %s, %s))"
+        self.assertEqual(result, expected)
+        self.assertEqual(context["__i_args"], ["3", "4", "5", "5"])
+
+    def test_in__bound__exact(self):
+        T = self._makeRecord("T", "id pt")
+        target = self._makeQuery().from_(T).where(T.pt.in_(["3", "4", "5"]))
+        context = {}
+        result = self._callFUT(target, context, options=self._makeOptions(bucket=None))
+        expected = "SELECT T.id, T.pt FROM T WHERE (T.pt IN (%s, %s, %s))"
+        self.assertEqual(result, expected)
+        self.assertEqual(context["__i_args"], ["3", "4", "5"])
+
+    def test_in__bound__split(self):
+        from nendo.value import Prepared
+        T = self._makeRecord("T", "id pt")
+        target = self._makeQuery().from_(T).where(T.pt.in_([1, 2, 3, 4, 5]), T.id.not_in([1, 2, 3]), T.id != Prepared("id"))
+        context = {"id": 10}
+        result = self._callFUT(target, context, options=self._makeOptions(limit=2))
+        expected = ("SELECT T.id, T.pt FROM T WHERE ("
+                    "((T.pt IN (%s, %s)) OR (T.pt IN (%s, %s)) OR (T.pt IN (%s)))"
+                    " AND ((T.id NOT IN (%s, %s)) AND (T.id NOT IN (%s)))"
+                    " AND (T.id <> %s))")
+        self.assertEqual(result, expected)
+        self.assertEqual(context["__i_args"], [1, 2, 3, 4, 5, 1, 2, 3, 10])
+
     def test_between(self):
         T = self._makeRecord("T", "id, l, r")
         target = self._makeQuery().from_(T).where(T.l.between(1, 2))
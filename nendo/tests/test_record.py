@@ -0,0 +1,75 @@
+# -*- coding:utf-8 -*-
+import unittest
+from evilunit import test_function
+
+
+@test_function("nendo.record:make_records")
+class MakeRecordsTests(unittest.TestCase):
+    def _makeCacheDir(self):
+        import tempfile
+        import shutil
+        d = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, d)
+        return d
+
+    def test_mapping(self):
+        from nendo import Query, render
+        result = self._callFUT({"User": "id name", "Group": ("id, name", "groups")})
+        self.assertEqual([p.name for p in result.User.props()], ["id", "name"])
+        self.assertEqual(result.Group.get_name(), "groups")
+        query = Query().from_(result.Group).select(result.Group.name)
+        self.assertEqual(render(query), ("SELECT name FROM groups", []))
+
+    def test_text(self):
+        result = self._callFUT("""
+        # users
+        User: id, name
+        Group: id
+        """)
+        self.assertEqual(result.User.get_name(), "User")
+        self.assertEqual([p.name for p in result.Group.props()], ["id"])
+
+    def test_text__invalid(self):
+        with self.assertRaises(ValueError):
+            self._callFUT("User id name")
+
+    def test_cache(self):
+        from unittest import mock
+        cache_dir = self._makeCacheDir()
+        schema = {"User": "id name"}
+        self._callFUT(schema, cache_dir=cache_dir)
+        with mock.patch("nendo.record._generate_module", side_effect=AssertionError("not cached")):
+            result = self._callFUT(schema, cache_dir=cache_dir)
+        self.assertEqual([p.name for p in result.User.props()], ["id", "name"])
+
+    def test_cache__schema_is_changed(self):
+        cache_dir = self._makeCacheDir()
+        self._callFUT({"User": "id name"}, cache_dir=cache_dir)
+        result = self._callFUT({"User": "id name email"}, cache_dir=cache_dir)
+        self.assertEqual([p.name for p in result.User.props()], ["id", "name", "email"])
+
+    def test_cache__broken(self):
+        import os
+        cache_dir = self._makeCacheDir()
+        self._callFUT({"User": "id name"}, cache_dir=cache_dir)
+        for filename in os.listdir(cache_dir):
+            if filename.endswith(".marshal"):
+                with open(os.path.join(cache_dir, filename), "wb") as wf:
+                    wf.write(b"broken")
+        with self.assertLogs("nendo.record", level="WARNING"):
+            result = self._callFUT({"User": "id name"}, cache_dir=cache_dir)
+        self.assertEqual(result.User.get_name(), "User")
+
+
+@test_function("nendo.record:make_record")
+class MakeRecordTests(unittest.TestCase):
+    def test_slots(self):
+        T = self._callFUT("T", "id name")
+        ob = T(1, "foo")
+        self.assertEqual((ob.id, ob.name), (1, "foo"))
+        self.assertFalse(hasattr(ob, "__dict__"))
+
+    def test_table_name(self):
+        T = self._callFUT("T", "id name", name="t")
+        self.assertEqual(T.get_name(), "t")
+        self.assertEqual(T(1, "foo").name, "foo")
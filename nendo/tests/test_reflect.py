@@ -0,0 +1,96 @@
+# -*- coding:utf-8 -*-
+import unittest
+from evilunit import test_function
+
+
+def _makeConnection(path=":memory:"):
+    import sqlite3
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+    CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, email TEXT);
+    CREATE TABLE "group members" (group_id INTEGER, user_id INTEGER, PRIMARY KEY (user_id, group_id));
+    CREATE VIEW user_names AS SELECT id, name FROM users;
+    CREATE TABLE logs ("from" TEXT);
+    """)
+    return connection
+
+
+@test_function("nendo.reflect:reflect")
+class ReflectTests(unittest.TestCase):
+    def _makeCacheDir(self):
+        import tempfile
+        import shutil
+        d = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, d)
+        return d
+
+    def test_tables_and_views(self):
+        result = self._callFUT(_makeConnection())
+        self.assertEqual(sorted(result.registry.keys()), ["group_members", "logs", "user_names", "users"])
+        self.assertEqual([p.name for p in result.users.props()], ["id", "name", "email"])
+        self.assertEqual([p.name for p in result.user_names.props()], ["id", "name"])
+
+    def test_primary_keys(self):
+        result = self._callFUT(_makeConnection())
+        self.assertEqual([p.name for p in result.users.primary_keys()], ["id"])
+        self.assertEqual([p.name for p in result.group_members.primary_keys()], ["user_id", "group_id"])
+        self.assertEqual(result.user_names.primary_keys(), [])
+
+    def test_rendering(self):
+        from nendo import Query, render
+        records = self._callFUT(_makeConnection())
+        T = records.users
+        query = Query().from_(T).select(T.name)
+        self.assertEqual(render(query), ("SELECT name FROM users", []))
+
+    def test_names_not_identifier(self):
+        import sqlite3
+        from nendo import Query, render
+        connection = sqlite3.connect(":memory:")
+        connection.executescript("""
+        CREATE TABLE t (id INTEGER, "from" TEXT, "my col" INT, my_col INT, props INT, PRIMARY KEY ("my col"));
+        CREATE TABLE "class" (id INTEGER);
+        """)
+        records = self._callFUT(connection)
+        T = records.t
+        self.assertEqual(T._property_name_list, ["id", "from_", "my_col_", "my_col", "props_"])
+        self.assertEqual([p.attr for p in T.primary_keys()], ["my_col_"])
+        query = Query().from_(T).select(T.from_, T.my_col_, T.my_col, T.props_)
+        self.assertEqual(render(query), ('SELECT "from", "my col", my_col, "props" FROM t', []))
+        self.assertEqual(render(Query().from_(records.class_)), ('SELECT id FROM "class"', []))
+
+    def test_class_name_conflict(self):
+        import sqlite3
+        connection = sqlite3.connect(":memory:")
+        connection.executescript("""
+        CREATE TABLE "group members" (id INTEGER);
+        CREATE TABLE group_members (id INTEGER, name TEXT);
+        """)
+        records = self._callFUT(connection)
+        self.assertEqual([p.name for p in records.group_members.props()], ["id", "name"])
+        self.assertEqual(records.group_members_.get_name(), '"group members"')
+
+    def test_cache(self):
+        import os
+        from unittest import mock
+        cache_dir = self._makeCacheDir()
+        path = os.path.join(cache_dir, "app.db")
+        _makeConnection(path).close()
+
+        import sqlite3
+        self._callFUT(sqlite3.connect(path), cache_dir=cache_dir)
+        with mock.patch("nendo.reflect.introspect", side_effect=AssertionError("not cached")):
+            result = self._callFUT(sqlite3.connect(path), cache_dir=cache_dir)
+        self.assertEqual([p.name for p in result.users.primary_keys()], ["id"])
+        self.assertEqual(result.logs.from_.name, '"from"')
+
+    def test_cache__schema_is_changed(self):
+        import os
+        import sqlite3
+        cache_dir = self._makeCacheDir()
+        path = os.path.join(cache_dir, "app.db")
+        connection = _makeConnection(path)
+        self._callFUT(connection, cache_dir=cache_dir)
+        connection.execute("ALTER TABLE users ADD COLUMN age INTEGER")
+        result = self._callFUT(sqlite3.connect(path), cache_dir=cache_dir)
+        self.assertEqual([p.name for p in result.users.props()], ["id", "name", "email", "age"])
@@ -0,0 +1,171 @@
+# -*- coding:utf-8 -*-
+import unittest
+from evilunit import test_function, test_target
+
+
+@test_function("nendo.statement:compile_statement")
+class CompileStatementTests(unittest.TestCase):
+    def _makeRecord(self, *args, **kwargs):
+        from nendo import make_record
+        return make_record(*args, **kwargs)
+
+    def _makeQuery(self):
+        from nendo.query import Query
+        return Query()
+
+    def test_without_parameters(self):
+        T = self._makeRecord("T", "id")
+        target = self._makeQuery().from_(T).select(T.id)
+        result = self._callFUT(target)
+        self.assertEqual(result.sql, "SELECT T.id FROM T")
+        self.assertEqual(result.bind({}), [])
+
+    def test_bind_many_times(self):
+        from nendo.value import Prepared
+        target = self._makeQuery().select(Prepared("hello"), Prepared("world"), Prepared("hello"))
+        result = self._callFUT(target)
+        self.assertEqual(result.sql, "SELECT %s, %s, %s")
+        self.assertEqual(result.keys, ("hello", "world", "hello"))
+        self.assertEqual(result.bind({"hello": 1, "world": 2}), [1, 2, 1])
+        self.assertEqual(result(hello="foo", world="bar"), ("SELECT %s, %s, %s", ["foo", "bar", "foo"]))
+
+    def test_subquery__dotted_keys(self):
+        from nendo.alias import alias
+        from nendo.value import Prepared
+        tb1 = self._makeRecord("tb1", "id tb2_id")
+        tb2 = self._makeRecord("tb2", "id id2")
+        q = self._makeQuery().from_(tb2).where(tb2.id >= Prepared("lower_bound"), tb2.id <= Prepared("upper_bound")).select(tb2.id2)
+        sub_q = alias(q, "sub_q")
+        target = self._makeQuery().from_(tb1.join(sub_q, tb1.id <= sub_q.tb2.id2))
+        result = self._callFUT(target)
+        self.assertEqual(result.keys, ("sub_q.lower_bound", "sub_q.upper_bound"))
+        self.assertEqual(result.bind({"sub_q.lower_bound": 1, "sub_q.upper_bound": 2}), [1, 2])
+
+    def test_bind_many(self):
+        from nendo.value import Prepared
+        target = self._makeQuery().select(Prepared("hello"), Prepared("world"))
+        result = self._callFUT(target)
+        contexts = ({"hello": i, "world": i * 2} for i in range(3))
+        self.assertEqual(list(result.bind_many(contexts)), [(0, 0), (1, 2), (2, 4)])
+
+    def test_bind_many__without_parameters(self):
+        T = self._makeRecord("T", "id")
+        result = self._callFUT(self._makeQuery().from_(T))
+        self.assertEqual(list(result.bind_many([{}, {}])), [(), ()])
+
+    def test_missing_value(self):
+        from nendo.value import Prepared
+        target = self._makeQuery().select(Prepared("hello"))
+        result = self._callFUT(target)
+        with self.assertRaises(KeyError):
+            result.bind({})
+
+
+@test_target("nendo:Renderer")
+class RenderManyTests(unittest.TestCase):
+    def test_it(self):
+        from nendo import make_record, Query
+        from nendo.value import Prepared
+        T = make_record("T", "id name")
+        query = Query().from_(T).where(T.id == Prepared("id")).select(T.name)
+        consumed = []
+
+        def contexts():
+            for i in range(3):
+                consumed.append(i)
+                yield {"id": i}
+
+        sql, args = self._makeOne(interpolation="?").render_many(query, contexts())
+        self.assertEqual(sql, "SELECT name FROM T WHERE (id = ?)")
+        self.assertEqual(consumed, [])
+        self.assertEqual(list(args), [(0, ), (1, ), (2, )])
+
+
+@test_target("nendo:Renderer")
+class ParamstyleTests(unittest.TestCase):
+    def _makeQuery(self):
+        from nendo import make_record, Query, alias
+        from nendo.value import Prepared
+        tb1 = make_record("tb1", "id tenant_id")
+        tb2 = make_record("tb2", "id tenant_id")
+        q = Query().from_(tb2).where(tb2.tenant_id == Prepared("tenant_id")).select(tb2.id)
+        sub_q = alias(q, "sub_q")
+        return (Query().from_(tb1.join(sub_q, tb1.id == sub_q.tb2.id))
+                .where(tb1.tenant_id == Prepared("tenant_id"), tb1.id != Prepared("sub_q.tenant_id"))
+                .select(tb1.id))
+
+    def _context(self):
+        return {"tenant_id": 1, "sub_q.tenant_id": 2}
+
+    def test_qmark(self):
+        for cache_size in (None, 10):
+            sql, args = self._makeOne(paramstyle="qmark", cache_size=cache_size)(self._makeQuery(), **self._context())
+            self.assertEqual(sql.count("?"), 3)
+            self.assertEqual(args, [2, 1, 2])
+
+    def test_dollar(self):
+        for cache_size in (None, 10):
+            sql, args = self._makeOne(paramstyle="dollar", cache_size=cache_size)(self._makeQuery(), **self._context())
+            self.assertIn("(tb2.tenant_id = $1)", sql)
+            self.assertIn("WHERE ((tb1.tenant_id = $2) AND (tb1.id <> $1))", sql)
+            self.assertEqual(args, [2, 1])
+
+    def test_named(self):
+        for paramstyle in ("named", "pyformat"):
+            for cache_size in (None, 10):
+                sql, args = self._makeOne(paramstyle=paramstyle, cache_size=cache_size)(self._makeQuery(), **self._context())
+                self.assertEqual(args, {"sub_q__tenant_id": 2, "tenant_id": 1})
+        self.assertIn("(tb1.id <> %(sub_q__tenant_id)s)", sql)
+
+    def test_named__in_list(self):
+        from nendo import make_record, Query
+        from nendo.options import InList
+        T = make_record("T", "id")
+        query = Query().from_(T).where(T.id.in_([1, 2]))
+        sql, args = self._makeOne(paramstyle="named", in_list=InList())(query)
+        self.assertEqual(sql, "SELECT id FROM T WHERE (id IN (:_1, :_2))")
+        self.assertEqual(args, {"_1": 1, "_2": 2})
+
+    def test_named__conflicted_names(self):
+        from nendo import make_record, Query
+        from nendo.exceptions import ConflictName
+        from nendo.options import InList
+        from nendo.value import Prepared
+        T = make_record("T", "id")
+        queries = [
+            self._makeQuery().where(Prepared("sub_q__tenant_id") == 1),
+            Query().from_(T).where(T.id.in_([1]), T.id != Prepared("_1")),
+        ]
+        for query in queries:
+            for cache_size in (None, 10):
+                with self.assertRaises(ConflictName):
+                    self._makeOne(paramstyle="named", cache_size=cache_size, in_list=InList())(query, sub_q__tenant_id=1, _1=1, **self._context())
+
+    def test_render_many__named(self):
+        from nendo import make_record, Query
+        from nendo.value import Prepared
+        T = make_record("T", "id")
+        query = Query().from_(T).where(T.id == Prepared("id"))
+        sql, args = self._makeOne(paramstyle="named").render_many(query, [{"id": 1}, {"id": 2}])
+        self.assertEqual(list(args), [{"id": 1}, {"id": 2}])
+
+    def test_iter_render__named(self):
+        from nendo import make_record, Query
+        from nendo.value import Prepared
+        T = make_record("T", "id")
+        query = Query().from_(T).where(T.id == Prepared("id"))
+        for cache_size in (None, 10):
+            chunks, args = self._makeOne(paramstyle="named", cache_size=cache_size).iter_render(query, id=1)
+            self.assertEqual("".join(chunks), "SELECT id FROM T WHERE (id = :id)")
+            self.assertEqual(args, {"id": 1})
+
+    def test_sqlite3__named(self):
+        import sqlite3
+        from nendo import make_record, Query
+        from nendo.value import Prepared
+        T = make_record("T", "id name")
+        conn = sqlite3.connect(":memory:")
+        conn.executescript("CREATE TABLE T (id INTEGER, name TEXT); INSERT INTO T VALUES (1, 'foo'), (2, 'bar');")
+        query = Query().from_(T).where((T.id == Prepared("id")) | (T.name == Prepared("id"))).select(T.name)
+        sql, args = self._makeOne(paramstyle="named")(query, id=2)
+        self.assertEqual(conn.execute(sql, args).fetchall(), [("bar", )])
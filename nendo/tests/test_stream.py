@@ -0,0 +1,62 @@
+# -*- coding:utf-8 -*-
+import unittest
+from evilunit import test_target
+
+
+def _makeRecord(*args, **kwargs):
+    from nendo import make_record
+    return make_record(*args, **kwargs)
+
+
+def _makeQuery():
+    from nendo import Query
+    return Query()
+
+
+@test_target("nendo:Renderer")
+class IterRenderTests(unittest.TestCase):
+    def _makeUnionQuery(self, n):
+        from nendo.value import Prepared
+        T = _makeRecord("T", "id name")
+        query = _makeQuery().from_(T).where(T.id == Prepared("id")).select(T.id)
+        for i in range(n):
+            query = query.union(_makeQuery().from_(T).where(T.name.in_(list(range(i, i + 100)))).select(T.id))
+        return query
+
+    def test_same_as_render(self):
+        target = self._makeOne(chunk_size=100)
+        query = self._makeUnionQuery(10)
+        chunks, args = target.iter_render(query, id=1)
+        chunks = list(chunks)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(("".join(chunks), args), target(query, id=1))
+
+    def test_args_are_filled_while_consuming(self):
+        T = _makeRecord("T", "id")
+        from nendo.value import Prepared
+        target = self._makeOne()
+        chunks, args = target.iter_render(_makeQuery().from_(T).where(T.id == Prepared("id")), id=1)
+        self.assertEqual(args, [])
+        self.assertEqual(list(chunks), ["SELECT id FROM T WHERE (id = %s)"])
+        self.assertEqual(args, [1])
+
+    def test_write__file_like(self):
+        from io import StringIO
+        target = self._makeOne(chunk_size=100)
+        query = self._makeUnionQuery(10)
+        writer = StringIO()
+        args = target.write(query, writer, id=1)
+        self.assertEqual((writer.getvalue(), args), target(query, id=1))
+
+    def test_write__list(self):
+        T = _makeRecord("T", "id")
+        target = self._makeOne()
+        writer = []
+        args = target.write(_makeQuery().from_(T), writer)
+        self.assertEqual(("".join(writer), args), ("SELECT id FROM T", []))
+
+    def test_with_cache(self):
+        target = self._makeOne(cache_size=10)
+        query = self._makeUnionQuery(2)
+        chunks, args = target.iter_render(query, id=1)
+        self.assertEqual(("".join(chunks), args), target(query, id=1))
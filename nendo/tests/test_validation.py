@@ -80,3 +80,70 @@ class ValidationTests(unittest.TestCase):
         context = {}
         with self.assertRaises(MissingName):
             target.validate(context)
+
+    def test_validated_once(self):
+        from unittest import mock
+        T = self._makeRecord("T", "id")
+        target = self._makeOne().from_(T).select(T.id)
+        with mock.patch.object(target, "_table_validation") as m:
+            target.validate({})
+            target.validate({})
+        self.assertEqual(m.call_count, 1)
+
+    def test_failed_validation_is_not_memoized(self):
+        from nendo.exceptions import MissingName
+        T = self._makeRecord("T", "id")
+        G = self._makeRecord("G", "id")
+        target = self._makeOne().from_(T).select(G.id)
+        for i in range(2):
+            with self.assertRaises(MissingName):
+                target.validate({})
+
+
+@test_target("nendo:Renderer")
+class ValidationOnceTests(unittest.TestCase):
+    def _makeQuery(self, T):
+        from nendo import Query
+        return Query().from_(T).select(T.id)
+
+    def _countValidation(self, target, query):
+        from unittest import mock
+        from nendo import Query
+        with mock.patch.object(Query, "_table_validation") as m:
+            target(query)
+        return m.call_count
+
+    def test_validated_on_first_rendering_of_shape(self):
+        from nendo import make_record
+        T = make_record("T", "id")
+        target = self._makeOne(use_validation="once")
+        self.assertEqual(self._countValidation(target, self._makeQuery(T)), 1)
+        self.assertEqual(self._countValidation(target, self._makeQuery(T)), 0)
+
+    def test_write(self):
+        from unittest import mock
+        from nendo import make_record, Query
+        T = make_record("T", "id")
+        target = self._makeOne(use_validation="once")
+        with mock.patch.object(Query, "_table_validation") as m:
+            for i in range(2):
+                target.write(self._makeQuery(T), [])
+        self.assertEqual(m.call_count, 1)
+
+    def test_invalid_query(self):
+        from nendo import make_record
+        from nendo.exceptions import MissingName
+        T = make_record("T", "id")
+        G = make_record("G", "id")
+        target = self._makeOne(use_validation="once")
+        for i in range(2):
+            with self.assertRaises(MissingName):
+                target(self._makeQuery(T).select(G.id))
+
+    def test_with_cache(self):
+        from nendo import make_record
+        T = make_record("T", "id")
+        target = self._makeOne(use_validation="once", cache_size=10)
+        self.assertEqual(self._countValidation(target, self._makeQuery(T)), 1)
+        self.assertEqual(self._countValidation(target, self._makeQuery(T)), 0)
+        self.assertEqual(target.cache_info()[:2], (1, 1))
@@ -84,6 +84,25 @@ class Prepared(Value):
         return "<pV: {}>".format(self.value)
 
 
+class Bound(Value):
+    """literal value bound as a parameter instead of being inlined"""
+    def __repr__(self):
+        return "<bV: {}>".format(self.value)
+
+
+class ListItem(Bound):
+    """
+    a value of a literal list of IN, bound as a parameter.
+    position is (j, k), the k-th placeholder of the j-th list of nendo.cache.literal_lists(query)
+    """
+    def __init__(self, value, position):
+        super().__init__(value)
+        self.position = position
+
+    def __repr__(self):
+        return "<lV: {} {}>".format(self.position, self.value)
+
+
 NULL = Constant("NULL")
 STAR = ALL = Constant("*")
 
@@ -17,7 +17,6 @@ except IOError:
 
 install_requires = [
     'prestring',
-    'singledispatch'
 ]
 
 
@@ -31,6 +30,10 @@ tests_require = [
 testing_extras = tests_require + [
 ]
 
+numpy_extras = [
+    "numpy",  # columnar results (nendo.columnar), array.array is used without numpy
+]
+
 setup(name='nendo',
       version='0.0',
       description='-',
@@ -50,6 +53,7 @@ setup(name='nendo',
       extras_require={
           'testing': testing_extras,
           'docs': docs_extras,
+          'numpy': numpy_extras,
       },
       tests_require=tests_require,
       test_suite="nendo.tests",